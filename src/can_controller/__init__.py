@@ -1,6 +1,7 @@
 """CAN Controller Node - Specialized node for CAN bus communication"""
 
 from .can_controller_node import CANControllerNode
+from .shm_ring import SharedFrameRingReader
 
-__all__ = ['CANControllerNode']
+__all__ = ['CANControllerNode', 'SharedFrameRingReader']
 
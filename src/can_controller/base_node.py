@@ -3,6 +3,7 @@
 Base Node Class - Foundation for all OBS nodes with communication capabilities
 """
 
+import asyncio
 import os
 import sys
 import json
@@ -11,12 +12,24 @@ import threading
 import time
 import logging
 import uuid
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from collections import deque
 
+try:
+    from .priority_lanes import PriorityLanes, OVERFLOW_DROP_OLDEST
+    from .wire_format import (WIRE_JSON, WIRE_MSGPACK, WIRE_BATCH, MSGPACK_AVAILABLE, MAX_DATAGRAM_SIZE,
+                              encode_envelope, encode_batch, decode_envelope, supported_formats)
+    from .batching import DatagramBatcher
+except ImportError:
+    from priority_lanes import PriorityLanes, OVERFLOW_DROP_OLDEST
+    from wire_format import (WIRE_JSON, WIRE_MSGPACK, WIRE_BATCH, MSGPACK_AVAILABLE, MAX_DATAGRAM_SIZE,
+                             encode_envelope, encode_batch, decode_envelope, supported_formats)
+    from batching import DatagramBatcher
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -158,6 +171,35 @@ class NodeMessage:
     requires_ack: bool = False
     ack_received: bool = False
 
+@lru_cache(maxsize=256)
+def _resolve_host(host: str) -> str:
+    """IP address of a host name (so "localhost" and "127.0.0.1" name the same peer)"""
+    try:
+        return socket.gethostbyname(host)
+    except OSError:
+        return host
+
+def _peer_key(addr) -> Any:
+    if isinstance(addr, str):  # AF_UNIX peer path
+        return addr
+    return (_resolve_host(addr[0]), addr[1])
+
+class _NodeDatagramProtocol(asyncio.DatagramProtocol):
+    """asyncio datagram endpoint for the node port or Unix socket (asyncio runtime)"""
+    
+    def __init__(self, node: "BaseNode"):
+        self.node = node
+    
+    def datagram_received(self, data: bytes, addr: tuple):
+        self.node._handle_datagram(data, addr)
+    
+    def error_received(self, exc: Exception):
+        error_code = getattr(exc, 'winerror', None) or getattr(exc, 'errno', None)
+        if error_code == 10054:  # WinError 10054: Connection reset by peer (benign for UDP)
+            logger.debug(f"UDP connection reset by remote host (Windows behavior, usually benign)")
+        else:
+            logger.warning(f"UDP socket error: {exc}")
+
 class BaseNode:
     """
     Base class for all OBS nodes with communication capabilities
@@ -199,6 +241,93 @@ class BaseNode:
         self.listening = False
         self.listen_thread = None
         
+        # asyncio runtime (start_async): datagram endpoint on the node's event loop instead of a listen thread
+        self.event_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.udp_transport: Optional[asyncio.DatagramTransport] = None
+        self._loop_thread_id: Optional[int] = None
+        
+        # Inbound priority lanes (threaded runtime): the listen thread only parses and queues messages,
+        # dispatcher threads handle them highest Priority first. HIGH and above have exactly one dispatcher,
+        # so urgent commands are handled in arrival order and never wait behind a slow NORMAL/LOW handler
+        self.priority_lanes_enabled = config.get("priority_lanes_enabled", False)
+        self.inbound_lanes = PriorityLanes(len(Priority), config.get("inbound_lane_size", 256), name="inbound") if self.priority_lanes_enabled else None
+        self.dispatch_threads: List[threading.Thread] = []
+        
+        # Wire format: "auto" advertises msgpack (if installed) in JSON envelopes and switches to the binary
+        # format per peer once that peer advertises or sends it; "json" never sends binary.
+        # known_nodes entries (and master_core_wire_format) can pin a peer to "json" or "msgpack".
+        # "batch" is only advertised with batching_enabled, so batches only flow between batching nodes.
+        self.wire_format = config.get("wire_format", "auto")
+        advertised = {WIRE_MSGPACK: self.wire_format == "auto", WIRE_BATCH: config.get("batching_enabled", False)}
+        self._advertised_formats = [wire_format for wire_format in supported_formats() if advertised.get(wire_format, True)]
+        self._peer_wire_formats: Dict[tuple, str] = {}
+        self._pinned_wire_formats: Dict[tuple, str] = {}
+        self._batch_peers: set = set()
+        self._pinned_batch_peers: Dict[tuple, bool] = {}
+        master_core_key = _peer_key((self.master_core_host, self.master_core_port))
+        if config.get("master_core_wire_format"):
+            self._pinned_wire_formats[master_core_key] = config["master_core_wire_format"]
+        if "master_core_batching" in config:
+            self._pinned_batch_peers[master_core_key] = bool(config["master_core_batching"])
+        for node_config in config.get("known_nodes", {}).values():
+            node_key = _peer_key((node_config["host"], node_config["port"]))
+            if node_config.get("wire_format"):
+                self._pinned_wire_formats[node_key] = node_config["wire_format"]
+            if "batching" in node_config:
+                self._pinned_batch_peers[node_key] = bool(node_config["batching"])
+        self.wire_messages_sent = {WIRE_JSON: 0, WIRE_MSGPACK: 0}
+        self.wire_bytes_sent = {WIRE_JSON: 0, WIRE_MSGPACK: 0}
+        
+        # Batching: LOW/NORMAL messages to peers that accept batches are coalesced per destination
+        # (batch_max_items messages or batch_max_delay_ms, whichever first); HIGH and above bypass
+        self.batcher = DatagramBatcher(
+            max_items=config.get("batch_max_items", 32),
+            max_delay=config.get("batch_max_delay_ms", 5) / 1000.0,
+            max_bytes=min(config.get("batch_max_bytes", 60000), MAX_DATAGRAM_SIZE),
+            header_size=len(json.dumps(self._batch_header()))
+        ) if config.get("batching_enabled", False) else None
+        self.batch_flush_thread: Optional[threading.Thread] = None
+        self._batch_flush_handle: Optional[asyncio.TimerHandle] = None
+        self.batch_flushing = False
+        self.batches_received = 0
+        
+        # Outbound queue: producers (e.g. the CAN receive thread) only queue encoded datagrams on a lane per
+        # Priority; a send thread does the sendto. send_queue_overflow: drop_oldest, drop_newest or block
+        # (wait up to send_queue_block_timeout seconds for space, then drop the new datagram)
+        self.outbound_lanes = PriorityLanes(
+            len(Priority),
+            config.get("send_queue_size", 1024),
+            name="outbound",
+            overflow=config.get("send_queue_overflow", OVERFLOW_DROP_OLDEST)
+        ) if config.get("send_queue_enabled", False) else None
+        self.send_block_timeout = config.get("send_queue_block_timeout", 0.05)
+        self.send_thread: Optional[threading.Thread] = None
+        self.sending = False
+        self.send_errors = 0
+        
+        # Persistent send sockets per address family (AF_INET uses the listen socket when bound)
+        self._send_sockets: Dict[int, socket.socket] = {}
+        self._send_socket_lock = threading.Lock()
+        
+        # Unix domain socket transport for co-located nodes: this node also listens on unix_socket_path
+        # (AF_UNIX datagrams, no 64 KB limit, a full receiver is reported instead of a silent drop), and
+        # peers with a unix_socket in known_nodes (or master_core_unix_socket) are sent to over it instead of UDP
+        self.unix_socket_path = config.get("unix_socket_path")
+        self.unix_max_message_size = config.get("unix_max_message_size", 131072)
+        self.unix_socket: Optional[socket.socket] = None
+        self.unix_transport: Optional[asyncio.DatagramTransport] = None
+        self.unix_listen_thread: Optional[threading.Thread] = None
+        self._unix_socket_bound = False
+        self._unix_peers: Dict[tuple, str] = {}
+        if config.get("master_core_unix_socket"):
+            self._unix_peers[master_core_key] = config["master_core_unix_socket"]
+        for node_config in config.get("known_nodes", {}).values():
+            if node_config.get("unix_socket"):
+                self._unix_peers[_peer_key((node_config["host"], node_config["port"]))] = node_config["unix_socket"]
+        self.unix_messages_sent = 0
+        self.unix_send_errors = 0
+        self.unix_fallbacks = 0
+        
         # Register default handlers
         self._register_default_handlers()
         
@@ -267,6 +396,10 @@ class BaseNode:
         try:
             self.status = "STARTING"
             self._start_communication()
+            if self.batcher is not None:
+                self._start_batch_flush_thread()
+            if self.outbound_lanes is not None:
+                self._start_send_thread()
             self.status = "RUNNING"
             logger.info(f"Node {self.node_name} started successfully")
             return True
@@ -275,15 +408,60 @@ class BaseNode:
             logger.error(f"Failed to start node {self.node_name}: {e}")
             return False
     
+    async def start_async(self) -> bool:
+        """Start the node on the running asyncio event loop
+        
+        Incoming messages are delivered by an asyncio datagram endpoint on the
+        loop instead of a listen thread; handlers then run on the loop too.
+        """
+        try:
+            self.status = "STARTING"
+            self.event_loop = asyncio.get_running_loop()
+            self._loop_thread_id = threading.get_ident()
+            await self._start_communication_async()
+            self.status = "RUNNING"
+            logger.info(f"Node {self.node_name} started successfully (asyncio runtime)")
+            return True
+        except Exception as e:
+            self.status = "ERROR"
+            logger.error(f"Failed to start node {self.node_name}: {e}")
+            return False
+    
     def stop(self):
         """Stop the node"""
         try:
             self.status = "STOPPING"
             self.listening = False
+            if self.batcher is not None:
+                self._stop_batching()
+            if self.send_thread:
+                self._stop_send_thread()
+            if self.udp_transport:
+                self.udp_transport.close()
+                self.udp_transport = None
             if self.udp_socket:
                 self.udp_socket.close()
+            if self.unix_transport:
+                self.unix_transport.close()
+                self.unix_transport = None
+            if self.unix_socket:
+                self.unix_socket.close()
+                self.unix_socket = None
+            if self._unix_socket_bound:
+                self._remove_unix_socket_file()
+                self._unix_socket_bound = False
+            with self._send_socket_lock:
+                for send_socket in self._send_sockets.values():
+                    send_socket.close()
+                self._send_sockets = {}
             if self.listen_thread:
                 self.listen_thread.join(timeout=5)
+            if self.unix_listen_thread:
+                self.unix_listen_thread.join(timeout=5)
+                self.unix_listen_thread = None
+            for thread in self.dispatch_threads:
+                thread.join(timeout=5)
+            self.dispatch_threads = []
             
             # Remove log handler
             if self.log_handler:
@@ -307,18 +485,144 @@ class BaseNode:
             self.listen_thread = threading.Thread(target=self._listen_for_messages)
             self.listen_thread.daemon = True
             self.listen_thread.start()
+            self.unix_socket = self._open_unix_socket()
+            if self.unix_socket is not None:
+                self.unix_socket.settimeout(1.0)
+                self.unix_listen_thread = threading.Thread(
+                    target=self._listen_for_messages,
+                    args=(self.unix_socket, self.unix_max_message_size),
+                    name=f"{self.node_name}-unix-listen"
+                )
+                self.unix_listen_thread.daemon = True
+                self.unix_listen_thread.start()
+            if self.inbound_lanes is not None:
+                self._start_dispatch_threads()
             
             logger.info(f"Node {self.node_name} listening on port {self.node_port}")
     
-    def _listen_for_messages(self):
-        """Listen for incoming messages"""
+    def _start_dispatch_threads(self):
+        """Start the inbound dispatchers: one for EMERGENCY..HIGH, one for NORMAL and LOW
+        
+        Each lane has a single consumer, so messages of a lane are handled one at a
+        time in arrival order (two rudder commands can never race each other).
+        """
+        urgent_cutoff = self._priority_lane(Priority.HIGH)
+        self.dispatch_threads = [
+            threading.Thread(target=self._dispatch_loop, args=(0, urgent_cutoff), name=f"{self.node_name}-dispatch-urgent"),
+            threading.Thread(target=self._dispatch_loop, args=(urgent_cutoff + 1, None), name=f"{self.node_name}-dispatch")
+        ]
+        for thread in self.dispatch_threads:
+            thread.daemon = True
+            thread.start()
+    
+    def _dispatch_loop(self, min_lane: int, max_lane: Optional[int]):
+        """Handle queued inbound messages of lanes min_lane..max_lane, highest priority lane first"""
         while self.listening:
+            entry = self.inbound_lanes.get(timeout=0.5, max_lane=max_lane, min_lane=min_lane)
+            if entry is None:
+                continue
+            message, addr = entry
             try:
-                data, addr = self.udp_socket.recvfrom(4096)
-                message_data = json.loads(data.decode('utf-8'))
-                logger.info(f"🔧 [{self.node_name}] Received message from {addr}, type: {message_data.get('type')}, source: {message_data.get('source')}, destination: {message_data.get('destination')}")
-                message = self._deserialize_message(message_data)
                 self._process_message(message, addr)
+            except Exception as e:
+                logger.error(f"❌ [{self.node_name}] Error dispatching message {message.message_id}: {e}")
+    
+    @staticmethod
+    def _priority_lane(priority: Priority) -> int:
+        """Inbound lane of a priority (0 = EMERGENCY)"""
+        return Priority.EMERGENCY.value - priority.value
+    
+    def _message_priority(self, message: NodeMessage) -> Priority:
+        """Priority an inbound message is dispatched with
+        
+        Emergency messages are always EMERGENCY; subclasses can raise the priority
+        of safety-relevant commands regardless of what the sender set.
+        """
+        if message.type == MessageType.EMERGENCY:
+            return Priority.EMERGENCY
+        return message.priority
+    
+    async def _start_communication_async(self):
+        """Open the UDP datagram endpoint on the running event loop"""
+        if self.direct_communication_enabled:
+            self.udp_transport, _ = await self.event_loop.create_datagram_endpoint(
+                lambda: _NodeDatagramProtocol(self),
+                local_addr=('0.0.0.0', self.node_port)
+            )
+            self.listening = True
+            logger.info(f"Node {self.node_name} listening on port {self.node_port} (asyncio)")
+            unix_socket = self._open_unix_socket()
+            if unix_socket is not None:
+                self.unix_transport, _ = await self.event_loop.create_datagram_endpoint(
+                    lambda: _NodeDatagramProtocol(self),
+                    sock=unix_socket
+                )
+    
+    def _open_unix_socket(self) -> Optional[socket.socket]:
+        """Bind the AF_UNIX datagram socket at unix_socket_path (None if not configured/supported)"""
+        if not self.unix_socket_path:
+            return None
+        if not hasattr(socket, "AF_UNIX"):
+            logger.warning(f"⚠️ [{self.node_name}] unix_socket_path set but AF_UNIX is not supported on this platform - using UDP only")
+            return None
+        self._remove_unix_socket_file()
+        unix_socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._size_unix_socket(unix_socket)
+        unix_socket.bind(self.unix_socket_path)
+        self._unix_socket_bound = True
+        logger.info(f"Node {self.node_name} listening on {self.unix_socket_path}")
+        return unix_socket
+    
+    def _size_unix_socket(self, unix_socket: socket.socket):
+        # The send buffer bounds the largest AF_UNIX datagram (capped by net.core.wmem_max/rmem_max)
+        unix_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.unix_max_message_size)
+        unix_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.unix_max_message_size)
+    
+    def _remove_unix_socket_file(self):
+        """Remove a (stale) socket file at unix_socket_path"""
+        try:
+            os.unlink(self.unix_socket_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove Unix socket {self.unix_socket_path}: {e}")
+    
+    def _handle_datagram(self, data: bytes, addr: tuple):
+        """Decode and dispatch one received datagram"""
+        try:
+            message_data, wire_format = decode_envelope(data)
+            self._note_peer_wire_format(addr, message_data, wire_format)
+            if message_data.get("type") == WIRE_BATCH:
+                self.batches_received += 1
+                for inner_data in message_data.get("messages", []):
+                    self._dispatch_envelope(inner_data, addr)
+            else:
+                self._dispatch_envelope(message_data, addr)
+        except Exception as e:
+            logger.error(f"❌ [{self.node_name}] Error receiving message: {e}")
+            logger.error(f"Error type: {type(e).__name__}")
+            import traceback
+            logger.error(f"Traceback: {traceback.format_exc()}")
+    
+    def _dispatch_envelope(self, message_data: Dict[str, Any], addr: tuple):
+        """Deserialize one message envelope and process (or queue) it"""
+        logger.info(f"🔧 [{self.node_name}] Received message from {addr}, type: {message_data.get('type')}, source: {message_data.get('source')}, destination: {message_data.get('destination')}")
+        message = self._deserialize_message(message_data)
+        if not addr:
+            # Unbound AF_UNIX sender: reply to the sender's configured address instead
+            addr = self._reply_address(message.source)
+        if self.inbound_lanes is not None and self.event_loop is None:
+            self.inbound_lanes.put((message, addr), self._priority_lane(self._message_priority(message)))
+        else:
+            self._process_message(message, addr)
+    
+    def _listen_for_messages(self, listen_socket: Optional[socket.socket] = None, buffer_size: int = MAX_DATAGRAM_SIZE):
+        """Listen for incoming messages (on the UDP socket unless another socket is given)"""
+        listen_socket = listen_socket or self.udp_socket
+        while self.listening:
+            try:
+                data, addr = listen_socket.recvfrom(buffer_size)
+                self._handle_datagram(data, addr)
             except socket.timeout:
                 continue
             except (ConnectionResetError, OSError) as e:
@@ -397,19 +701,199 @@ class BaseNode:
         logger.info(f"Emergency message sent to {success_count}/{len(target_nodes)} nodes")
         return success_count > 0
     
+    def _note_peer_wire_format(self, addr: tuple, message_data: Dict[str, Any], wire_format: str):
+        """Remember peers that can receive the binary format or batches (negotiation)"""
+        if not addr:  # Unbound AF_UNIX sender, nothing to reply to
+            return
+        accepted = message_data.get("accept") or ()
+        if WIRE_MSGPACK in self._advertised_formats and (wire_format == WIRE_MSGPACK or WIRE_MSGPACK in accepted):
+            key = _peer_key(addr)
+            if key not in self._peer_wire_formats and len(self._peer_wire_formats) < 1024:
+                self._peer_wire_formats[key] = WIRE_MSGPACK
+                logger.info(f"🔧 [{self.node_name}] Peer {addr} accepts msgpack - switching to binary wire format")
+        if self.batcher is not None and (message_data.get("type") == WIRE_BATCH or WIRE_BATCH in accepted):
+            key = _peer_key(addr)
+            if key not in self._batch_peers and len(self._batch_peers) < 1024:
+                self._batch_peers.add(key)
+                logger.info(f"🔧 [{self.node_name}] Peer {addr} accepts batches")
+    
+    def _peer_accepts_batch(self, addr: tuple) -> bool:
+        """Whether messages to a peer may be batched: pinned in config or negotiated"""
+        key = _peer_key(addr)
+        pinned = self._pinned_batch_peers.get(key)
+        return pinned if pinned is not None else key in self._batch_peers
+    
+    def _peer_wire_format(self, addr: tuple) -> str:
+        """Wire format to send to a peer: pinned in config, negotiated, or JSON"""
+        key = _peer_key(addr)
+        pinned = self._pinned_wire_formats.get(key)
+        if pinned is not None:
+            return pinned if pinned != WIRE_MSGPACK or MSGPACK_AVAILABLE else WIRE_JSON
+        return self._peer_wire_formats.get(key, WIRE_JSON)
+    
+    def _encode_message(self, message: NodeMessage, addr: tuple) -> Tuple[bytes, str]:
+        """Encode a message in the wire format negotiated with the peer
+        
+        Returns:
+            Tuple of (datagram, wire format used)
+        """
+        wire_format = self._peer_wire_format(addr)
+        if wire_format == WIRE_MSGPACK:
+            try:
+                data = encode_envelope(self._message_envelope(message, message.payload), WIRE_MSGPACK)
+            except (TypeError, ValueError) as e:
+                logger.debug(f"msgpack encoding failed for message {message.message_id}, sending JSON: {e}")
+                wire_format = WIRE_JSON
+        if wire_format != WIRE_MSGPACK:
+            data = json.dumps(self._serialize_message(message)).encode('utf-8')
+        self.wire_messages_sent[wire_format] += 1
+        self.wire_bytes_sent[wire_format] += len(data)
+        return data, wire_format
+    
+    def _send_datagram(self, data: bytes, addr: tuple, priority: Priority = Priority.NORMAL) -> bool:
+        """Send one encoded datagram (or queue it for the send thread)
+        
+        Returns:
+            bool: False if the outbound queue dropped the datagram
+        """
+        if self.udp_transport is not None:
+            # asyncio transports are not thread-safe: hand sends from other threads to the loop
+            if threading.get_ident() == self._loop_thread_id:
+                self._transport_sendto(data, addr)
+            else:
+                self.event_loop.call_soon_threadsafe(self._transport_sendto, data, addr)
+        elif self.sending:
+            stored = self.outbound_lanes.put((data, addr), self._priority_lane(priority), timeout=self.send_block_timeout)
+            return stored or self.outbound_lanes.overflow == OVERFLOW_DROP_OLDEST
+        else:
+            self._sendto(data, addr)
+        return True
+    
+    def _unix_path(self, addr) -> Optional[str]:
+        """AF_UNIX path to reach a peer, if it has one"""
+        if isinstance(addr, str):
+            return addr
+        if not self._unix_peers:
+            return None
+        return self._unix_peers.get(_peer_key(addr))
+    
+    def _udp_address(self, addr) -> Optional[tuple]:
+        """UDP address of a peer (AF_UNIX peers by their configured unix_socket, None if unknown)"""
+        if not isinstance(addr, str):
+            return addr
+        for key, unix_path in self._unix_peers.items():
+            if unix_path == addr:
+                return key
+        return None
+    
+    def _transport_sendto(self, data: bytes, addr):
+        """Send on the asyncio transports (loop thread only)"""
+        unix_path = self._unix_path(addr)
+        if unix_path is not None and self.unix_transport is not None:
+            self.unix_transport.sendto(data, unix_path)
+            self.unix_messages_sent += 1
+            return
+        udp_addr = self._udp_address(addr)
+        if udp_addr is None:
+            self.send_errors += 1
+            logger.warning(f"⚠️ [{self.node_name}] No UDP address for Unix peer {addr} and no Unix transport, datagram dropped")
+            return
+        self.udp_transport.sendto(data, udp_addr)
+    
+    def _sendto(self, data: bytes, addr):
+        """Send a datagram on a persistent socket: AF_UNIX for co-located peers (UDP if that fails), else UDP"""
+        unix_path = self._unix_path(addr)
+        if unix_path is not None:
+            try:
+                self._unix_send_socket().sendto(data, unix_path)
+                self.unix_messages_sent += 1
+                return
+            except OSError as e:
+                self.unix_send_errors += 1
+                udp_addr = self._udp_address(addr)
+                if udp_addr is None:
+                    raise
+                self.unix_fallbacks += 1
+                logger.debug(f"Unix socket {unix_path} unavailable ({e}), sending to {udp_addr} over UDP")
+                addr = udp_addr
+        self._send_socket(addr).sendto(data, addr)
+    
+    def _unix_send_socket(self) -> socket.socket:
+        """Unbound, non-blocking AF_UNIX send socket (a full receiver fails the send instead of stalling it)"""
+        send_socket = self._send_sockets.get(socket.AF_UNIX)
+        if send_socket is None:
+            with self._send_socket_lock:
+                send_socket = self._send_sockets.get(socket.AF_UNIX)
+                if send_socket is None:
+                    send_socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                    self._size_unix_socket(send_socket)
+                    send_socket.setblocking(False)
+                    self._send_sockets[socket.AF_UNIX] = send_socket
+        return send_socket
+    
+    def _send_socket(self, addr: tuple) -> socket.socket:
+        """Persistent socket to send to an address (the listen socket for IPv4 when bound)"""
+        family = socket.AF_INET6 if ":" in addr[0] else socket.AF_INET
+        if family == socket.AF_INET and self.udp_socket is not None:
+            return self.udp_socket
+        send_socket = self._send_sockets.get(family)
+        if send_socket is None:
+            with self._send_socket_lock:
+                send_socket = self._send_sockets.get(family)
+                if send_socket is None:
+                    send_socket = self._send_sockets[family] = socket.socket(family, socket.SOCK_DGRAM)
+        return send_socket
+    
+    def _start_send_thread(self):
+        """Start the thread draining the outbound queue (threaded runtime)"""
+        self.sending = True
+        self.send_thread = threading.Thread(target=self._send_loop, name=f"{self.node_name}-send")
+        self.send_thread.daemon = True
+        self.send_thread.start()
+    
+    def _send_loop(self):
+        """Send queued datagrams, highest priority lane first"""
+        while self.sending:
+            entry = self.outbound_lanes.get(timeout=0.5)
+            if entry is not None:
+                self._send_queued(*entry)
+    
+    def _send_queued(self, data: bytes, addr: tuple):
+        try:
+            self._sendto(data, addr)
+        except Exception as e:
+            self.send_errors += 1
+            logger.debug(f"Failed to send queued datagram to {addr}: {e}")
+    
+    def _stop_send_thread(self):
+        """Stop the send thread and send whatever is still queued"""
+        self.sending = False
+        self.send_thread.join(timeout=5)
+        self.send_thread = None
+        while True:
+            entry = self.outbound_lanes.get(timeout=0)
+            if entry is None:
+                break
+            self._send_queued(*entry)
+    
     def _send_message(self, message: NodeMessage, addr: tuple) -> bool:
-        """Send message to specific address"""
+        """Send message to specific address (batched for LOW/NORMAL priority when enabled)"""
+        if not addr:
+            logger.warning(f"⚠️ [{self.node_name}] No address to send message {message.message_id} to {message.destination}, dropped")
+            return False
         try:
-            message_data = self._serialize_message(message)
-            data = json.dumps(message_data).encode('utf-8')
+            data, wire_format = self._encode_message(message, addr)
             
-            if not self.udp_socket:
-                # Create temporary socket for sending
-                temp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                temp_socket.sendto(data, addr)
-                temp_socket.close()
-            else:
-                self.udp_socket.sendto(data, addr)
+            if (self.batcher is not None and message.priority.value <= Priority.NORMAL.value
+                    and self._peer_accepts_batch(addr)):
+                ready, started = self.batcher.add((addr, wire_format), data)
+                for key, messages in ready:
+                    self._send_batch(key, messages)
+                if started and self.event_loop is not None:
+                    self._arm_batch_flush()
+            elif not self._send_datagram(data, addr, message.priority):
+                logger.debug(f"Outbound queue full, message {message.message_id} to {addr} dropped")
+                return False
             
             # Track pending acknowledgments
             if message.requires_ack:
@@ -422,10 +906,76 @@ class BaseNode:
             logger.error(f"Failed to send message {message.message_id}: {e}")
             return False
     
+    def _batch_header(self) -> Dict[str, Any]:
+        """Envelope fields of a batch datagram"""
+        header = {"type": WIRE_BATCH, "source": self.node_name}
+        if self._advertised_formats:
+            header["accept"] = self._advertised_formats
+        return header
+    
+    def _send_batch(self, key: tuple, messages: List[bytes]):
+        """Send a batch collected for (address, wire format); a single message goes out as is"""
+        addr, wire_format = key
+        try:
+            if len(messages) == 1:
+                self._send_datagram(messages[0], addr)
+            else:
+                self._send_datagram(encode_batch(self._batch_header(), messages, wire_format), addr)
+        except Exception as e:
+            logger.error(f"Failed to send batch of {len(messages)} messages to {addr}: {e}")
+    
+    def _start_batch_flush_thread(self):
+        """Start the thread that sends batches whose delay expired (threaded runtime)"""
+        self.batch_flushing = True
+        self.batch_flush_thread = threading.Thread(target=self._batch_flush_loop, name=f"{self.node_name}-batch-flush")
+        self.batch_flush_thread.daemon = True
+        self.batch_flush_thread.start()
+    
+    def _batch_flush_loop(self):
+        """Send batches as their delay expires"""
+        while self.batch_flushing:
+            for key, messages in self.batcher.wait_due(timeout=0.5):
+                self._send_batch(key, messages)
+    
+    def _arm_batch_flush(self):
+        """Schedule a flush of due batches on the event loop (asyncio runtime, one timer at a time)"""
+        if threading.get_ident() != self._loop_thread_id:
+            self.event_loop.call_soon_threadsafe(self._arm_batch_flush)
+        elif self._batch_flush_handle is None:
+            self._batch_flush_handle = self.event_loop.call_later(self.batcher.max_delay, self._flush_due_batches)
+    
+    def _flush_due_batches(self):
+        """Send due batches and re-arm for the next pending one"""
+        self._batch_flush_handle = None
+        for key, messages in self.batcher.pop_due():
+            self._send_batch(key, messages)
+        next_deadline = self.batcher.next_deadline()
+        if next_deadline is not None:
+            self._batch_flush_handle = self.event_loop.call_later(max(next_deadline - time.monotonic(), 0.001), self._flush_due_batches)
+    
+    def _stop_batching(self):
+        """Stop the flush thread and send whatever is still pending"""
+        self.batch_flushing = False
+        if self._batch_flush_handle is not None:
+            self._batch_flush_handle.cancel()
+            self._batch_flush_handle = None
+        if self.batch_flush_thread:
+            self.batch_flush_thread.join(timeout=5)
+            self.batch_flush_thread = None
+        for key, messages in self.batcher.drain():
+            self._send_batch(key, messages)
+    
     def _serialize_message(self, message: NodeMessage) -> Dict[str, Any]:
         """Serialize message for transmission"""
         # Recursively convert bytes objects to lists for JSON serialization
         payload = self._convert_bytes_to_list(message.payload)
+        envelope = self._message_envelope(message, payload)
+        if self._advertised_formats:
+            envelope["accept"] = self._advertised_formats  # Ignored by JSON-only peers
+        return envelope
+    
+    def _message_envelope(self, message: NodeMessage, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Envelope fields of a message with the given (already converted) payload"""
         return {
             "message_id": message.message_id,
             "type": message.type.value,
@@ -440,7 +990,7 @@ class BaseNode:
     
     def _convert_bytes_to_list(self, obj):
         """Recursively convert bytes objects to lists for JSON serialization"""
-        if isinstance(obj, bytes):
+        if isinstance(obj, (bytes, bytearray)):
             return list(obj)
         elif isinstance(obj, dict):
             return {key: self._convert_bytes_to_list(value) for key, value in obj.items()}
@@ -626,6 +1176,12 @@ class BaseNode:
             logger.error(traceback.format_exc())
             return False
     
+    def _reply_address(self, node_name: str) -> Optional[tuple]:
+        """Configured address of a sender whose datagram carried no address"""
+        if node_name == "master_core":
+            return (self.master_core_host, self.master_core_port)
+        return self._get_node_address(node_name)
+    
     def _get_node_address(self, node_name: str) -> Optional[tuple]:
         """Get address for a specific node"""
         # This would typically use service discovery or configuration
@@ -646,7 +1202,27 @@ class BaseNode:
             "status": self.status,
             "last_heartbeat": self.last_heartbeat,
             "pending_messages": len(self.message_queue),
-            "pending_acks": len(self.pending_acks)
+            "pending_acks": len(self.pending_acks),
+            "inbound_lanes": self.inbound_lanes.get_stats() if self.inbound_lanes is not None else {"enabled": False},
+            "wire_format": {
+                "mode": self.wire_format,
+                "msgpack_available": MSGPACK_AVAILABLE,
+                "binary_peers": len(self._peer_wire_formats),
+                "messages_sent": dict(self.wire_messages_sent),
+                "bytes_sent": dict(self.wire_bytes_sent)
+            },
+            "unix_socket": {
+                "path": self.unix_socket_path,
+                "listening": self.unix_socket is not None or self.unix_transport is not None,
+                "peers": len(self._unix_peers),
+                "messages_sent": self.unix_messages_sent,
+                "send_errors": self.unix_send_errors,
+                "udp_fallbacks": self.unix_fallbacks
+            } if self.unix_socket_path or self._unix_peers else {"enabled": False},
+            "send_queue": dict(self.outbound_lanes.get_stats(), send_errors=self.send_errors)
+                          if self.outbound_lanes is not None else {"enabled": False},
+            "batching": dict(self.batcher.get_stats(), batch_peers=len(self._batch_peers), batches_received=self.batches_received)
+                        if self.batcher is not None else {"enabled": False, "batches_received": self.batches_received}
         }
     
     def send_heartbeat(self):
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Batch Decode - Vectorized NumPy decoding of fixed-layout single-frame PGNs
+
+Rapid-update PGNs (engine speed, heading, attitude, position, COG/SOG, rudder,
+battery) have fixed 8-byte layouts. A burst of N such frames is decoded as one
+(N, 8) uint8 array: every field is sliced out of the little-endian 64-bit frame
+word, sign-extended and scaled for all frames at once.
+
+The layouts only give the bit geometry. Everything the decoder adds on top
+(field titles, units, lookup names, "not available" values and value range
+checks) is calibrated once from the regular per-frame decode path, so a batch
+decoded frame gets exactly the document it would get on its own. Frames with
+a value the decoder rejects are left to the per-frame path.
+
+NumPy is optional; without it BatchDecoder is unavailable and frames are decoded
+one by one.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class BatchField(NamedTuple):
+    """One field of a fixed 8-byte layout"""
+    key: str
+    unit_key: str
+    bit_offset: int
+    bit_length: int
+    signed: bool = False
+    scale: float = 1.0
+
+
+# Field layouts (NMEA2000 field definitions); keys match the PGN registry field specs
+BATCH_LAYOUTS: Dict[int, Tuple[BatchField, ...]] = {
+    127488: (  # Engine Parameters, Rapid Update
+        BatchField("instance", "unit", 0, 8),
+        BatchField("speed", "unit_speed", 8, 16, scale=0.25),
+        BatchField("boost_pressure", "unit_boost_pressure", 24, 16, scale=100),
+        BatchField("tilt_trim", "unit_tilt_trim", 40, 8, signed=True),
+        BatchField("reserved_48", "unit_reserved_48", 48, 16),
+    ),
+    127250: (  # Vessel Heading
+        BatchField("sid", "unit", 0, 8),
+        BatchField("heading", "unit_heading", 8, 16, scale=0.0001),
+        BatchField("deviation", "unit_deviation", 24, 16, signed=True, scale=0.0001),
+        BatchField("variation", "unit_variation", 40, 16, signed=True, scale=0.0001),
+        BatchField("reference", "unit_reference", 56, 2),
+        BatchField("reserved_58", "unit_reserved_58", 58, 6),
+    ),
+    127245: (  # Rudder
+        BatchField("instance", "unit_instance", 0, 8),
+        BatchField("direction_order", "unit_direction_order", 8, 3),
+        BatchField("reserved_11", "unit_reserved_11", 11, 5),
+        BatchField("angle_order", "unit_angle_order", 16, 16, signed=True, scale=0.0001),
+        BatchField("position", "unit_position", 32, 16, signed=True, scale=0.0001),
+        BatchField("reserved_48", "unit_reserved_48", 48, 16),
+    ),
+    127257: (  # Attitude
+        BatchField("sid", "unit", 0, 8),
+        BatchField("yaw", "unit_yaw", 8, 16, signed=True, scale=0.0001),
+        BatchField("pitch", "unit_pitch", 24, 16, signed=True, scale=0.0001),
+        BatchField("roll", "unit_roll", 40, 16, signed=True, scale=0.0001),
+        BatchField("reserved_56", "unit_reserved_56", 56, 8),
+    ),
+    129025: (  # Position, Rapid Update
+        BatchField("latitude", "unit_latitude", 0, 32, signed=True, scale=1e-7),
+        BatchField("longitude", "unit_longitude", 32, 32, signed=True, scale=1e-7),
+    ),
+    129026: (  # COG & SOG, Rapid Update
+        BatchField("sid", "unit", 0, 8),
+        BatchField("cog_reference", "unit_cog_reference", 8, 2),
+        BatchField("reserved_10", "unit_reserved_10", 10, 6),
+        BatchField("cog", "unit_cog", 16, 16, scale=0.0001),
+        BatchField("sog", "unit_sog", 32, 16, scale=0.01),
+        BatchField("reserved_48", "unit_reserved_48", 48, 16),
+    ),
+    127508: (  # Battery Status
+        BatchField("instance", "unit_instance", 0, 8),
+        BatchField("voltage", "unit_voltage", 8, 16, signed=True, scale=0.01),
+        BatchField("current", "unit_current", 24, 16, signed=True, scale=0.1),
+        BatchField("temperature", "unit_temperature", 40, 16, scale=0.01),
+        BatchField("sid", "unit_sid", 56, 8),
+    ),
+}
+
+# Fields up to this many bits are decoded through a table of every raw value
+TABLE_BITS = 8
+
+# Reference decode: (pgn, 8-byte payload) -> extracted document; raises if the decoder rejects the frame
+ReferenceDecode = Callable[[int, bytes], Dict[str, Any]]
+
+
+class _CalibratedField(NamedTuple):
+    """A layout field plus what the per-frame decode path does with its raw values"""
+    field: BatchField
+    unit: Any
+    table: Optional[List[Any]]  # Raw value -> document value (narrow fields)
+    rejected: Any               # Bool array over raw values the decoder rejects (narrow fields)
+    null_value: Optional[int]   # Raw (sign-extended) value decoded as None (wide fields)
+    low: int                    # Valid raw range (wide fields)
+    high: int
+    as_float: bool
+
+
+class _Rejected(Exception):
+    """The reference decode rejected a probe value"""
+
+
+class BatchDecoder:
+    """
+    Vectorized decoder for fixed-layout PGNs
+    
+    decode() returns the same documents (keys, key order and values) as the
+    per-frame decode path the decoder was calibrated against.
+    """
+    
+    def __init__(self, reference: ReferenceDecode, layouts: Optional[Dict[int, Sequence[BatchField]]] = None):
+        """
+        Args:
+            reference: Per-frame decode + extraction used to calibrate each layout
+            layouts: PGN -> field layout (defaults to BATCH_LAYOUTS)
+        
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for batch decoding")
+        self.layouts: Dict[int, Tuple[_CalibratedField, ...]] = {}
+        self._titles: Dict[int, str] = {}
+        for pgn, layout in (BATCH_LAYOUTS if layouts is None else layouts).items():
+            try:
+                self._titles[pgn], self.layouts[pgn] = self._calibrate(reference, pgn, layout)
+            except Exception as e:
+                logger.warning(f"⚠️ [can_controller] PGN {pgn} does not match its batch layout ({e}), decoding it frame by frame")
+        self.frames_decoded = 0
+        self.frames_rejected = 0
+        self.batches = 0
+    
+    @staticmethod
+    def _field_payload(field: BatchField, value: int) -> bytes:
+        """All-zero frame with one field set to a (signed) raw value"""
+        raw = value & ((1 << field.bit_length) - 1)
+        return (raw << field.bit_offset).to_bytes(8, "little")
+    
+    @classmethod
+    def _calibrate(cls, reference: ReferenceDecode, pgn: int, layout: Sequence[BatchField]) -> Tuple[str, Tuple[_CalibratedField, ...]]:
+        """Derive title, units, lookups, null values and valid ranges of a layout from the reference decode"""
+        base = reference(pgn, bytes(8))
+        missing = [field.key for field in layout if field.key not in base or field.unit_key not in base]
+        if missing:
+            raise ValueError(f"reference document has no {missing}")
+        title = base["title"]
+        
+        calibrated = []
+        for field in layout:
+            def probe(value: int, field: BatchField = field) -> Any:
+                try:
+                    document = reference(pgn, cls._field_payload(field, value))
+                except ValueError as e:
+                    raise _Rejected() from e
+                if document["title"] != title:
+                    raise ValueError(f"title changes with the value of {field.key}")
+                return document[field.key]
+            
+            unit = base[field.unit_key]
+            if field.bit_length <= TABLE_BITS:
+                table = []
+                rejected = []
+                for raw in range(1 << field.bit_length):
+                    value = raw - (1 << field.bit_length) if field.signed and raw >> (field.bit_length - 1) else raw
+                    try:
+                        table.append(probe(value))
+                        rejected.append(False)
+                    except _Rejected:
+                        table.append(None)
+                        rejected.append(True)
+                calibrated.append(_CalibratedField(field, unit, table, np.array(rejected, dtype=bool), None, 0, 0, False))
+                continue
+            
+            low, high = cls._value_bounds(field)
+            null_value = high if probe(high) is None else None
+            if null_value is not None:
+                high -= 1
+            high = cls._last_accepted(probe, 0, high)
+            low = -cls._last_accepted(lambda value: probe(-value), 0, -low) if low < 0 else 0
+            middle = high // 2 or 1
+            sample = probe(middle)
+            if sample is None or abs(sample - middle * field.scale) > abs(middle * field.scale) * 1e-12:
+                raise ValueError(f"{field.key}={sample!r} for raw {middle}, layout gives {middle * field.scale!r}")
+            calibrated.append(_CalibratedField(field, unit, None, None, null_value, low, high, isinstance(sample, float)))
+        return title, tuple(calibrated)
+    
+    @staticmethod
+    def _value_bounds(field: BatchField) -> Tuple[int, int]:
+        if field.signed:
+            return -(1 << (field.bit_length - 1)), (1 << (field.bit_length - 1)) - 1
+        return 0, (1 << field.bit_length) - 1
+    
+    @staticmethod
+    def _last_accepted(probe: Callable[[int], Any], accepted: int, limit: int) -> int:
+        """Largest value in [accepted, limit] the reference accepts (values are accepted up to a bound)"""
+        probe(accepted)
+        try:
+            probe(limit)
+            return limit
+        except _Rejected:
+            pass
+        while limit - accepted > 1:
+            middle = (accepted + limit) // 2
+            try:
+                probe(middle)
+                accepted = middle
+            except _Rejected:
+                limit = middle
+        return accepted
+    
+    def supports(self, pgn: int) -> bool:
+        """True if the PGN has a batch layout"""
+        return pgn in self.layouts
+    
+    @staticmethod
+    def _field_values(words, calibrated: _CalibratedField) -> Tuple[List[Any], Any]:
+        """Slice, sign-extend and scale one field for every frame
+        
+        Returns:
+            Tuple of (values, bool array of frames the decoder would reject)
+        """
+        field = calibrated.field
+        mask = (1 << field.bit_length) - 1
+        raw = (words >> np.uint64(field.bit_offset)) & np.uint64(mask)
+        if calibrated.table is not None:
+            indexes = raw.astype(np.intp)
+            return [calibrated.table[index] for index in indexes.tolist()], calibrated.rejected[indexes]
+        values = raw.astype(np.int64)
+        if field.signed:
+            values = np.where(values > (mask >> 1), values - (mask + 1), values)
+        null = values == calibrated.null_value if calibrated.null_value is not None else np.zeros(len(values), dtype=bool)
+        rejected = ~null & ((values < calibrated.low) | (values > calibrated.high))
+        scaled = values * field.scale if calibrated.as_float else values * int(field.scale)
+        return np.where(null, None, scaled.astype(object)).tolist(), rejected
+    
+    def decode(self, pgn: int, payloads: Sequence[bytes], sources: Sequence[int], dests: Sequence[int],
+               timestamp: str) -> List[Optional[Dict[str, Any]]]:
+        """Decode a batch of 8-byte frames of one PGN
+        
+        Args:
+            pgn: PGN shared by all frames (must be supported)
+            payloads: 8-byte CAN payloads
+            sources: Source address per frame
+            dests: Destination address per frame
+            timestamp: Formatted timestamp stored in every document
+        
+        Returns:
+            One extracted document per frame, in input order; None for frames with a
+            value the decoder rejects (decode those one by one)
+        """
+        layout = self.layouts[pgn]
+        frames = np.frombuffer(b"".join(payloads), dtype=np.uint8).reshape(len(payloads), 8)
+        words = frames.view("<u8").ravel()
+        rejected = np.zeros(len(payloads), dtype=bool)
+        columns = []
+        for calibrated in layout:
+            values, field_rejected = self._field_values(words, calibrated)
+            columns.append((calibrated.field, calibrated.unit, values))
+            rejected |= field_rejected
+        rejected = rejected.tolist()
+        
+        title = self._titles[pgn]
+        documents: List[Optional[Dict[str, Any]]] = []
+        for row, (source, dest) in enumerate(zip(sources, dests)):
+            if rejected[row]:
+                documents.append(None)
+                continue
+            document = {"title": title, "pgn": pgn, "source": source, "dest": dest}
+            for field, unit, values in columns:
+                document[field.key] = values[row]
+                document[field.unit_key] = unit
+            document["timestamp"] = timestamp
+            documents.append(document)
+        
+        rejected_count = sum(rejected)
+        self.frames_decoded += len(documents) - rejected_count
+        self.frames_rejected += rejected_count
+        self.batches += 1
+        return documents
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batch counters"""
+        return {
+            "enabled": True,
+            "pgns": sorted(self.layouts),
+            "batches": self.batches,
+            "frames_decoded": self.frames_decoded,
+            "frames_rejected": self.frames_rejected,
+            "average_batch": round((self.frames_decoded + self.frames_rejected) / self.batches, 1) if self.batches else 0.0
+        }
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Batching - Coalesce encoded node messages per destination into batch datagrams
+
+Messages for the same (address, wire format) are collected until the batch
+holds max_items messages, would exceed max_bytes, or its oldest message has
+waited max_delay seconds - whichever comes first. One sendto per batch
+instead of one per message.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+try:
+    from .wire_format import batch_overhead
+except ImportError:
+    from wire_format import batch_overhead
+
+
+class _PendingBatch:
+    """Encoded messages waiting for one destination"""
+    __slots__ = ("messages", "size", "deadline")
+    
+    def __init__(self, deadline: float):
+        self.messages: List[bytes] = []
+        self.size = 0
+        self.deadline = deadline
+
+
+class DatagramBatcher:
+    """
+    Per-destination batch collector (thread-safe)
+    
+    add() returns the batches that are ready to send right away (full or size
+    limit reached); wait_due()/pop_due() return the batches whose delay expired.
+    A ready "batch" of one message should be sent as the plain message.
+    """
+    
+    def __init__(self, max_items: int = 32, max_delay: float = 0.005, max_bytes: int = 60000, header_size: int = 0):
+        """
+        Args:
+            max_items: Messages per batch before it is sent
+            max_delay: Seconds the first message of a batch may wait
+            max_bytes: Maximum batch datagram size
+            header_size: Encoded size of the batch envelope fields
+        """
+        if max_items < 1 or max_delay < 0 or max_bytes < 1:
+            raise ValueError(f"DatagramBatcher needs max_items >= 1, max_delay >= 0 and max_bytes >= 1, got {max_items}, {max_delay}, {max_bytes}")
+        self.max_items = max_items
+        self.max_delay = max_delay
+        self.max_bytes = max_bytes - header_size
+        self._batches: Dict[Hashable, _PendingBatch] = {}
+        self._cond = threading.Condition(threading.Lock())
+        
+        # Counters
+        self.messages_batched = 0
+        self.batches_full = 0
+        self.batches_size_limit = 0
+        self.batches_timeout = 0
+        self.oversize_messages = 0
+    
+    def add(self, key: Hashable, data: bytes) -> Tuple[List[Tuple[Hashable, List[bytes]]], bool]:
+        """Queue an encoded message for a destination
+        
+        Returns:
+            Tuple of (batches ready to send now, whether a new batch was started)
+        """
+        ready = []
+        with self._cond:
+            if len(data) + batch_overhead(1) > self.max_bytes:
+                self.oversize_messages += 1
+                return [(key, [data])], False
+            batch = self._batches.get(key)
+            if batch is not None and batch.size + len(data) + batch_overhead(len(batch.messages) + 1) > self.max_bytes:
+                ready.append((key, self._batches.pop(key).messages))
+                self.batches_size_limit += 1
+                batch = None
+            started = batch is None
+            if started:
+                batch = self._batches[key] = _PendingBatch(time.monotonic() + self.max_delay)
+            batch.messages.append(data)
+            batch.size += len(data)
+            self.messages_batched += 1
+            if len(batch.messages) >= self.max_items:
+                ready.append((key, self._batches.pop(key).messages))
+                self.batches_full += 1
+                started = False
+            elif started:
+                self._cond.notify_all()
+        return ready, started
+    
+    def _pop_due(self, now: float) -> List[Tuple[Hashable, List[bytes]]]:
+        due = [key for key, batch in self._batches.items() if batch.deadline <= now]
+        self.batches_timeout += len(due)
+        return [(key, self._batches.pop(key).messages) for key in due]
+    
+    def pop_due(self) -> List[Tuple[Hashable, List[bytes]]]:
+        """Remove and return the batches whose delay has expired"""
+        with self._cond:
+            return self._pop_due(time.monotonic())
+    
+    def wait_due(self, timeout: float) -> List[Tuple[Hashable, List[bytes]]]:
+        """Wait up to timeout seconds for batches to become due, then remove and return them"""
+        end = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                due = self._pop_due(now)
+                if due or now >= end:
+                    return due
+                next_deadline = min((batch.deadline for batch in self._batches.values()), default=end)
+                self._cond.wait(min(next_deadline, end) - now)
+    
+    def next_deadline(self) -> Optional[float]:
+        """Monotonic time the oldest pending batch is due (None if nothing is pending)"""
+        with self._cond:
+            return min((batch.deadline for batch in self._batches.values()), default=None)
+    
+    def drain(self) -> List[Tuple[Hashable, List[bytes]]]:
+        """Remove and return all pending batches (on shutdown)"""
+        with self._cond:
+            batches = [(key, batch.messages) for key, batch in self._batches.items()]
+            self._batches = {}
+            return batches
+    
+    def __len__(self) -> int:
+        with self._cond:
+            return sum(len(batch.messages) for batch in self._batches.values())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching counters"""
+        with self._cond:
+            sent = self.batches_full + self.batches_size_limit + self.batches_timeout
+            return {
+                "max_items": self.max_items,
+                "max_delay_ms": round(self.max_delay * 1000, 3),
+                "messages_batched": self.messages_batched,
+                "batches_sent": sent,
+                "batches_full": self.batches_full,
+                "batches_size_limit": self.batches_size_limit,
+                "batches_timeout": self.batches_timeout,
+                "oversize_messages": self.oversize_messages,
+                "mean_batch_size": round(self.messages_batched / sent, 2) if sent else 0.0,
+                "pending_messages": sum(len(batch.messages) for batch in self._batches.values())
+            }
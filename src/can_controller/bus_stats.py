@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Bus Stats - Always-on per-PGN and per-source CAN bus statistics
+
+Counters are plain integers/floats in preallocated slot objects (one per PGN,
+256 per source address, one for the whole bus), updated in place per frame.
+Rates are counted in whole-second buckets, and inter-arrival jitter is a
+running mean absolute deviation of the frame interval (RFC 3550 style, gain 1/16).
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+# Nominal bits of an extended data frame without stuff bits: SOF, 29-bit ID, SRR,
+# IDE, RTR, control (6), CRC (16), ACK (2), EOF (7) and interframe space (3)
+EXTENDED_FRAME_OVERHEAD_BITS = 67
+
+JITTER_GAIN = 1.0 / 16
+
+
+class _StreamStats:
+    """Counters for one stream of frames (a PGN, a source address or the whole bus)"""
+    __slots__ = ("frames", "bytes", "errors", "undecoded", "unknown",
+                 "bucket_second", "bucket_frames", "bucket_bytes", "bucket_bits",
+                 "rate_frames", "rate_bytes", "rate_bits",
+                 "last_timestamp", "mean_interval", "jitter")
+    
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+        self.errors = 0
+        self.undecoded = 0
+        self.unknown = 0
+        self.bucket_second = 0
+        self.bucket_frames = 0
+        self.bucket_bytes = 0
+        self.bucket_bits = 0
+        self.rate_frames = 0
+        self.rate_bytes = 0
+        self.rate_bits = 0
+        self.last_timestamp = None
+        self.mean_interval = None
+        self.jitter = 0.0
+    
+    def update(self, dlc: int, timestamp: Optional[float], second: int, error: bool, decoded: bool, unknown: bool):
+        self.frames += 1
+        self.bytes += dlc
+        if error:
+            self.errors += 1
+        elif not decoded:
+            self.undecoded += 1
+        if unknown:
+            self.unknown += 1
+        
+        if second != self.bucket_second:
+            if second == self.bucket_second + 1:
+                self.rate_frames = self.bucket_frames
+                self.rate_bytes = self.bucket_bytes
+                self.rate_bits = self.bucket_bits
+            else:
+                self.rate_frames = self.rate_bytes = self.rate_bits = 0
+            self.bucket_second = second
+            self.bucket_frames = self.bucket_bytes = self.bucket_bits = 0
+        self.bucket_frames += 1
+        self.bucket_bytes += dlc
+        self.bucket_bits += EXTENDED_FRAME_OVERHEAD_BITS + 8 * dlc
+        
+        if timestamp:
+            if self.last_timestamp is not None:
+                interval = timestamp - self.last_timestamp
+                if interval >= 0:
+                    if self.mean_interval is None:
+                        self.mean_interval = interval
+                    else:
+                        self.jitter += (abs(interval - self.mean_interval) - self.jitter) * JITTER_GAIN
+                        self.mean_interval += (interval - self.mean_interval) * JITTER_GAIN
+            self.last_timestamp = timestamp
+    
+    def rates(self, second: int) -> tuple:
+        """(frames/s, bytes/s, bits/s) over the last complete second"""
+        if second == self.bucket_second:
+            return self.rate_frames, self.rate_bytes, self.rate_bits
+        if second == self.bucket_second + 1:
+            return self.bucket_frames, self.bucket_bytes, self.bucket_bits
+        return 0, 0, 0
+    
+    def snapshot(self, second: int) -> Dict[str, Any]:
+        frames_per_second, bytes_per_second, _ = self.rates(second)
+        return {
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "frames_per_second": frames_per_second,
+            "bytes_per_second": bytes_per_second,
+            "errors": self.errors,
+            "undecoded": self.undecoded,
+            "mean_interval_ms": round(self.mean_interval * 1000, 3) if self.mean_interval is not None else None,
+            "jitter_ms": round(self.jitter * 1000, 3)
+        }
+
+
+class BusStats:
+    """
+    Bus statistics engine
+    
+    Features:
+    - Frames, bytes, errors, undecoded and unknown-PGN counts
+    - Frames/s, bytes/s and bus load % over the last complete second
+    - Inter-arrival mean and jitter per PGN and per source address
+    - No per-frame allocation: a PGN's slot is created the first time it is seen
+    """
+    
+    def __init__(self, bitrate: int = 250000):
+        """
+        Args:
+            bitrate: CAN bitrate in bit/s (for bus load %)
+        """
+        self.bitrate = bitrate
+        self.started = time.time()
+        self._bus = _StreamStats()
+        self._pgns: Dict[int, _StreamStats] = {}
+        self._sources: List[_StreamStats] = [_StreamStats() for _ in range(256)]
+        self._seen_sources = bytearray(256)
+    
+    def observe(self, pgn: int, source: int, dlc: int, timestamp: Optional[float],
+                error: bool = False, decoded: bool = True, unknown: bool = False):
+        """Count one received frame
+        
+        Args:
+            pgn: PGN of the frame
+            source: Source address
+            dlc: Payload length in bytes
+            timestamp: Frame timestamp (seconds) for inter-arrival jitter
+            error: Processing failed
+            decoded: Frame was decoded and extracted
+            unknown: PGN is not in the PGN registry
+        """
+        second = int(time.monotonic())
+        self._bus.update(dlc, timestamp, second, error, decoded, unknown)
+        pgn_stats = self._pgns.get(pgn)
+        if pgn_stats is None:
+            pgn_stats = self._pgns[pgn] = _StreamStats()
+        pgn_stats.update(dlc, timestamp, second, error, decoded, unknown)
+        source &= 0xFF
+        self._sources[source].update(dlc, timestamp, second, error, decoded, unknown)
+        self._seen_sources[source] = 1
+    
+    def reset(self):
+        """Clear all counters"""
+        self.started = time.time()
+        self._bus = _StreamStats()
+        self._pgns = {}
+        self._sources = [_StreamStats() for _ in range(256)]
+        self._seen_sources = bytearray(256)
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Bus-wide totals, rates and load (for get_status)"""
+        second = int(time.monotonic())
+        summary = self._bus.snapshot(second)
+        summary["bus_load_percent"] = round(100.0 * self._bus.rates(second)[2] / self.bitrate, 2) if self.bitrate else None
+        summary["unknown_pgn_frames"] = self._bus.unknown
+        summary["pgns"] = len(self._pgns)
+        summary["sources"] = sum(self._seen_sources)
+        summary["uptime"] = round(time.time() - self.started, 1)
+        return summary
+    
+    def get_stats(self, top: Optional[int] = None, sort_by: str = "frames_per_second") -> Dict[str, Any]:
+        """Full statistics: bus summary plus per-PGN and per-source breakdowns
+        
+        Args:
+            top: Only the top N PGNs/sources (by sort_by)
+            sort_by: Snapshot key to sort by (frames_per_second, frames, bytes, jitter_ms, errors, ...)
+        """
+        second = int(time.monotonic())
+        pgns = [dict(self._pgns[pgn].snapshot(second), pgn=pgn, unknown=self._pgns[pgn].unknown > 0) for pgn in list(self._pgns)]
+        sources = [dict(self._sources[source].snapshot(second), source=source)
+                   for source in range(256) if self._seen_sources[source]]
+        for rows in (pgns, sources):
+            rows.sort(key=lambda row: row.get(sort_by) or 0, reverse=True)
+        if top is not None:
+            pgns = pgns[:top]
+            sources = sources[:top]
+        return {
+            "bus": self.get_summary(),
+            "pgns": pgns,
+            "sources": sources
+        }
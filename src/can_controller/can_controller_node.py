@@ -4,6 +4,7 @@ CAN Controller Node - Specialized node for CAN bus communication
 Extends BaseNode with CAN-specific functionality including NMEA2000 PGN parsing
 """
 
+import asyncio
 import can
 import threading
 import time
@@ -20,14 +21,55 @@ import platform
 import tempfile
 import signal
 import uuid
+import functools
 
 # Import BaseNode from local module (with fallback for direct execution)
 try:
     from .base_node import BaseNode, MessageType, Priority, NodeMessage
+    from .frame_pipeline import FrameRing, RawFrame
+    from .decode_pool import DecodeShardPool
+    from .can_filters import build_can_filters
+    from .pgn_registry import build_default_registry, format_timestamp, CATEGORY_COLLECTIONS, DEFAULT_COLLECTION
+    from .decode_cache import DecodeCache, combine_cache_stats
+    from .signal_table import SignalTable
+    from .frame_history import FrameHistory, MAX_QUERY_FRAMES, pgn_from_arbitration_id
+    from .shm_ring import SharedFrameRing
+    from .subscriptions import SubscriptionIndex
+    from .bus_stats import BusStats
+    from .latency import LatencyTracker, STAGE_RECEIVE, STAGE_DECODE, STAGE_SEND_PREFIX, STAGE_END_TO_END
+    from .batch_decode import BatchDecoder, BATCH_LAYOUTS, NUMPY_AVAILABLE
+    from .frame_record import FrameRecord
+    from .rate_policy import build_sink_decimators, SINKS
+    from .change_filter import build_change_filters
+    from .fast_packet import build_fast_packet_assembler
+    from .transport_protocol import build_transport_protocol_manager, TP_CM_PGN, TP_DT_PGN
+    from .priority_lanes import PriorityLanes, PendingItem, OVERFLOW_BLOCK
+    from .n2k_decode import N2KFrameDecoder
+    from .frame_decode import FrameDecoder
 except ImportError:
     # Fallback for direct execution (not as package)
     sys.path.insert(0, str(Path(__file__).parent))
     from base_node import BaseNode, MessageType, Priority, NodeMessage
+    from frame_pipeline import FrameRing, RawFrame
+    from decode_pool import DecodeShardPool
+    from can_filters import build_can_filters
+    from pgn_registry import build_default_registry, format_timestamp, CATEGORY_COLLECTIONS, DEFAULT_COLLECTION
+    from decode_cache import DecodeCache, combine_cache_stats
+    from signal_table import SignalTable
+    from frame_history import FrameHistory, MAX_QUERY_FRAMES, pgn_from_arbitration_id
+    from shm_ring import SharedFrameRing
+    from subscriptions import SubscriptionIndex
+    from bus_stats import BusStats
+    from latency import LatencyTracker, STAGE_RECEIVE, STAGE_DECODE, STAGE_SEND_PREFIX, STAGE_END_TO_END
+    from batch_decode import BatchDecoder, BATCH_LAYOUTS, NUMPY_AVAILABLE
+    from frame_record import FrameRecord
+    from rate_policy import build_sink_decimators, SINKS
+    from change_filter import build_change_filters
+    from fast_packet import build_fast_packet_assembler
+    from transport_protocol import build_transport_protocol_manager, TP_CM_PGN, TP_DT_PGN
+    from priority_lanes import PriorityLanes, PendingItem, OVERFLOW_BLOCK
+    from n2k_decode import N2KFrameDecoder
+    from frame_decode import FrameDecoder
 from nmea2000.decoder import NMEA2000Decoder
 
 # Import constants for data categorization
@@ -55,6 +97,24 @@ class CANControllerNode(BaseNode):
         self.can_interface = config.get("can_interface", "socketcan")
         self.can_channel = config.get("can_channel", "vcan0")
         self.can_bitrate = config.get("can_bitrate", 250000)
+        self.can_filters = None  # Compiled acceptance filters (None = receive everything)
+        
+        # Concurrent capture from every configured channel (can_interface_N / can_channel_N).
+        # Frames are tagged with their channel and merged into one decode pipeline; sends use the primary bus.
+        self.can_multi_channel_enabled = config.get("can_multi_channel_enabled", False)
+        self.can_buses: Dict[str, Any] = {}  # Channel name -> open bus, primary first (multi-channel only)
+        self.can_channel_info: Dict[str, Dict[str, Any]] = {}  # Channel name -> interface, channel, bitrate, frames
+        self.can_channel_names: List[str] = []  # Channel index -> name (RawFrame.channel)
+        self.can_channel_indexes: Dict[str, int] = {}
+        self.can_capture_threads: List[threading.Thread] = []
+        
+        # Outbound CAN lanes (priority_lanes_enabled, threaded runtime): one lane per CAN priority (0-7),
+        # drained highest first by a TX thread. Emergency stop and steering frames use lanes 0 and 1.
+        # A full lane blocks the sender (up to can_tx_timeout) and then fails the send, never dropping a queued frame.
+        self.can_tx_lanes = (PriorityLanes(8, config.get("can_tx_lane_size", 64), name="can_tx", overflow=OVERFLOW_BLOCK)
+                             if self.priority_lanes_enabled else None)
+        self.can_tx_timeout = config.get("can_tx_timeout", 0.25)  # Max wait for a queued frame to be sent
+        self.can_tx_thread = None
         
         # CAN bus
         self.can_bus = None
@@ -62,11 +122,82 @@ class CANControllerNode(BaseNode):
         self.can_thread = None
         self.can_running = False
         
+        # asyncio runtime (run_async): python-can Notifier -> AsyncBufferedReader -> reader task per channel
+        self.async_runtime_enabled = config.get("async_runtime_enabled", False)
+        self.can_notifiers: List[Any] = []
+        self.can_reader_tasks: List[asyncio.Task] = []
+        self._async_stop_event: Optional[asyncio.Event] = None
+        
+        # Pipelined receive: capture thread -> rx ring -> decode thread -> fan-out ring -> fan-out thread
+        # Keeps bus draining even when decoding or UDP sends stall
+        self.can_pipeline_enabled = config.get("can_pipeline_enabled", False)
+        self.can_rx_ring = FrameRing(config.get("can_rx_ring_size", 4096), name="rx")
+        self.can_fanout_ring = FrameRing(config.get("can_fanout_ring_size", 4096), name="fanout")
+        self.can_decode_thread = None
+        self.can_fanout_thread = None
+        
+        # Multi-process decode sharded by PGN (0 = decode in-process)
+        self.can_decode_processes = config.get("can_decode_processes", 0)
+        self.can_decode_queue_size = config.get("can_decode_queue_size", 1024)
+        self.can_decode_pool = None
+        
+        # Per-sink (db, subscribers, master_core) decimation of rapid-update PGNs
+        self.sink_decimators = build_sink_decimators(self.get_config_value("decimation", {}))
+        self.decimation_flush_thread = None
+        self.decimation_flush_task = None
+        
+        # Per-sink suppression of unchanged signals (deadband / max silence)
+        self.change_filters = build_change_filters(self.get_config_value("change_detection", {}), SINKS)
+        
         # NMEA2000 Decoder
         self.decoder = NMEA2000Decoder()
+        # Binary fast path: decode straight from arbitration ID fields + payload bytes
+        # (skips the N2K ASCII string round-trip). Set binary_decode_enabled=false to force ASCII path.
+        self.binary_decode_enabled = config.get("binary_decode_enabled", True)
+        self.n2k_decoder = N2KFrameDecoder(self.decoder, self.binary_decode_enabled)
+        
+        # PGN registry: PGN -> category, collection and compiled field extractor (O(1) dispatch)
+        # Extra PGNs can be registered via "pgn_registry" config or self.pgn_registry.register()
+        self.pgn_registry = build_default_registry(DataCategories, self.get_config_value("pgn_registry", {}))
+        
+        # LRU cache of extracted fields for byte-identical repeats (PGN, source, dest, payload).
+        # Call self.decode_cache.clear() after registering PGNs at runtime.
+        self.decode_cache_enabled = config.get("decode_cache_enabled", False)
+        self.decode_cache_size = config.get("decode_cache_size", 4096)
+        self.decode_cache = DecodeCache(self.decode_cache_size) if self.decode_cache_enabled else None
+        
+        # Vectorized NumPy decode of fixed-layout rapid-update PGNs (pipelined mode only, numpy optional)
+        self.batch_decode_enabled = config.get("batch_decode_enabled", False)
+        self.batch_decode_size = config.get("batch_decode_size", 256)
+        self.batch_decode_min_frames = config.get("batch_decode_min_frames", 8)
+        self.batch_decoder = self._create_batch_decoder() if self.batch_decode_enabled else None
+        
+        # Fast-packet reassembly for multi-frame PGNs (129029, 129540, 126996, ...)
+        # Fed only from the decode thread; set fast_packet.enabled=false to decode frame by frame
+        self.fast_packet = build_fast_packet_assembler(self.get_config_value("fast_packet", {}))
+        # J1939 transport protocol (TP.CM/TP.DT, BAM and RTS/CTS) reassembly for messages > 8 bytes
+        self.transport_protocol = build_transport_protocol_manager(self.get_config_value("transport_protocol", {}))
         
         # Data processing
-        self.data_subscribers = []  # Nodes subscribed to CAN data
+        # Nodes subscribed to CAN data, with per-subscriber filters indexed by PGN
+        # subscription_lease_seconds: default lease for subscriptions that do not ask for one (None = no expiry)
+        self.subscriptions = SubscriptionIndex(config.get("subscription_lease_seconds"), self._resolve_category)
+        # Latest value per (PGN, source, instance, field), queried with the get_signals command
+        self.signal_table = SignalTable() if config.get("signal_table_enabled", True) else None
+        # Fixed-size columnar history of recent raw frames, queried with the query_frames command
+        self.frame_history_size = config.get("frame_history_size", 65536)
+        self.frame_history = FrameHistory(self.frame_history_size) if self.frame_history_size > 0 else None
+        # Shared-memory ring of every processed frame for local readers (SharedFrameRingReader), created on start
+        self.shm_ring_enabled = config.get("shm_ring_enabled", False)
+        self.shm_ring: Optional[SharedFrameRing] = None
+        # Always-on per-PGN / per-source bus statistics (get_bus_stats command)
+        self.bus_stats = BusStats(self.can_bitrate)
+        # Latency histograms per pipeline stage and PGN (get_latency command)
+        self.latency = LatencyTracker(config.get("latency_max_pgns", 128)) if config.get("latency_tracking_enabled", True) else None
+        self._sink_latency_stages = {sink: STAGE_SEND_PREFIX + sink for sink in SINKS}
+        # Per-frame decode path (reassembly, decode, categorize, extract), shared with the decode shard workers
+        self.frame_decoder = FrameDecoder(self.n2k_decoder, self.pgn_registry, self.fast_packet,
+                                          self.transport_protocol, self.decode_cache, self.latency)
         self.emergency_stop_enabled = True
         # Use get_config_value() for enterprise config hierarchy (Master Core > Local > Default)
         self.data_ttl_days = self.get_config_value("data_ttl_days", 7)
@@ -74,17 +205,20 @@ class CANControllerNode(BaseNode):
         # CAN file playback
         self.playback_enabled = config.get("playback_enabled", True)
         self.playback_thread = None
+        self.playback_task = None
         self.playback_running = False
         
-        # Background heartbeat task
+        # Background heartbeat task (thread, or a loop timer in the asyncio runtime)
         self.heartbeat_task_running = False
         self.heartbeat_thread = None
+        self.heartbeat_timer = None
         
         # Register CAN-specific handlers
         # Note: BaseNode routes by message type, so we register "command" handler
         # that dispatches based on payload.command
         self.register_handler("command", self._handle_can_command)
         self.register_handler("subscribe_data", self._handle_subscribe_data)
+        self.register_handler("unsubscribe_data", self._handle_unsubscribe_data)
         self.register_handler("emergency_stop", self._handle_emergency_stop)
         self.register_handler("play_can_file", self._handle_play_can_file)
         
@@ -118,24 +252,83 @@ class CANControllerNode(BaseNode):
         if "can_bitrate" in config_updates:
             old_bitrate = self.can_bitrate
             self.can_bitrate = config_updates["can_bitrate"]
+            self.bus_stats.bitrate = self.can_bitrate
             logger.info(f"CAN bitrate configuration updated: {old_bitrate} -> {self.can_bitrate}")
             can_config_changed = True
         
+        if "decimation" in config_updates:
+            try:
+                self.sink_decimators = build_sink_decimators(self.get_config_value("decimation", {}))
+                self._start_decimation_flush_thread()
+                logger.info(f"✅ [can_controller] Decimation policies updated for sinks: {list(self.sink_decimators.keys())}")
+            except Exception as e:
+                logger.error(f"❌ [can_controller] Invalid decimation config, keeping previous policies: {e}")
+        
+        if "change_detection" in config_updates:
+            try:
+                self.change_filters = build_change_filters(self.get_config_value("change_detection", {}), SINKS)
+                logger.info(f"✅ [can_controller] Change detection updated for sinks: {list(self.change_filters.keys())}")
+            except Exception as e:
+                logger.error(f"❌ [can_controller] Invalid change_detection config, keeping previous policies: {e}")
+        
+        # Acceptance filters can be swapped on the open bus without a restart
+        if "can_filters" in config_updates and not can_config_changed:
+            self._apply_can_filters()
+        
         # Restart CAN bus if interface/channel/bitrate changed
         if can_config_changed:
-            logger.info("🔄 [can_controller] Restarting CAN bus with new configuration...")
-            self._stop_can_bus()
-            time.sleep(0.5)  # Brief delay to ensure clean shutdown
-            if self._start_can_bus():
-                logger.info("✅ [can_controller] CAN bus restarted successfully with new configuration")
+            if self.event_loop is not None:
+                asyncio.run_coroutine_threadsafe(self._restart_can_bus_async(), self.event_loop)
             else:
-                logger.error("❌ [can_controller] Failed to restart CAN bus with new configuration")
+                self._restart_can_bus()
+    
+    def _restart_can_bus(self):
+        """Reopen the CAN bus with the current interface/channel/bitrate"""
+        logger.info("🔄 [can_controller] Restarting CAN bus with new configuration...")
+        self._stop_can_bus()
+        time.sleep(0.5)  # Brief delay to ensure clean shutdown
+        self._log_can_restart(self._start_can_bus())
+    
+    async def _restart_can_bus_async(self):
+        """asyncio runtime: _restart_can_bus() without blocking the event loop"""
+        logger.info("🔄 [can_controller] Restarting CAN bus with new configuration...")
+        self._stop_can_bus()
+        await asyncio.sleep(0.5)  # Brief delay to ensure clean shutdown
+        self._log_can_restart(await self._start_can_bus_async())
+    
+    def _log_can_restart(self, started: bool):
+        if started:
+            logger.info("✅ [can_controller] CAN bus restarted successfully with new configuration")
+        else:
+            logger.error("❌ [can_controller] Failed to restart CAN bus with new configuration")
     
     def start(self):
         """Start the CAN controller node"""
         if not super().start():
             return False
         
+        self._request_startup_config()
+        
+        # Give Master Core a moment to respond (config is async)
+        time.sleep(0.5)  # Small delay for config response
+        
+        self._apply_startup_config()
+        self._finish_start(self._start_can_bus())
+        return True
+    
+    async def start_async(self) -> bool:
+        """Start the CAN controller node on the running asyncio event loop"""
+        if not await super().start_async():
+            return False
+        
+        self._request_startup_config()
+        await asyncio.sleep(0.5)  # Small delay for config response
+        self._apply_startup_config()
+        self._finish_start(await self._start_can_bus_async())
+        return True
+    
+    def _request_startup_config(self):
+        """Request configuration from Master Core during startup"""
         logger.info(f"🔧 [can_controller] Starting configuration setup...")
         logger.info(f"🔧 [can_controller] Current master_core_config: {self.master_core_config}")
         logger.info(f"🔧 [can_controller] Current local config data_ttl_days: {self.config.get('data_ttl_days', 'NOT SET')}")
@@ -143,10 +336,9 @@ class CANControllerNode(BaseNode):
         # Request configuration from Master Core (enterprise pattern)
         logger.info(f"🔧 [can_controller] Requesting config from Master Core...")
         self.request_config_from_master()
-        
-        # Give Master Core a moment to respond (config is async)
-        time.sleep(0.5)  # Small delay for config response
-        
+    
+    def _apply_startup_config(self):
+        """Apply the startup config received from Master Core (or the local config)"""
         # Update data_ttl_days from config hierarchy
         logger.info(f"🔧 [can_controller] Getting data_ttl_days from config hierarchy...")
         logger.info(f"🔧 [can_controller] master_core_config after request: {self.master_core_config}")
@@ -156,8 +348,11 @@ class CANControllerNode(BaseNode):
         logger.info(f"✅ [can_controller] CAN Controller Node using TTL: {self.data_ttl_days} days (from {config_source})")
         logger.info(f"🔧 [can_controller] TTL in seconds: {self.data_ttl_days * 86400}")
         
-        # Start CAN bus (node continues even if CAN bus fails)
-        can_bus_started = self._start_can_bus()
+        if self.shm_ring_enabled:
+            self._open_shm_ring()
+    
+    def _finish_start(self, can_bus_started: bool):
+        """Start the heartbeat once the CAN bus was started (node continues even if CAN bus fails)"""
         if not can_bus_started:
             logger.warning("⚠️ [can_controller] CAN bus initialization failed, but node will continue running")
             logger.warning("⚠️ [can_controller] CAN functionality will be unavailable, but node can still receive commands")
@@ -166,28 +361,65 @@ class CANControllerNode(BaseNode):
         self._start_heartbeat_task()
         self.status = "RUNNING"
         logger.info("✅ [can_controller] CAN Controller Node started successfully")
-        return True
     
     def stop(self):
         """Stop the CAN controller node"""
         self._stop_heartbeat_task()
         self._stop_can_bus()
         self._stop_playback()
+        if self.shm_ring is not None:
+            self.shm_ring.close()
+            self.shm_ring = None
         super().stop()
     
+    def _open_shm_ring(self):
+        """Create the shared-memory frame ring (node continues without it on failure)"""
+        name = self.config.get("shm_ring_name", "can_controller_frames")
+        try:
+            self.shm_ring = SharedFrameRing(
+                name,
+                capacity=self.config.get("shm_ring_slots", 4096),
+                slot_size=self.config.get("shm_ring_slot_size", 512)
+            )
+            logger.info(f"✅ [can_controller] Publishing frames to shared memory ring '{name}' ({self.shm_ring.capacity} slots)")
+        except Exception as e:
+            logger.error(f"❌ [can_controller] Failed to create shared memory ring '{name}': {e}")
+            self.shm_ring = None
+    
+    async def run_async(self) -> bool:
+        """Run the node on a single asyncio event loop until request_async_stop()
+        
+        Alternative to start() + run_daemon(): UDP messages arrive through an
+        asyncio datagram endpoint, CAN frames through python-can's Notifier and
+        AsyncBufferedReader, and the heartbeat, decimation flush and playback are
+        loop timers/tasks. Decoding, fan-out and command handling all run on the
+        loop thread.
+        
+        Returns:
+            bool: False if the node failed to start
+        """
+        self._async_stop_event = asyncio.Event()
+        if not await self.start_async():
+            return False
+        try:
+            await self._async_stop_event.wait()
+        finally:
+            self.stop()
+        return True
+    
+    def request_async_stop(self):
+        """Ask run_async() to stop (safe from signal handlers and other threads)"""
+        if self.event_loop is not None and self._async_stop_event is not None:
+            self.event_loop.call_soon_threadsafe(self._async_stop_event.set)
+    
     def run_daemon(self):
         """Main daemon loop for CAN controller"""
         logger.info("CAN Controller Daemon started successfully")
         try:
+            # The receive threads started by _start_can_receive_threads() own the bus;
+            # reading it here as well would split frames (and reassembly sessions) between two consumers
             while self.listening:
-                try:
-                    # Listen for CAN messages
-                    message = self.can_bus.recv(timeout=1.0)
-                    if message:
-                        self._process_can_message(message)
-                except Exception as e:
-                    logger.error(f"Error receiving CAN message: {e}")
-                    time.sleep(1)
+                time.sleep(0.5)
         except KeyboardInterrupt:
             logger.info("Shutdown signal received")
         finally:
@@ -265,6 +497,17 @@ class CANControllerNode(BaseNode):
     
     def _start_can_bus(self) -> bool:
         """Start CAN bus communication"""
+        return self._open_can_bus() and self._start_can_listeners()
+    
+    async def _start_can_bus_async(self) -> bool:
+        """asyncio runtime: open the bus in the default executor (interface detection and the
+        `ip link` check block), then start reading it on the loop"""
+        if not await self.event_loop.run_in_executor(None, self._open_can_bus):
+            return False
+        return self._start_can_listeners()
+    
+    def _open_can_bus(self) -> bool:
+        """Open and verify the CAN bus (and extra capture channels); blocking, safe to run off the loop"""
         import platform
         import sys
         
@@ -299,10 +542,16 @@ class CANControllerNode(BaseNode):
                     logger.warning(f"⚠️ [can_controller] CAN bus initialization failed. Node will continue but CAN functionality will be unavailable.")
                     return False
             
+            # Compile acceptance filters so unwanted PGNs are dropped in kernel/hardware
+            self.can_filters = self._build_can_filters()
+            if self.can_filters:
+                logger.info(f"🔧 [can_controller] Applying {len(self.can_filters)} CAN acceptance filter(s)")
+            
             self.can_bus = can.interface.Bus(
                 interface=self.can_interface,
                 channel=self.can_channel,
-                bitrate=self.can_bitrate
+                bitrate=self.can_bitrate,
+                can_filters=self.can_filters
             )
             logger.info(f"✅ [can_controller] CAN bus object created: {self.can_bus}")
             
@@ -360,14 +609,8 @@ class CANControllerNode(BaseNode):
                 # Don't fail here - let the bus try to work, but log the warning
                 # The bus will fail on actual send/receive if it's not functional
             
-            # Start CAN message listener
-            self.can_running = True
-            self.can_thread = threading.Thread(target=self._can_message_loop)
-            self.can_thread.daemon = True
-            self.can_thread.start()
-            logger.info(f"✅ [can_controller] CAN message listener thread started")
-            
-            logger.info(f"✅ [can_controller] CAN bus started successfully on {self.can_interface}:{self.can_channel}")
+            if self.can_multi_channel_enabled:
+                self._open_can_channels()
             return True
             
         except OSError as e:
@@ -394,690 +637,699 @@ class CANControllerNode(BaseNode):
             logger.warning(f"⚠️ [can_controller] CAN bus initialization failed. Node will continue but CAN functionality will be unavailable.")
             return False
     
+    def _start_can_listeners(self) -> bool:
+        """Start reading the opened bus and the CAN TX thread"""
+        try:
+            # Start CAN message listener
+            self._start_can_receive_threads()
+            self._start_can_tx_thread()
+            
+            logger.info(f"✅ [can_controller] CAN bus started successfully on {self.can_interface}:{self.can_channel}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ [can_controller] Failed to start CAN bus: {e}")
+            import traceback
+            logger.error(f"❌ [can_controller] Traceback: {traceback.format_exc()}")
+            logger.warning(f"⚠️ [can_controller] CAN bus initialization failed. Node will continue but CAN functionality will be unavailable.")
+            return False
+    
+    def _start_can_receive_threads(self):
+        """Start CAN receive thread(s) - inline loop or capture/decode/fan-out pipeline"""
+        self.can_running = True
+        self._start_decimation_flush_thread()
+        if self.event_loop is not None:
+            self._start_can_async_receive()
+            return
+        if self.can_decode_processes > 0:
+            # Decoding runs in worker processes; this process only captures and fans out
+            self._start_decode_pool(self._handle_shard_result)
+            self._start_capture_threads(self._can_shard_capture_loop, "can-capture")
+            if self.can_pipeline_enabled:
+                logger.info("🔧 [can_controller] can_decode_processes set - decode shard pool replaces the in-process pipeline")
+        elif self.can_pipeline_enabled or len(self.can_buses) > 1:
+            # Several channels always share one decode thread (reassembly state is not thread-safe)
+            self.can_rx_ring.clear()
+            self.can_fanout_ring.clear()
+            self._start_capture_threads(self._can_capture_loop, "can-capture")
+            self.can_decode_thread = threading.Thread(target=self._can_decode_loop, name="can-decode")
+            self.can_fanout_thread = threading.Thread(target=self._can_fanout_loop, name="can-fanout")
+            for thread in (self.can_decode_thread, self.can_fanout_thread):
+                thread.daemon = True
+                thread.start()
+            logger.info(f"✅ [can_controller] CAN pipelined receive started (rx ring: {self.can_rx_ring.capacity}, fan-out ring: {self.can_fanout_ring.capacity})")
+        else:
+            self._start_capture_threads(self._can_message_loop, "can-receive")
+            logger.info(f"✅ [can_controller] CAN message listener thread started")
+    
+    def _start_can_tx_thread(self):
+        """Start the thread draining the outbound CAN lanes (threaded runtime with priority lanes only)"""
+        if self.can_tx_lanes is None or self.event_loop is not None:
+            return
+        self.can_tx_thread = threading.Thread(target=self._can_tx_loop, name="can-tx")
+        self.can_tx_thread.daemon = True
+        self.can_tx_thread.start()
+    
+    def _can_tx_loop(self):
+        """Send queued CAN frames, highest priority lane first"""
+        while self.can_running:
+            pending = self.can_tx_lanes.get(timeout=0.5)
+            if pending is None:
+                continue
+            try:
+                self.can_bus.send(pending.item)
+                pending.complete()
+            except Exception as e:
+                pending.complete(e)
+    
+    def _transmit_can(self, message: can.Message, lane: Optional[int] = None, wait: bool = True) -> bool:
+        """Send a frame on the primary bus, through the outbound priority lanes if enabled
+        
+        Args:
+            message: Frame to send
+            lane: Outbound lane 0-7 (default: CAN priority bits of an extended ID, 6 for standard IDs)
+            wait: Wait (up to can_tx_timeout) until the frame is actually sent
+        
+        Returns:
+            bool: True if sent (or queued when wait=False), False if the lane stayed full or the wait timed out
+        
+        Raises:
+            Exception from can_bus.send()
+        """
+        if self.can_tx_thread is None or not self.can_tx_thread.is_alive():
+            self.can_bus.send(message)
+            return True
+        if lane is None:
+            lane = (message.arbitration_id >> 26) & 0x7 if message.is_extended_id else 6
+        pending = PendingItem(message)
+        deadline = time.monotonic() + self.can_tx_timeout
+        if not self.can_tx_lanes.put(pending, lane, timeout=self.can_tx_timeout):
+            logger.error(f"❌ [can_controller] CAN TX lane {lane} full for {self.can_tx_timeout}s, frame 0x{message.arbitration_id:X} not sent")
+            return False
+        if not wait:
+            return True
+        if not pending.wait(max(0.0, deadline - time.monotonic())):
+            logger.warning(f"⚠️ [can_controller] CAN frame 0x{message.arbitration_id:X} not sent within {self.can_tx_timeout}s (lane {lane})")
+            return False
+        if pending.error is not None:
+            raise pending.error
+        return True
+    
+    def _message_priority(self, message: NodeMessage) -> Priority:
+        """Dispatch steering commands as urgent whatever priority the sender set"""
+        if message.type == MessageType.COMMAND and message.payload.get("command") == "send_can_message":
+            return max(message.priority, Priority.CRITICAL, key=lambda priority: priority.value)
+        return super()._message_priority(message)
+    
+    def _start_decode_pool(self, result_handler):
+        """Start the PGN-sharded decode worker processes"""
+        self.can_decode_pool = DecodeShardPool(
+            self.can_decode_processes,
+            functools.partial(
+                ShardFrameDecoder,
+                self.get_config_value("pgn_registry", {}),
+                self.get_config_value("fast_packet", {}),
+                self.get_config_value("transport_protocol", {}),
+                self.decode_cache_size if self.decode_cache_enabled else 0,
+                self.binary_decode_enabled
+            ),
+            result_handler,
+            queue_size=self.can_decode_queue_size
+        )
+        self.can_decode_pool.start()
+    
+    def _start_can_async_receive(self):
+        """asyncio runtime: attach a Notifier + AsyncBufferedReader to each bus and start its reader task
+        
+        The in-process pipeline threads are not used; shard results are handed back to the loop.
+        """
+        if self.can_decode_processes > 0:
+            self._start_decode_pool(lambda result: self.event_loop.call_soon_threadsafe(self._handle_shard_result, result))
+        elif self.can_pipeline_enabled:
+            logger.info("🔧 [can_controller] asyncio runtime decodes on the event loop - can_pipeline_enabled is ignored")
+        for channel, bus in (self.can_buses or {None: self.can_bus}).items():
+            reader = can.AsyncBufferedReader()
+            # Buses with a file descriptor (SocketCAN) are read by the loop itself, others by a notifier thread
+            self.can_notifiers.append(can.Notifier(bus, [reader], loop=self.event_loop))
+            self.can_reader_tasks.append(self.event_loop.create_task(self._can_async_receive(reader, channel)))
+        logger.info(f"✅ [can_controller] CAN asyncio receive started ({len(self.can_reader_tasks)} channel(s))")
+    
+    async def _can_async_receive(self, reader, channel: Optional[str] = None):
+        """asyncio runtime: decode and fan out frames from one channel's reader on the event loop
+        
+        Frames already buffered are taken in bursts of up to batch_decode_size (batch
+        decoded if enabled), then the loop is yielded so UDP commands and timers are
+        not starved by a busy bus.
+        """
+        buffer = reader.buffer
+        channel_index = self.can_channel_indexes.get(channel, 0)
+        while self.can_running:
+            burst = [await reader.get_message()]
+            while len(burst) < self.batch_decode_size and not buffer.empty():
+                burst.append(buffer.get_nowait())
+            if channel is not None:
+                for message in burst:
+                    self._tag_channel(message, channel)
+            try:
+                if self.can_decode_pool is not None:
+                    for message in burst:
+                        self._submit_to_decode_pool(message, channel_index)
+                elif self.batch_decoder is not None:
+                    for record in self._decode_can_batch(burst):
+                        self._fan_out_record(record)
+                else:
+                    for message in burst:
+                        self._process_can_message(message)
+            except Exception as e:
+                logger.error(f"Error processing CAN message: {e}")
+            await asyncio.sleep(0)
+    
+    def _start_capture_threads(self, target, name: str):
+        """Start the bus receive thread(s): one per open channel in multi-channel mode, else one for the primary bus"""
+        if not self.can_buses:
+            self.can_thread = threading.Thread(target=target, name=name)
+            self.can_thread.daemon = True
+            self.can_thread.start()
+            return
+        self.can_capture_threads = []
+        for channel_name, bus in self.can_buses.items():
+            thread = threading.Thread(target=target, args=(bus, channel_name), name=f"{name}-{channel_name}")
+            thread.daemon = True
+            thread.start()
+            self.can_capture_threads.append(thread)
+        self.can_thread = self.can_capture_threads[0]
+        logger.info(f"✅ [can_controller] Capturing from {len(self.can_buses)} CAN channel(s): {list(self.can_buses)}")
+    
+    def _configured_can_channels(self) -> List[Dict[str, Any]]:
+        """Channels for multi-channel capture: the primary bus, then can_interface_1..4 / can_channel_1..4
+        
+        Each channel may set its own bitrate with can_bitrate_N. Entries repeating an
+        interface/channel pair are skipped. Channels are named by their channel string,
+        or "interface:channel" when two interfaces use the same channel string.
+        """
+        channels = [{"interface": self.can_interface, "channel": self.can_channel, "bitrate": self.can_bitrate}]
+        for i in range(1, 5):
+            interface = self.get_config_value(f"can_interface_{i}")
+            if interface:
+                channels.append({
+                    "interface": interface,
+                    "channel": self.get_config_value(f"can_channel_{i}", "0"),
+                    "bitrate": self.get_config_value(f"can_bitrate_{i}", self.can_bitrate)
+                })
+        
+        configured = []
+        seen = set()
+        names = set()
+        for channel_config in channels:
+            key = (channel_config["interface"], str(channel_config["channel"]))
+            if key in seen:
+                continue
+            seen.add(key)
+            name = str(channel_config["channel"])
+            if name in names:
+                name = f"{channel_config['interface']}:{channel_config['channel']}"
+            names.add(name)
+            configured.append(dict(channel_config, name=name))
+        return configured
+    
+    def _open_can_channels(self):
+        """Open the secondary channels next to the (already open) primary bus
+        
+        A channel that fails to open is logged and skipped; capture continues on the others.
+        """
+        channels = self._configured_can_channels()
+        primary = channels[0]
+        self.can_buses = {primary["name"]: self.can_bus}
+        self.can_channel_info = {primary["name"]: {"interface": primary["interface"], "channel": primary["channel"],
+                                                   "bitrate": primary["bitrate"], "primary": True, "frames": 0}}
+        for channel_config in channels[1:]:
+            name = channel_config["name"]
+            try:
+                self.can_buses[name] = can.interface.Bus(
+                    interface=channel_config["interface"],
+                    channel=channel_config["channel"],
+                    bitrate=channel_config["bitrate"],
+                    can_filters=self.can_filters
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ [can_controller] Could not open CAN channel {channel_config['interface']}:{channel_config['channel']} ({e}), capturing without it")
+                continue
+            self.can_channel_info[name] = {"interface": channel_config["interface"], "channel": channel_config["channel"],
+                                           "bitrate": channel_config["bitrate"], "primary": False, "frames": 0}
+            logger.info(f"✅ [can_controller] CAN channel {name} opened on {channel_config['interface']}:{channel_config['channel']} at {channel_config['bitrate']} bps")
+        self.can_channel_names = list(self.can_buses)
+        self.can_channel_indexes = {name: index for index, name in enumerate(self.can_channel_names)}
+        # Bus load is reported against the combined capacity of all captured channels
+        self.bus_stats.bitrate = sum(info["bitrate"] for info in self.can_channel_info.values())
+    
+    def _create_batch_decoder(self) -> Optional[BatchDecoder]:
+        """Create the NumPy batch decoder (None if numpy is missing)"""
+        if not NUMPY_AVAILABLE:
+            logger.warning("⚠️ [can_controller] batch_decode_enabled is set but numpy is not installed, decoding frames one by one")
+            return None
+        # PGNs overridden via pgn_registry config keep their configured extractor
+        overridden = {int(pgn) for pgn in self.get_config_value("pgn_registry", {}) or {}}
+        return BatchDecoder(self._reference_document, {pgn: layout for pgn, layout in BATCH_LAYOUTS.items() if pgn not in overridden})
+    
+    def _reference_document(self, pgn_id: int, payload: bytes) -> Dict[str, Any]:
+        """Per-frame decode and extraction of a probe frame (batch decoder calibration)"""
+        decoded_data = self._decode_n2k_frame(pgn_id, 2, 0, 255, payload)
+        if decoded_data is None:
+            raise ValueError(f"PGN {pgn_id} frame {payload.hex()} not decoded")
+        return self.pgn_registry.extract(decoded_data, self.pgn_registry.category_for(pgn_id))
+    
+    def _start_decimation_flush_thread(self):
+        """Start the thread (or loop task) releasing latest_per_interval frames (only if a policy needs it)"""
+        if not self.can_running or not any(d.has_held_frames for d in self.sink_decimators.values()):
+            return
+        if self.event_loop is not None:
+            if self.decimation_flush_task is None or self.decimation_flush_task.done():
+                self.decimation_flush_task = self.event_loop.create_task(self._decimation_flush_async())
+            return
+        if self.decimation_flush_thread and self.decimation_flush_thread.is_alive():
+            return
+        self.decimation_flush_thread = threading.Thread(target=self._decimation_flush_loop, name="can-decimation")
+        self.decimation_flush_thread.daemon = True
+        self.decimation_flush_thread.start()
+    
+    def _decimation_flush_loop(self):
+        """Release held frames to their sinks when their interval ends"""
+        while self.can_running:
+            self._flush_decimated_frames()
+            time.sleep(0.05)
+    
+    async def _decimation_flush_async(self):
+        """asyncio runtime version of _decimation_flush_loop"""
+        while self.can_running:
+            self._flush_decimated_frames()
+            await asyncio.sleep(0.05)
+    
+    def _flush_decimated_frames(self):
+        """Deliver held frames whose interval has ended"""
+        now = time.monotonic()
+        for sink, decimator in list(self.sink_decimators.items()):
+            for record in decimator.pop_due(now):
+                if not self._signal_changed(sink, record, now):
+                    continue
+                try:
+                    self._deliver_to_sink(sink, record)
+                except Exception as e:
+                    logger.error(f"Error delivering decimated CAN frame to {sink}: {e}")
+    
+    def _build_can_filters(self):
+        """Compile the can_filters config, keeping the transport protocol frames when reassembly is enabled"""
+        required_pgns = (TP_CM_PGN, TP_DT_PGN) if self.transport_protocol is not None else ()
+        return build_can_filters(self.get_config_value("can_filters"), required_pgns)
+    
+    def _apply_can_filters(self) -> bool:
+        """Recompile can_filters config and apply it to the open bus"""
+        try:
+            self.can_filters = self._build_can_filters()
+            for bus in (self.can_buses.values() if self.can_buses else [self.can_bus]):
+                if bus:
+                    bus.set_filters(self.can_filters)
+            logger.info(f"✅ [can_controller] CAN acceptance filters updated: {len(self.can_filters) if self.can_filters else 'none (receive all)'}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ [can_controller] Failed to apply CAN acceptance filters: {e}")
+            return False
+    
     def _stop_can_bus(self):
         """Stop CAN bus communication"""
         self.can_running = False
-        if self.can_thread:
-            self.can_thread.join(timeout=5)
+        for thread in (self.can_thread, *self.can_capture_threads, self.can_decode_thread, self.can_fanout_thread,
+                       self.decimation_flush_thread, self.can_tx_thread):
+            if thread:
+                thread.join(timeout=5)
+        self.can_capture_threads = []
+        for notifier in self.can_notifiers:
+            notifier.stop()
+        for task in (*self.can_reader_tasks, self.decimation_flush_task):
+            if task:
+                task.cancel()
+        self.can_notifiers = []
+        self.can_reader_tasks = []
+        self.decimation_flush_task = None
+        if self.can_decode_pool:
+            self.can_decode_pool.stop()
+        
+        for bus in self.can_buses.values():
+            if bus is not self.can_bus:
+                bus.shutdown()
+        self.can_buses = {}
         
         if self.can_bus:
             self.can_bus.shutdown()
             logger.info("CAN bus stopped")
     
-    def _can_message_loop(self):
+    def _can_message_loop(self, bus=None, channel: Optional[str] = None):
         """Main CAN message processing loop"""
+        bus = bus or self.can_bus
         while self.can_running:
             try:
-                message = self.can_bus.recv(timeout=1.0)
+                message = bus.recv(timeout=1.0)
                 if message:
+                    if channel is not None:
+                        self._tag_channel(message, channel)
                     self._process_can_message(message)
             except Exception as e:
                 logger.error(f"Error processing CAN message: {e}")
     
+    def _can_capture_loop(self, bus=None, channel: Optional[str] = None):
+        """Pipeline stage 1: drain a CAN bus into the rx ring (no decoding here)
+        
+        In multi-channel mode one loop runs per channel, all feeding the same rx ring.
+        """
+        bus = bus or self.can_bus
+        while self.can_running:
+            try:
+                message = bus.recv(timeout=1.0)
+                if message:
+                    if channel is not None:
+                        self._tag_channel(message, channel)
+                    self.can_rx_ring.put(message)
+            except Exception as e:
+                logger.error(f"Error receiving CAN message: {e}")
+    
+    def _can_shard_capture_loop(self, bus=None, channel: Optional[str] = None):
+        """Drain a CAN bus and hand packed raw frames to the decode shard owning their PGN"""
+        bus = bus or self.can_bus
+        channel_index = self.can_channel_indexes.get(channel, 0)
+        channel_info = self.can_channel_info.get(channel)
+        while self.can_running:
+            try:
+                message = bus.recv(timeout=1.0)
+                if message:
+                    if channel_info is not None:
+                        channel_info["frames"] += 1
+                    self._submit_to_decode_pool(message, channel_index)
+            except Exception as e:
+                logger.error(f"Error receiving CAN message: {e}")
+    
+    def _submit_to_decode_pool(self, message, channel_index: int = 0):
+        """Pack a frame and queue it on the decode shard owning its PGN"""
+        frame = RawFrame.from_message(message, channel_index)
+        pgn_id = self.decoder._extract_header(frame.arbitration_id)[0]
+        if pgn_id == TP_DT_PGN:
+            pgn_id = TP_CM_PGN  # Keep a transport session's CM and DT frames on one shard
+        self.can_decode_pool.submit(pgn_id, frame.pack())
+    
+    def _tag_channel(self, message, channel: str):
+        """Mark a received message with its capture channel and count it"""
+        message.channel = channel
+        self.can_channel_info[channel]["frames"] += 1
+    
+    def _frame_channel(self, frame) -> Optional[str]:
+        """Capture channel name of a received message (None unless multi-channel capture is active)"""
+        return frame.channel if self.can_buses else None
+    
+    def _handle_shard_result(self, result: tuple):
+        """Fan out a frame decoded by a shard worker (runs on the pool collector thread)"""
+        packed_frame, category, parsed_data, error = result
+        frame = RawFrame.unpack(packed_frame)
+        channel = self.can_channel_names[frame.channel] if self.can_buses and frame.channel < len(self.can_channel_names) else None
+        if error is not None:
+            self._fan_out_can_error(FrameRecord.from_frame(frame, error=str(error), channel=channel), error)
+            return
+        record = FrameRecord.from_frame(
+            frame,
+            pgn=parsed_data["pgn"] if parsed_data is not None else self.decoder._extract_header(frame.arbitration_id)[0],
+            category=category,
+            parsed_data=parsed_data,
+            channel=channel
+        )
+        try:
+            self._fan_out_can_message(record)
+        except Exception as e:
+            self._fan_out_can_error(record, e)
+    
+    def _can_decode_loop(self):
+        """Pipeline stage 2: decode, categorize and extract frames from the rx ring"""
+        while self.can_running:
+            if self.batch_decoder is not None:
+                for record in self._decode_can_batch(self.can_rx_ring.get_batch(self.batch_decode_size, timeout=0.5)):
+                    self.can_fanout_ring.put(record)
+                continue
+            can_message = self.can_rx_ring.get(timeout=0.5)
+            if can_message is None:
+                continue
+            try:
+                record = self._decode_can_message(can_message)
+            except Exception as e:
+                record = FrameRecord.from_frame(can_message, error=str(e), channel=self._frame_channel(can_message))
+            self.can_fanout_ring.put(record)
+    
+    def _can_fanout_loop(self):
+        """Pipeline stage 3: DB send, subscriber broadcast and master-core send"""
+        while self.can_running:
+            record = self.can_fanout_ring.get(timeout=0.5)
+            if record is not None:
+                self._fan_out_record(record)
+    
+    def _fan_out_record(self, record: FrameRecord):
+        """Fan out a decoded record, or report it if decoding failed"""
+        if record.error is not None:
+            self._fan_out_can_error(record, record.error)
+            return
+        try:
+            self._fan_out_can_message(record)
+        except Exception as e:
+            self._fan_out_can_error(record, e)
+    
+    def _decode_can_batch(self, messages: List[Any]) -> List[FrameRecord]:
+        """Decode a burst of frames, vectorizing fixed-layout PGNs
+        
+        Frames of batch-capable PGNs are grouped per PGN and decoded with the
+        NumPy batch decoder; everything else (and groups smaller than
+        batch_decode_min_frames) goes through _decode_can_message. Records are
+        returned in receive order.
+        """
+        records: List[Optional[FrameRecord]] = [None] * len(messages)
+        groups: Dict[int, List[int]] = {}
+        headers = {}
+        for index, message in enumerate(messages):
+            if not message.is_extended_id or len(message.data) != 8:
+                continue
+            header = self.decoder._extract_header(message.arbitration_id)
+            if self.batch_decoder.supports(header[0]):
+                groups.setdefault(header[0], []).append(index)
+                headers[index] = header
+        
+        timestamp = None
+        for pgn_id, indices in groups.items():
+            if len(indices) < self.batch_decode_min_frames:
+                continue
+            if timestamp is None:
+                timestamp = format_timestamp(datetime.now())
+            started = time.perf_counter()
+            try:
+                documents = self.batch_decoder.decode(
+                    pgn_id,
+                    [bytes(messages[index].data) for index in indices],
+                    [headers[index][1] for index in indices],
+                    [headers[index][2] for index in indices],
+                    timestamp
+                )
+            except Exception as e:
+                logger.error(f"Batch decode failed for PGN {pgn_id}, decoding frames one by one: {e}")
+                continue
+            # Frames with a value the decoder rejects (None) are decoded one by one below
+            decoded = [(index, document) for index, document in zip(indices, documents) if document is not None]
+            category = self.pgn_registry.category_for(pgn_id)
+            if self.latency is not None and decoded:
+                # Decode and extraction are one vectorized step; record the per-frame share
+                per_frame = (time.perf_counter() - started) / len(indices)
+                now = time.time()
+                for index, _ in decoded:
+                    if messages[index].timestamp:
+                        self.latency.record(STAGE_RECEIVE, pgn_id, now - messages[index].timestamp)
+                    self.latency.record(STAGE_DECODE, pgn_id, per_frame)
+            for index, document in decoded:
+                records[index] = FrameRecord.from_frame(messages[index], pgn=pgn_id, category=category, parsed_data=document,
+                                                        channel=self._frame_channel(messages[index]))
+        
+        for index, record in enumerate(records):
+            if record is None:
+                try:
+                    records[index] = self._decode_can_message(messages[index])
+                except Exception as e:
+                    records[index] = FrameRecord.from_frame(messages[index], error=str(e), channel=self._frame_channel(messages[index]))
+        return records
+    
     def _process_can_message(self, can_message: can.Message):
         """Process incoming CAN message with NMEA2000 decoding"""
         try:
-            # Extract CAN ID components
-            received_pgn = (can_message.arbitration_id >> 8) & 0x3FFFF
-            
-            # Decode pgn_id, source_id, dest, priority using NMEA2000 decoder
-            can_id_29bits_decoded = self.decoder._extract_header(can_message.arbitration_id)
-            
-            pgn_id = can_id_29bits_decoded[0]  # PGN as integer
-            source_id = can_id_29bits_decoded[1]  # Source as integer
-            dest = can_id_29bits_decoded[2]  # Destination as integer
-            priority = can_id_29bits_decoded[3]  # Priority as integer
-            length = str(can_message.dlc)
-            
-            logger.info(f"Received message with PGN: HEX - {hex(received_pgn)} DEC - {received_pgn}, CAN ID: {hex(can_message.arbitration_id)}, data: {list(can_message.data)}")
-            
-            # Format timestamp
-            time_of_message = datetime.now().strftime("%Y-%m-%d-%H:%M:%S.%f")
-            
-            # Format payload data to hex string
-            payload_data_string = ""
-            counter = 0
-            for item in can_message.data:
-                if counter == 0:
-                    payload_data_string = payload_data_string + format(item, '02x')
-                    counter += 1
-                else:
-                    payload_data_string = payload_data_string + "," + format(item, '02x')
-            
-            # Create N2K ASCII formatted frame
-            formated_frame = (time_of_message + "," + str(priority) + "," + str(pgn_id) + "," + str(source_id) + "," + str(dest) + "," + length + "," + payload_data_string)
-            logger.info(f"N2K ASCII Version: {formated_frame}")
-            
-            # Decode the frame using NMEA2000 decoder
-            decoded_data = self.decoder.decode_basic_string(formated_frame)
-            
-            if decoded_data:
-                # Categorize the data
-                category = self._categorize_data(decoded_data)
-                
-                # Send to database via Master Core -> DB Client
-                self._send_parsed_data_to_db(decoded_data, category)
-                
-                # Broadcast raw CAN data to subscribers (for real-time monitoring)
-                message_data = {
-                    "arbitration_id": can_message.arbitration_id,
-                    "data": list(can_message.data),
-                    "timestamp": can_message.timestamp,
-                    "is_extended_id": can_message.is_extended_id,
-                    "is_remote_frame": can_message.is_remote_frame,
-                    "decoded": True,
-                    "pgn": decoded_data.PGN,
-                    "category": category.value if hasattr(category, 'value') else str(category)
-                }
-                self._broadcast_to_subscribers(message_data)
-                
-                # Send to master core
-                self.send_to_master_core(
-                    MessageType.DATA,
-                    {"can_message": message_data, "parsed_data": self._extract_data_fields(decoded_data, category)},
-                    Priority.NORMAL
-                )
-            else:
-                # Broadcast raw CAN data even if not decoded
-                message_data = {
-                    "arbitration_id": can_message.arbitration_id,
-                    "data": list(can_message.data),
-                    "timestamp": can_message.timestamp,
-                    "is_extended_id": can_message.is_extended_id,
-                    "is_remote_frame": can_message.is_remote_frame,
-                    "decoded": False
-                }
-                self._broadcast_to_subscribers(message_data)
-                
-                # Send to master core
-                self.send_to_master_core(
-                    MessageType.DATA,
-                    {"can_message": message_data},
-                    Priority.NORMAL
-                )
-                
+            record = self._decode_can_message(can_message)
+            self._fan_out_can_message(record)
         except Exception as e:
-            logger.error(f"Error processing CAN message: {e}")
-            # Still broadcast raw data for debugging
-            message_data = {
-                "arbitration_id": can_message.arbitration_id,
-                "data": list(can_message.data),
-                "timestamp": can_message.timestamp,
-                "is_extended_id": can_message.is_extended_id,
-                "is_remote_frame": can_message.is_remote_frame,
-                "error": str(e)
-            }
-            self._broadcast_to_subscribers(message_data)
+            self._fan_out_can_error(can_message, e)
     
-    def _broadcast_to_subscribers(self, data: Dict[str, Any]):
-        """Broadcast data to subscribed nodes"""
-        for subscriber in self.data_subscribers:
-            self.send_to_node(
-                subscriber,
+    def _decode_can_message(self, can_message: can.Message) -> FrameRecord:
+        """Decode, categorize and extract a CAN frame exactly once
+        
+        Returns:
+            FrameRecord shared by all sinks (parsed_data is None if the frame could not be decoded)
+        """
+        # Extract CAN ID components
+        received_pgn = (can_message.arbitration_id >> 8) & 0x3FFFF
+        
+        # Decode pgn_id, source_id, dest, priority using NMEA2000 decoder
+        can_id_29bits_decoded = self.decoder._extract_header(can_message.arbitration_id)
+        
+        pgn_id = can_id_29bits_decoded[0]  # PGN as integer
+        source_id = can_id_29bits_decoded[1]  # Source as integer
+        dest = can_id_29bits_decoded[2]  # Destination as integer
+        priority = can_id_29bits_decoded[3]  # Priority as integer
+        
+        logger.info(f"Received message with PGN: HEX - {hex(received_pgn)} DEC - {received_pgn}, CAN ID: {hex(can_message.arbitration_id)}, data: {list(can_message.data)}")
+        if self.latency is not None and can_message.timestamp:
+            self.latency.record(STAGE_RECEIVE, pgn_id, time.time() - can_message.timestamp)
+        
+        # Decode, categorize and extract once - shared by DB, subscribers and Master Core
+        channel = self._frame_channel(can_message)
+        category, parsed_data = self._decode_and_extract(pgn_id, priority, source_id, dest, can_message.data,
+                                                         self.can_channel_indexes.get(channel, 0))
+        if parsed_data is None:
+            return FrameRecord.from_frame(can_message, pgn=pgn_id, channel=channel)
+        return FrameRecord.from_frame(
+            can_message,
+            pgn=parsed_data["pgn"],
+            category=category,
+            parsed_data=parsed_data,
+            channel=channel
+        )
+    
+    def _fan_out_can_message(self, record: FrameRecord):
+        """Send a processed CAN frame to the DB, data subscribers and Master Core
+        
+        Each sink applies its own decimation policy and change detection (if
+        configured) before sending.
+        """
+        self._observe_frame(record)
+        if record.decoded and self.signal_table is not None:
+            # Latest values are kept for every decoded frame, before any sink decimation
+            self.signal_table.update(record.pgn, record.source, record.parsed_data)
+        
+        now = time.monotonic()
+        for sink in SINKS:
+            if sink == "db" and not record.decoded:
+                continue  # Only decoded frames are stored
+            decimator = self.sink_decimators.get(sink)
+            if decimator is not None and not decimator.allow(record, now):
+                continue
+            if self._signal_changed(sink, record, now):
+                self._deliver_to_sink(sink, record)
+        
+        if self.latency is not None and record.timestamp:
+            self.latency.record(STAGE_END_TO_END, record.pgn, time.time() - record.timestamp)
+    
+    def _signal_changed(self, sink: str, record: FrameRecord, now: float) -> bool:
+        """Check the sink's change filter (True if the sink has none)
+        
+        Runs after decimation, so the last forwarded value is what the sink actually received.
+        """
+        change_filter = self.change_filters.get(sink)
+        return change_filter is None or change_filter.allow(record, now)
+    
+    def _deliver_to_sink(self, sink: str, record: FrameRecord):
+        """Send a record to one sink (db, subscribers or master_core)"""
+        started = time.perf_counter() if self.latency is not None else 0.0
+        if sink == "db":
+            # Send to database via Master Core -> DB Client
+            self._send_parsed_data_to_db(record)
+        elif sink == "subscribers":
+            # Broadcast raw CAN data to subscribers (for real-time monitoring), decoded or not
+            self._broadcast_to_subscribers(record)
+        elif sink == "master_core":
+            self.send_to_master_core(
                 MessageType.DATA,
-                {"can_data": data},
+                record.master_core_payload,
                 Priority.NORMAL
             )
+        if self.latency is not None:
+            self.latency.record(self._sink_latency_stages[sink], record.pgn, time.perf_counter() - started)
     
-    def _categorize_data(self, data):
-        """Categorize decoded NMEA2000 data based on PGN"""
-        if data.PGN == 126993:  # 1F011 - "Heartbeat"
-            return DataCategories.HEARTBEAT
-        elif data.PGN == 127488:  # 1F200 - "Engine Parameters, Rapid Update"
-            return DataCategories.ENGINE
-        elif data.PGN == 127505:  # 1F211 - "Fluid Level"
-            return DataCategories.FUEL
-        elif data.PGN == 127250:  # 1F112 - "Vessel Heading"
-            return DataCategories.NAVIGATION
-        elif data.PGN == 127257:  # 1F119 - "Attitude"
-            return DataCategories.NAVIGATION
-        elif data.PGN == 129026:  # 1F802 - "COG & SOG, Rapid Update"
-            return DataCategories.NAVIGATION
-        elif data.PGN == 129025:  # 1F801 - "Position, Rapid Update"
-            return DataCategories.NAVIGATION
-        elif data.PGN == 129540:  # 1FA04 - "GNSS Sats in View"
-            return DataCategories.NAVIGATION
-        elif data.PGN == 129029:  # 1F805 - "GNSS Position Data"
-            return DataCategories.NAVIGATION
-        elif data.PGN == 126992:  # 1F010 - "System Time"
-            return DataCategories.NAVIGATION
-        elif data.PGN == 129539:  # 1FA03 - "GNSS DOPs"
-            return DataCategories.NAVIGATION
-        elif data.PGN == 127258:  # 1F11A - "Magnetic Variation"
-            return DataCategories.NAVIGATION
-        elif data.PGN == 127489:  # 1F201 - "Engine Parameters, Dynamic"
-            return DataCategories.ENGINE
-        elif data.PGN == 127497:  # 1F209 - "Trip Fuel Consumption, Engine"
-            return DataCategories.ENGINE
-        elif data.PGN == 127751:  # 1F307 - "DC Voltage / Current"
-            return DataCategories.ENERGYDISTRIBUTION
-        elif data.PGN == 127500:  # 1F20C - "Load Controller Connection State / Control"
-            return DataCategories.ENERGYDISTRIBUTION
-        elif data.PGN == 127501:  # 1F20D - "Switch Bank Status"
-            return DataCategories.ENERGYDISTRIBUTION
-        elif data.PGN == 127245:  # 1F10D - "Rudder"
-            return DataCategories.STEERING
-        elif data.PGN == 127508:  # 1F214 - "Battery Status"
-            return DataCategories.BATTERY
-        elif data.PGN == 127506:  # 1F212 - "DC Detailed Status"
-            return DataCategories.BATTERY
-        elif data.PGN == 129283:  # 1F903 - "Cross Track Error"
-            return DataCategories.NAVIGATION
-        elif data.PGN == 129284:  # 1F904 - "Navigation Data"
-            return DataCategories.NAVIGATION
-        elif data.PGN == 65361:  # FF51 - "Raymarine Alarm"
-            return DataCategories.PRODUCT
-        elif data.PGN == 60928:  # EE00 - "ISO Address Claim"
-            return DataCategories.PRODUCT
-        elif data.PGN == 59392:  # E800 - "ISO Acknowledge"
-            return DataCategories.PRODUCT
-        else:
-            return DataCategories.UNKNOWN
-    
-    def _generate_field_title(self, fields):
-        """Generate concatenated title from field IDs - reusable function"""
-        title = []
-        for item in fields: 
-            title.append(item.id)
-        return "-".join(title)
-    
-    def _extract_data_fields(self, data, category):
-        """Extract specific fields from decoded data based on category and PGN - matching original implementation"""
-        def _convert_value(value):
-            """Convert value to JSON-serializable format (handle bytes)"""
-            if isinstance(value, bytes):
-                return list(value)
-            return value
+    def _observe_frame(self, record: FrameRecord):
+        """Record a processed frame in the frame history, bus statistics and shared-memory ring"""
+        if self.frame_history is not None:
+            self.frame_history.append(record.arbitration_id, record.data, record.timestamp)
+        if self.shm_ring is not None:
+            self.shm_ring.publish(record, self.can_channel_indexes.get(record.channel, 0))
+        pgn = record.pgn if record.pgn is not None else pgn_from_arbitration_id(record.arbitration_id)
+        self.bus_stats.observe(
+            pgn,
+            record.source,
+            len(record.data),
+            record.timestamp,
+            error=record.error is not None,
+            decoded=record.decoded,
+            unknown=pgn not in self.pgn_registry
+        )
+    
+    def _fan_out_can_error(self, can_message, error):
+        """Report a CAN frame that failed processing to data subscribers"""
+        logger.error(f"Error processing CAN message: {error}")
+        # Still broadcast raw data for debugging
+        if not isinstance(can_message, FrameRecord) or can_message.error is None:
+            can_message = FrameRecord.from_frame(can_message, error=str(error), channel=self._frame_channel(can_message))
+        self._observe_frame(can_message)
+        self._broadcast_to_subscribers(can_message)
+    
+    def _decode_and_extract(self, pgn_id: int, priority: int, source_id: int, dest: int, payload: bytes,
+                            channel_index: int = 0):
+        """Decode, categorize and extract a frame (see FrameDecoder.decode_and_extract)
         
-        try:
-            if category == DataCategories.HEARTBEAT and data.PGN == 126993:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "data_transmit_offset": _convert_value(data.fields[0].value) if len(data.fields) > 0 else None,
-                    "unit_data_transmit_offset": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "sequence_counter": _convert_value(data.fields[1].value) if len(data.fields) > 1 else None,
-                    "unit_sequence_counter": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "controller1_state": _convert_value(data.fields[2].raw_value) if len(data.fields) > 2 else None,
-                    "unit_controller1_state": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "controller2_state": _convert_value(data.fields[3].raw_value) if len(data.fields) > 3 else None,
-                    "unit_controller2_state": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "equipment_status": _convert_value(data.fields[4].raw_value) if len(data.fields) > 4 else None,
-                    "unit_equipment_status": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "reserved_30": _convert_value(data.fields[5].value) if len(data.fields) > 5 else None,
-                    "unit_reserved_30": data.fields[5].unit_of_measurement if len(data.fields) > 5 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.FUEL and data.PGN == 127505:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "instance": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "type": data.fields[1].value if len(data.fields) > 1 else None,
-                    "unit_type": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "level": data.fields[2].value if len(data.fields) > 2 else None,
-                    "unit_level": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "capacity": data.fields[3].value if len(data.fields) > 3 else None,
-                    "unit_capacity": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "reserved_56": data.fields[4].value if len(data.fields) > 4 else None,
-                    "unit_reserved_56": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.NAVIGATION and data.PGN == 127250:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "sid": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "heading": data.fields[1].value if len(data.fields) > 1 else None,
-                    "unit_heading": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "deviation": data.fields[2].value if len(data.fields) > 2 else None,
-                    "unit_deviation": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "variation": data.fields[3].value if len(data.fields) > 3 else None,
-                    "unit_variation": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "reference": data.fields[4].value if len(data.fields) > 4 else None,
-                    "unit_reference": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "reserved_58": data.fields[5].value if len(data.fields) > 5 else None,
-                    "unit_reserved_58": data.fields[5].unit_of_measurement if len(data.fields) > 5 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.NAVIGATION and data.PGN == 127257:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "sid": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "yaw": data.fields[1].value if len(data.fields) > 1 else None,
-                    "unit_yaw": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "pitch": data.fields[2].value if len(data.fields) > 2 else None,
-                    "unit_pitch": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "roll": data.fields[3].value if len(data.fields) > 3 else None,
-                    "unit_roll": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "reserved_56": data.fields[4].value if len(data.fields) > 4 else None,
-                    "unit_reserved_56": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.NAVIGATION and data.PGN == 129026:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "sid": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "cog_reference": data.fields[1].value if len(data.fields) > 1 else None,
-                    "unit_cog_reference": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "reserved_10": data.fields[2].value if len(data.fields) > 2 else None,
-                    "unit_reserved_10": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "cog": data.fields[3].value if len(data.fields) > 3 else None,
-                    "unit_cog": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "sog": data.fields[4].value if len(data.fields) > 4 else None,
-                    "unit_sog": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "reserved_48": data.fields[5].value if len(data.fields) > 5 else None,
-                    "unit_reserved_48": data.fields[5].unit_of_measurement if len(data.fields) > 5 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.NAVIGATION and data.PGN == 129025:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "latitude": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit_latitude": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "longitude": data.fields[1].value if len(data.fields) > 1 else None,
-                    "unit_longitude": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.NAVIGATION and data.PGN == 129029:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "sid": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "date": data.fields[1].value.strftime('%Y/%m/%d') if len(data.fields) > 1 and hasattr(data.fields[1].value, 'strftime') else data.fields[1].value if len(data.fields) > 1 else None,
-                    "unit_date": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "time": data.fields[2].value.strftime('%H:%M:%S') if len(data.fields) > 2 and hasattr(data.fields[2].value, 'strftime') else data.fields[2].value if len(data.fields) > 2 else None,
-                    "unit_time": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "latitude": data.fields[3].value if len(data.fields) > 3 else None,
-                    "unit_latitude": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "longitude": data.fields[4].value if len(data.fields) > 4 else None,
-                    "unit_longitude": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "altitude": data.fields[5].value if len(data.fields) > 5 else None,
-                    "unit_altitude": data.fields[5].unit_of_measurement if len(data.fields) > 5 else None,
-                    "gnss_type": data.fields[6].value if len(data.fields) > 6 else None,
-                    "unit_gnss_type": data.fields[6].unit_of_measurement if len(data.fields) > 6 else None,
-                    "method": data.fields[7].value if len(data.fields) > 7 else None,
-                    "unit_method": data.fields[7].unit_of_measurement if len(data.fields) > 7 else None,
-                    "integrity": data.fields[8].value if len(data.fields) > 8 else None,
-                    "unit_integrity": data.fields[8].unit_of_measurement if len(data.fields) > 8 else None,
-                    "reserved_258": data.fields[9].value if len(data.fields) > 9 else None,
-                    "unit_reserved_258": data.fields[9].unit_of_measurement if len(data.fields) > 9 else None,
-                    "number_of_svs": data.fields[10].value if len(data.fields) > 10 else None,
-                    "unit_number_of_svs": data.fields[10].unit_of_measurement if len(data.fields) > 10 else None,
-                    "hdop": data.fields[11].value if len(data.fields) > 11 else None,
-                    "unit_hdop": data.fields[11].unit_of_measurement if len(data.fields) > 11 else None,
-                    "pdop": data.fields[12].value if len(data.fields) > 12 else None,
-                    "unit_pdop": data.fields[12].unit_of_measurement if len(data.fields) > 12 else None,
-                    "geoidal_separation": data.fields[13].value if len(data.fields) > 13 else None,
-                    "unit_geoidal_separation": data.fields[13].unit_of_measurement if len(data.fields) > 13 else None,
-                    "reference_stations": data.fields[14].value if len(data.fields) > 14 else None,
-                    "unit_reference_stations": data.fields[14].unit_of_measurement if len(data.fields) > 14 else None,
-                    "reference_station_type": data.fields[15].value if len(data.fields) > 15 else None,
-                    "unit_reference_station_type": data.fields[15].unit_of_measurement if len(data.fields) > 15 else None,
-                    "reference_station_id": data.fields[16].value if len(data.fields) > 16 else None,
-                    "unit_reference_station_id": data.fields[16].unit_of_measurement if len(data.fields) > 16 else None,
-                    "age_of_dgnss_corrections": data.fields[17].value if len(data.fields) > 17 else None,
-                    "unit_age_of_dgnss_corrections": data.fields[17].unit_of_measurement if len(data.fields) > 17 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.NAVIGATION and data.PGN == 129540:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "sid": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "range_residual_mode": data.fields[1].value if len(data.fields) > 1 else None,
-                    "unit_range_residual_mode": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "reserved_10": data.fields[2].value if len(data.fields) > 2 else None,
-                    "unit_reserved_10": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "sats_in_view": data.fields[3].value if len(data.fields) > 3 else None,
-                    "unit_sats_in_view": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "prn": data.fields[4].value if len(data.fields) > 4 else None,
-                    "unit_prn": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "elevation": data.fields[5].value if len(data.fields) > 5 else None,
-                    "unit_elevation": data.fields[5].unit_of_measurement if len(data.fields) > 5 else None,
-                    "azimuth": data.fields[6].value if len(data.fields) > 6 else None,
-                    "unit_azimuth": data.fields[6].unit_of_measurement if len(data.fields) > 6 else None,
-                    "snr": data.fields[7].value if len(data.fields) > 7 else None,
-                    "unit_snr": data.fields[7].unit_of_measurement if len(data.fields) > 7 else None,
-                    "range_residuals": data.fields[8].value if len(data.fields) > 8 else None,
-                    "unit_range_residuals": data.fields[8].unit_of_measurement if len(data.fields) > 8 else None,
-                    "status": data.fields[9].value if len(data.fields) > 9 else None,
-                    "unit_status": data.fields[9].unit_of_measurement if len(data.fields) > 9 else None,
-                    "reserved_116": data.fields[10].value if len(data.fields) > 10 else None,
-                    "unit_reserved_116": data.fields[10].unit_of_measurement if len(data.fields) > 10 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.NAVIGATION and data.PGN == 126992:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "sid": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "measure_source": data.fields[1].value if len(data.fields) > 1 else None,
-                    "unit_measure_source": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "reserved_12": data.fields[2].value if len(data.fields) > 2 else None,
-                    "unit_reserved_12": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "date": data.fields[3].value.strftime('%Y/%m/%d') if len(data.fields) > 3 and hasattr(data.fields[3].value, 'strftime') else data.fields[3].value if len(data.fields) > 3 else None,
-                    "unit_date": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "time": data.fields[4].value.strftime('%H:%M:%S') if len(data.fields) > 4 and hasattr(data.fields[4].value, 'strftime') else data.fields[4].value if len(data.fields) > 4 else None,
-                    "unit_time": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.NAVIGATION and data.PGN == 129283:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "sid": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit_sid": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "xte_mode": _convert_value(data.fields[1].raw_value) if len(data.fields) > 1 else None,
-                    "unit_xte_mode": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "reserved_12": _convert_value(data.fields[2].value) if len(data.fields) > 2 else None,
-                    "unit_reserved_12": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "navigation_terminated": _convert_value(data.fields[3].raw_value) if len(data.fields) > 3 else None,
-                    "unit_navigation_terminated": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "xte": data.fields[4].value if len(data.fields) > 4 else None,
-                    "unit_xte": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "reserved_48": data.fields[5].value if len(data.fields) > 5 else None,
-                    "unit_reserved_48": data.fields[5].unit_of_measurement if len(data.fields) > 5 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.NAVIGATION and data.PGN == 129284:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "sid": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit_sid": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "distance_to_waypoint": data.fields[1].value if len(data.fields) > 1 else None,
-                    "unit_distance_to_waypoint": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "course_bearing_reference": _convert_value(data.fields[2].raw_value) if len(data.fields) > 2 else None,
-                    "unit_course_bearing_reference": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "perpendicular_crossed": _convert_value(data.fields[3].raw_value) if len(data.fields) > 3 else None,
-                    "unit_perpendicular_crossed": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "arrival_circle_entered": _convert_value(data.fields[4].raw_value) if len(data.fields) > 4 else None,
-                    "unit_arrival_circle_entered": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "calculation_type": _convert_value(data.fields[5].raw_value) if len(data.fields) > 5 else None,
-                    "unit_calculation_type": data.fields[5].unit_of_measurement if len(data.fields) > 5 else None,
-                    "eta_time": data.fields[6].value if len(data.fields) > 6 else None,
-                    "unit_eta_time": data.fields[6].unit_of_measurement if len(data.fields) > 6 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.ENGINE and data.PGN == 127488:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "instance": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "speed": data.fields[1].value if len(data.fields) > 1 else None,
-                    "unit_speed": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "boost_pressure": data.fields[2].value if len(data.fields) > 2 else None,
-                    "unit_boost_pressure": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "tilt_trim": data.fields[3].value if len(data.fields) > 3 else None,
-                    "unit_tilt_trim": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "reserved_48": data.fields[4].value if len(data.fields) > 4 else None,
-                    "unit_reserved_48": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.ENERGYDISTRIBUTION and data.PGN == 127751:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "sid": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "connection_number": data.fields[1].value if len(data.fields) > 1 else None,
-                    "unit_connection_number": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "dc_voltage": data.fields[2].value if len(data.fields) > 2 else None,
-                    "unit_dc_voltage": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "dc_current": data.fields[3].value if len(data.fields) > 3 else None,
-                    "unit_dc_current": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "reserved_56": data.fields[4].value if len(data.fields) > 4 else None,
-                    "unit_reserved_56": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.PRODUCT and data.PGN == 65361:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "manufacturer_code": _convert_value(data.fields[0].raw_value) if len(data.fields) > 0 else None,
-                    "unit_manufacturer_code": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "reserved_11": _convert_value(data.fields[1].value) if len(data.fields) > 1 else None,
-                    "unit_reserved_11": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "industry_code": _convert_value(data.fields[2].raw_value) if len(data.fields) > 2 else None,
-                    "unit_industry_code": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "alarm_id": _convert_value(data.fields[3].raw_value) if len(data.fields) > 3 else None,
-                    "unit_alarm_id": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "alarm_group": _convert_value(data.fields[4].raw_value) if len(data.fields) > 4 else None,
-                    "unit_alarm_group": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "reserved_32": data.fields[5].value if len(data.fields) > 5 else None,
-                    "unit_reserved_32": data.fields[5].unit_of_measurement if len(data.fields) > 5 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.PRODUCT and data.PGN == 60928:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "unique_number": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit_unique_number": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "manufacturer_code": _convert_value(data.fields[1].raw_value) if len(data.fields) > 1 else None,
-                    "unit_manufacturer_code": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "device_instance_lower": _convert_value(data.fields[2].value) if len(data.fields) > 2 else None,
-                    "unit_device_instance_lower": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "device_instance_upper": _convert_value(data.fields[3].value) if len(data.fields) > 3 else None,
-                    "unit_device_instance_upper": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "device_function": _convert_value(data.fields[4].raw_value) if len(data.fields) > 4 else None,
-                    "unit_device_function": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "spare": _convert_value(data.fields[5].value) if len(data.fields) > 5 else None,
-                    "unit_spare": data.fields[5].unit_of_measurement if len(data.fields) > 5 else None,
-                    "device_class": _convert_value(data.fields[6].raw_value) if len(data.fields) > 6 else None,
-                    "unit_device_class": data.fields[6].unit_of_measurement if len(data.fields) > 6 else None,
-                    "industry_code": _convert_value(data.fields[7].raw_value) if len(data.fields) > 7 else None,
-                    "unit_industry_code": data.fields[7].unit_of_measurement if len(data.fields) > 7 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.PRODUCT and data.PGN == 59392:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "control": _convert_value(data.fields[0].raw_value) if len(data.fields) > 0 else None,
-                    "unit_control": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "group_function": _convert_value(data.fields[1].value) if len(data.fields) > 1 else None,
-                    "unit_group_function": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "reserved_16": data.fields[2].value if len(data.fields) > 2 else None,
-                    "unit_reserved_16": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "ack_pgn": data.fields[3].value if len(data.fields) > 3 else None,
-                    "unit_ack_pgn": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.STEERING and data.PGN == 127245:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "instance": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit_instance": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "direction_order": _convert_value(data.fields[1].raw_value) if len(data.fields) > 1 else None,
-                    "unit_direction_order": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "reserved_11": _convert_value(data.fields[2].value) if len(data.fields) > 2 else None,
-                    "unit_reserved_11": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "angle_order": _convert_value(data.fields[3].value) if len(data.fields) > 3 else None,
-                    "unit_angle_order": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "position": _convert_value(data.fields[4].value) if len(data.fields) > 4 else None,
-                    "unit_position": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "reserved_48": data.fields[5].value if len(data.fields) > 5 else None,
-                    "unit_reserved_48": data.fields[5].unit_of_measurement if len(data.fields) > 5 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.BATTERY and data.PGN == 127508:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "instance": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit_instance": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "voltage": data.fields[1].value if len(data.fields) > 1 else None,
-                    "unit_voltage": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "current": data.fields[2].value if len(data.fields) > 2 else None,
-                    "unit_current": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "temperature": data.fields[3].value if len(data.fields) > 3 else None,
-                    "unit_temperature": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "sid": data.fields[4].value if len(data.fields) > 4 else None,
-                    "unit_sid": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            elif category == DataCategories.BATTERY and data.PGN == 127506:
-                # Generate title from field IDs (modularized function)
-                title = self._generate_field_title(data.fields)
-                
-                return {
-                    "title": title,
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "sid": data.fields[0].value if len(data.fields) > 0 else None,
-                    "unit_sid": data.fields[0].unit_of_measurement if len(data.fields) > 0 else None,
-                    "instance": data.fields[1].value if len(data.fields) > 1 else None,
-                    "unit_instance": data.fields[1].unit_of_measurement if len(data.fields) > 1 else None,
-                    "dc_type": _convert_value(data.fields[2].raw_value) if len(data.fields) > 2 else None,
-                    "unit_dc_type": data.fields[2].unit_of_measurement if len(data.fields) > 2 else None,
-                    "state_of_charge": _convert_value(data.fields[3].value) if len(data.fields) > 3 else None,
-                    "unit_state_of_charge": data.fields[3].unit_of_measurement if len(data.fields) > 3 else None,
-                    "state_of_health": data.fields[4].value if len(data.fields) > 4 else None,
-                    "unit_state_of_health": data.fields[4].unit_of_measurement if len(data.fields) > 4 else None,
-                    "time_remaining": data.fields[5].value if len(data.fields) > 5 else None,
-                    "unit_time_remaining": data.fields[5].unit_of_measurement if len(data.fields) > 5 else None,
-                    "ripple_voltage": data.fields[6].value if len(data.fields) > 6 else None,
-                    "unit_ripple_voltage": data.fields[6].unit_of_measurement if len(data.fields) > 6 else None,
-                    "remaining_capacity": data.fields[7].value if len(data.fields) > 7 else None,
-                    "unit_remaining_capacity": data.fields[7].unit_of_measurement if len(data.fields) > 7 else None,
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-            else:
-                # Generic extraction for unknown PGNs
-                return {
-                    "pgn": data.PGN,
-                    "source": data.source,
-                    "dest": data.destination,
-                    "fields": [_convert_value(field.value) for field in data.fields] if data.fields else [],
-                    "timestamp": data.timestamp.isoformat() if hasattr(data.timestamp, 'isoformat') else str(data.timestamp)
-                }
-        except Exception as e:
-            logger.error(f"Error extracting data fields: {e}")
-            return {
-                "pgn": data.PGN,
-                "source": data.source,
-                "dest": data.destination,
-                "error": str(e),
-                "timestamp": data.timestamp
-            }
+        Returns:
+            Tuple of (category, parsed_data), or (None, None) if undecodable or a
+            multi-frame message is still incomplete
+        """
+        return self.frame_decoder.decode_and_extract(pgn_id, priority, source_id, dest, payload, channel_index)
+    
+    def _decode_n2k_frame(self, pgn_id: int, priority: int, source_id: int, dest: int, payload: bytes,
+                          already_combined: bool = False):
+        """Decode a single NMEA2000 frame from its header fields and raw payload bytes
+        
+        Binary fast path or N2K ASCII fallback, see N2KFrameDecoder. already_combined=True
+        marks a payload reassembled from fast-packet frames, so the decoder does not try
+        to combine it again.
+        """
+        return self.n2k_decoder.decode(pgn_id, priority, source_id, dest, payload, already_combined)
     
-    def _send_parsed_data_to_db(self, data, category):
+    def _broadcast_to_subscribers(self, record: FrameRecord):
+        """Send a frame to the subscribed nodes whose filter matches it"""
+        if not len(self.subscriptions):
+            return
+        pgn = record.pgn if record.pgn is not None else pgn_from_arbitration_id(record.arbitration_id)
+        for subscription in self.subscriptions.match(record, pgn):
+            subscription.delivered += 1
+            self.send_to_node(
+                subscription.subscriber,
+                MessageType.DATA,
+                subscription.payload(record),
+                Priority.NORMAL
+            )
+    
+    @staticmethod
+    def _resolve_category(category: str) -> str:
+        """Category value for a subscription filter (DataCategories value or member name)"""
+        for member in DataCategories:
+            if category == member.value or category == member.name:
+                return member.value
+        raise ValueError(f"Unknown category {category!r}")
+    
+    def _send_parsed_data_to_db(self, record: FrameRecord):
         """Send parsed data to database via Master Core -> DB Client"""
+        category = record.category
         try:
-            # Extract data fields
-            extracted_data = self._extract_data_fields(data, category)
-            
-            # Add TTL expiration
+            # Copy of the shared extracted fields with TTL expiration added
             expiration_date = datetime.now() + timedelta(days=self.data_ttl_days)
-            extracted_data["ttl_expiration"] = expiration_date.isoformat()
+            extracted_data = record.db_document(expiration_date.isoformat())
             
-            # Determine collection name based on category
-            collection_name = self._get_collection_name(category)
+            # Determine collection name (registry entry first, then category default)
+            entry = self.pgn_registry.get(record.pgn)
+            if entry is not None and entry.category == category:
+                collection_name = entry.collection
+            else:
+                collection_name = self._get_collection_name(category)
             
             # Send to Master Core for database storage
             self.send_to_master_core(
@@ -1086,7 +1338,7 @@ class CANControllerNode(BaseNode):
                     "command": "store_can_data",
                     "collection": collection_name,
                     "data": extracted_data,
-                    "category": category.value if hasattr(category, 'value') else str(category)
+                    "category": record.category_name
                 },
                 Priority.NORMAL
             )
@@ -1155,24 +1407,17 @@ class CANControllerNode(BaseNode):
     
     def _get_collection_name(self, category):
         """Get MongoDB collection name based on data category"""
-        if category == DataCategories.HEARTBEAT:
-            return "NodeHeartbeat"
-        elif category == DataCategories.FUEL:
-            return "Fuel"
-        elif category == DataCategories.NAVIGATION:
-            return "Navigation"
-        elif category == DataCategories.ENGINE:
-            return "Engine"
-        elif category == DataCategories.ENERGYDISTRIBUTION:
-            return "EnergyDistribution"
-        elif category == DataCategories.STEERING:
-            return "Steering"
-        elif category == DataCategories.BATTERY:
-            return "Battery"
-        elif category == DataCategories.PRODUCT:
-            return "Product"
+        return CATEGORY_COLLECTIONS.get(getattr(category, "name", str(category)), DEFAULT_COLLECTION)
+    
+    async def _start_monitoring_async(self, message: NodeMessage, addr: tuple):
+        """asyncio runtime: start_monitoring with the bus opened off the loop"""
+        self._reply_start_monitoring(message, await self._start_can_bus_async(), addr)
+    
+    def _reply_start_monitoring(self, message: NodeMessage, success: bool, addr: tuple):
+        if success:
+            self._send_response(message, {"status": "success", "message": "CAN monitoring started"}, addr)
         else:
-            return "Unknown"
+            self._send_error_response(message, "Failed to start CAN bus", addr)
     
     def _handle_can_command(self, message: NodeMessage, addr: tuple):
         """Handle CAN-specific commands"""
@@ -1182,12 +1427,10 @@ class CANControllerNode(BaseNode):
             if self.can_bus:
                 # Already started
                 self._send_response(message, {"status": "success", "message": "CAN monitoring already started"}, addr)
+            elif self.event_loop is not None:
+                asyncio.run_coroutine_threadsafe(self._start_monitoring_async(message, addr), self.event_loop)
             else:
-                success = self._start_can_bus()
-                if success:
-                    self._send_response(message, {"status": "success", "message": "CAN monitoring started"}, addr)
-                else:
-                    self._send_error_response(message, "Failed to start CAN bus", addr)
+                self._reply_start_monitoring(message, self._start_can_bus(), addr)
         elif command == "stop_monitoring":
             if not self.can_bus:
                 self._send_response(message, {"status": "success", "message": "CAN monitoring already stopped"}, addr)
@@ -1230,6 +1473,103 @@ class CANControllerNode(BaseNode):
                 "status": "success",
                 **can_status
             }, addr)
+        elif command == "get_signals":
+            # Return latest decoded values
+            # Expected payload: {"signals": [{"pgn": int, "source": int, "instance": int, "fields": [str]}], "max_age": float}
+            # (all keys optional; no selectors returns every signal)
+            if self.signal_table is None:
+                self._send_error_response(message, "Signal table is disabled", addr)
+                return
+            try:
+                signals = self.signal_table.query(message.payload.get("signals"), message.payload.get("max_age"))
+            except (TypeError, ValueError, AttributeError) as e:
+                self._send_error_response(message, f"Invalid get_signals selector: {e}", addr)
+                return
+            self._send_response(message, {
+                "status": "success",
+                "signals": signals
+            }, addr)
+        elif command == "query_frames":
+            # Return recent raw frames from the local history buffer
+            # Expected payload: {"last_seconds": float, "start": float, "end": float, "pgn": int, "source": int, "limit": int,
+            # "before": int} (all keys optional). A reply carries at most MAX_QUERY_FRAMES frames so it fits one
+            # datagram; "next" is the "before" cursor for the next older page.
+            if self.frame_history is None:
+                self._send_error_response(message, "Frame history is disabled", addr)
+                return
+            payload = message.payload
+            try:
+                before = payload.get("before")
+                frames, next_cursor = self.frame_history.query(
+                    last_seconds=payload.get("last_seconds"),
+                    start=payload.get("start"),
+                    end=payload.get("end"),
+                    pgn=payload.get("pgn"),
+                    source=payload.get("source"),
+                    limit=min(int(payload.get("limit", MAX_QUERY_FRAMES)), MAX_QUERY_FRAMES),
+                    before=int(before) if before is not None else None
+                )
+            except (TypeError, ValueError) as e:
+                self._send_error_response(message, f"Invalid query_frames parameters: {e}", addr)
+                return
+            self._send_response(message, {
+                "status": "success",
+                "count": len(frames),
+                "frames": frames,
+                "truncated": next_cursor is not None,
+                "next": next_cursor
+            }, addr)
+        elif command == "get_bus_stats":
+            # Return bus, per-PGN and per-source statistics
+            # Expected payload: {"top": int, "sort_by": str, "reset": bool} (all optional)
+            try:
+                top = message.payload.get("top")
+                stats = self.bus_stats.get_stats(
+                    top=int(top) if top is not None else None,
+                    sort_by=message.payload.get("sort_by", "frames_per_second")
+                )
+            except (TypeError, ValueError) as e:
+                self._send_error_response(message, f"Invalid get_bus_stats parameters: {e}", addr)
+                return
+            if message.payload.get("reset"):
+                self.bus_stats.reset()
+            self._send_response(message, {
+                "status": "success",
+                **stats
+            }, addr)
+        elif command == "get_latency":
+            # Return latency percentiles per pipeline stage and per PGN
+            # Expected payload: {"pgn": int, "stage": str, "reset": bool} (all optional)
+            if self.latency is None:
+                self._send_error_response(message, "Latency tracking is disabled", addr)
+                return
+            latency_stats = self.latency.get_stats(pgn=message.payload.get("pgn"), stage=message.payload.get("stage"))
+            if message.payload.get("reset"):
+                self.latency.reset()
+            self._send_response(message, {
+                "status": "success",
+                "unit": "microseconds",
+                **latency_stats
+            }, addr)
+        elif command == "subscribe_data":
+            # Subscribe a node to the CAN data stream, optionally filtered
+            # Expected payload: {"subscriber": str, "pgns": [int], "categories": [str], "sources": [int],
+            # "fields": [str], "include_undecoded": bool, "lease": float} (all optional)
+            try:
+                subscription = self._subscribe(message)
+            except (TypeError, ValueError) as e:
+                self._send_error_response(message, f"Invalid subscribe_data filter: {e}", addr)
+                return
+            self._send_response(message, {
+                "status": "success",
+                "subscription": subscription.describe()
+            }, addr)
+        elif command == "unsubscribe_data":
+            # Expected payload: {"subscriber": str} (defaults to the sender)
+            self._send_response(message, {
+                "status": "success",
+                "removed": self._unsubscribe(message)
+            }, addr)
         elif command == "send_can_message":
             # Handle send_can_message command from other nodes (e.g., Steering Control Node)
             # Expected payload: {"pgn": int, "data": dict}
@@ -1250,7 +1590,8 @@ class CANControllerNode(BaseNode):
                     if not self.can_bus:
                         logger.error("❌ CAN bus not initialized! Cannot send message.")
                     # Store command before sending (includes source node tracking)
-                    success = self._send_can_message(can_message_data, pgn=pgn, source_node=source_node, original_data=data)
+                    # Steering frames use outbound lane 1, ahead of everything but emergency stop
+                    success = self._send_can_message(can_message_data, pgn=pgn, source_node=source_node, original_data=data, lane=1)
                     self._send_response(message, {
                         "status": "success" if success else "error",
                         "pgn": pgn,
@@ -1268,10 +1609,41 @@ class CANControllerNode(BaseNode):
     
     def _handle_subscribe_data(self, message: NodeMessage, addr: tuple):
         """Handle data subscription requests"""
-        subscriber = message.payload.get("subscriber")
-        if subscriber and subscriber not in self.data_subscribers:
-            self.data_subscribers.append(subscriber)
-            logger.info(f"Node {subscriber} subscribed to CAN data")
+        try:
+            self._subscribe(message)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Invalid subscribe_data request from {message.source}: {e}")
+    
+    def _handle_unsubscribe_data(self, message: NodeMessage, addr: tuple):
+        """Handle data unsubscription requests"""
+        self._unsubscribe(message)
+    
+    def _subscribe(self, message: NodeMessage):
+        """Add or replace a subscription from a subscribe_data payload
+        
+        Payload: {"subscriber": str, "pgns": [int], "categories": [str], "sources": [int],
+        "fields": [str] or ["*"], "include_undecoded": bool, "lease": seconds}. All keys
+        are optional (subscriber defaults to the sender); without filters every frame is
+        sent. Subscribing again replaces the filter and renews the lease.
+        
+        Raises:
+            ValueError/TypeError: Invalid filter spec
+        """
+        subscriber = message.payload.get("subscriber") or message.source
+        renewed = subscriber in self.subscriptions
+        subscription = self.subscriptions.subscribe(subscriber, message.payload)
+        if self._get_node_address(subscriber) is None:
+            logger.warning(f"⚠️ [can_controller] Subscriber {subscriber} is not in known_nodes - frames cannot be delivered")
+        logger.info(f"Node {subscriber} {'renewed its subscription' if renewed else 'subscribed'} to CAN data: {subscription.describe()}")
+        return subscription
+    
+    def _unsubscribe(self, message: NodeMessage) -> bool:
+        """Remove a subscription (subscriber defaults to the sender)"""
+        subscriber = message.payload.get("subscriber") or message.source
+        removed = self.subscriptions.unsubscribe(subscriber)
+        if removed:
+            logger.info(f"Node {subscriber} unsubscribed from CAN data")
+        return removed
     
     def _handle_emergency_stop(self, message: NodeMessage, addr: tuple):
         """Handle emergency stop commands"""
@@ -1303,12 +1675,15 @@ class CANControllerNode(BaseNode):
             return
         
         self.playback_running = True
-        self.playback_thread = threading.Thread(
-            target=self._playback_worker,
-            args=(file_path,)
-        )
-        self.playback_thread.daemon = True
-        self.playback_thread.start()
+        if self.event_loop is not None:
+            self.playback_task = self.event_loop.create_task(self._playback_async(file_path))
+        else:
+            self.playback_thread = threading.Thread(
+                target=self._playback_worker,
+                args=(file_path,)
+            )
+            self.playback_thread.daemon = True
+            self.playback_thread.start()
         logger.info(f"Started CAN file playback: {file_path}")
     
     def _stop_playback(self):
@@ -1316,31 +1691,38 @@ class CANControllerNode(BaseNode):
         self.playback_running = False
         if self.playback_thread:
             self.playback_thread.join(timeout=5)
+        if self.playback_task:
+            self.playback_task.cancel()
+            self.playback_task = None
         logger.info("CAN file playback stopped")
     
+    def _load_playback_messages(self, file_path: str) -> List[can.Message]:
+        """Parse a CAN log file into messages to send"""
+        from can_file_parser import CANFileParser
+        
+        parser = CANFileParser()
+        messages = parser.parse_log_file(file_path)
+        
+        logger.info(f"Playing back {len(messages)} CAN messages")
+        return [
+            can.Message(
+                arbitration_id=message['can_id'],
+                data=message['data'],
+                is_extended_id=False
+            )
+            for message in messages
+        ]
+    
     def _playback_worker(self, file_path: str):
         """Worker thread for CAN file playback"""
         try:
-            from can_file_parser import CANFileParser
-            
-            parser = CANFileParser()
-            messages = parser.parse_log_file(file_path)
-            
-            logger.info(f"Playing back {len(messages)} CAN messages")
-            
-            for message in messages:
+            for can_msg in self._load_playback_messages(file_path):
                 if not self.playback_running:
                     break
                 
-                # Send message on CAN bus
-                can_msg = can.Message(
-                    arbitration_id=message['can_id'],
-                    data=message['data'],
-                    is_extended_id=False
-                )
-                
+                # Send message on CAN bus (lowest outbound lane - never delays steering frames)
                 if self.can_bus:
-                    self.can_bus.send(can_msg)
+                    self._transmit_can(can_msg, lane=7, wait=False)
                 
                 # Wait for next message timing
                 time.sleep(0.1)  # Adjust timing as needed
@@ -1352,9 +1734,30 @@ class CANControllerNode(BaseNode):
         finally:
             self.playback_running = False
     
+    async def _playback_async(self, file_path: str):
+        """asyncio runtime version of _playback_worker"""
+        try:
+            for can_msg in self._load_playback_messages(file_path):
+                if not self.playback_running:
+                    break
+                if self.can_bus:
+                    self._transmit_can(can_msg, lane=7, wait=False)
+                await asyncio.sleep(0.1)  # Adjust timing as needed
+            
+            logger.info("CAN file playback completed")
+            
+        except Exception as e:
+            logger.error(f"Error during CAN file playback: {e}")
+        finally:
+            self.playback_running = False
+    
     def _start_heartbeat_task(self):
         """Start background heartbeat task"""
         self.heartbeat_task_running = True
+        if self.event_loop is not None:
+            self._schedule_heartbeat()
+            logger.debug("Heartbeat timer started")
+            return
         self.heartbeat_thread = threading.Thread(target=self._heartbeat_worker)
         self.heartbeat_thread.daemon = True
         self.heartbeat_thread.start()
@@ -1365,8 +1768,25 @@ class CANControllerNode(BaseNode):
         self.heartbeat_task_running = False
         if self.heartbeat_thread:
             self.heartbeat_thread.join(timeout=5)
+        if self.heartbeat_timer:
+            self.heartbeat_timer.cancel()
+            self.heartbeat_timer = None
         logger.debug("Background heartbeat task stopped")
     
+    def _schedule_heartbeat(self):
+        """asyncio runtime: arm a loop timer for the next 10-second wall-clock boundary"""
+        self.heartbeat_timer = self.event_loop.call_later(10 - time.time() % 10, self._heartbeat_tick)
+    
+    def _heartbeat_tick(self):
+        """asyncio runtime: send a heartbeat and re-arm the timer"""
+        if not self.heartbeat_task_running:
+            return
+        try:
+            self.send_heartbeat()
+        except Exception as e:
+            logger.error(f"Error in heartbeat timer: {e}")
+        self._schedule_heartbeat()
+    
     def _heartbeat_worker(self):
         """Background worker thread for periodic heartbeat"""
         while self.heartbeat_task_running:
@@ -1469,7 +1889,8 @@ class CANControllerNode(BaseNode):
             logger.debug(traceback.format_exc())
             return None
     
-    def _send_can_message(self, can_data: Dict[str, Any], pgn: Optional[int] = None, source_node: Optional[str] = None, original_data: Optional[Dict[str, Any]] = None):
+    def _send_can_message(self, can_data: Dict[str, Any], pgn: Optional[int] = None, source_node: Optional[str] = None, original_data: Optional[Dict[str, Any]] = None,
+                          lane: Optional[int] = None):
         """Send message on CAN bus and store command in database
         
         Args:
@@ -1477,6 +1898,7 @@ class CANControllerNode(BaseNode):
             pgn: Optional PGN (Parameter Group Number) for NMEA2000 messages
             source_node: Optional source node name (e.g., 'steering_control')
             original_data: Optional original data dictionary before formatting
+            lane: Optional outbound lane (default: from the CAN priority bits)
         """
         try:
             if not self.can_bus:
@@ -1506,7 +1928,8 @@ class CANControllerNode(BaseNode):
                     original_data=original_data
                 )
             
-            self.can_bus.send(message)
+            if not self._transmit_can(message, lane=lane):
+                return False
             logger.info(f"✅ CAN message sent to bus: arbitration_id=0x{can_data['arbitration_id']:X}, data={[hex(b) for b in data_bytes]}, length={len(data_bytes)}")
             return True
             
@@ -1574,7 +1997,8 @@ class CANControllerNode(BaseNode):
             )
             
             # Send message
-            self.can_bus.send(can_message)
+            if not self._transmit_can(can_message):
+                return False
             logger.info(f"J1939 message sent: PGN=0x{pgn:X} ({pgn}), SA=0x{source_address:02X} ({source_address}), "
                        f"CAN_ID=0x{can_id:X}, data={list(data_bytes)}, priority={priority}")
             return True
@@ -1633,7 +2057,9 @@ class CANControllerNode(BaseNode):
         )
         
         try:
-            self.can_bus.send(emergency_message)
+            if not self._transmit_can(emergency_message, lane=0):
+                logger.critical("❌ CRITICAL: Emergency stop not sent on CAN in time")
+                return False
             logger.critical("✅ Emergency stop sent on CAN bus")
             return True
         except Exception as e:
@@ -1719,17 +2145,102 @@ class CANControllerNode(BaseNode):
             "can_interface": can_interface,
             "can_channel": can_channel,
             "can_bitrate": self.can_bitrate,
+            "can_filters": len(self.can_filters) if self.can_filters else 0,
             "can_running": self.can_running,
-            "subscribers": len(self.data_subscribers),
+            "runtime": "asyncio" if self.event_loop is not None else "threads",
+            "can_tx_lanes": self.can_tx_lanes.get_stats() if self.can_tx_lanes is not None else {"enabled": False},
+            "subscribers": len(self.subscriptions),
+            "subscriptions": self.subscriptions.get_stats(),
             "emergency_stop_enabled": self.emergency_stop_enabled,
-            "playback_running": self.playback_running
+            "playback_running": self.playback_running,
+            "can_channels": self._get_channel_status(),
+            "can_pipeline": self._get_pipeline_status(),
+            "can_decode_pool": self.can_decode_pool.get_stats() if self.can_decode_pool else {"enabled": False},
+            "fast_packet": self.fast_packet.get_stats() if self.fast_packet else {"enabled": False},
+            "transport_protocol": self.transport_protocol.get_stats() if self.transport_protocol else {"enabled": False},
+            "decode_cache": self._get_decode_cache_status(),
+            "batch_decode": self.batch_decoder.get_stats() if self.batch_decoder else {"enabled": False},
+            "signal_table": self.signal_table.get_stats() if self.signal_table else {"enabled": False},
+            "frame_history": self.frame_history.get_stats() if self.frame_history is not None else {"enabled": False},
+            "shm_ring": self.shm_ring.get_stats() if self.shm_ring is not None else {"enabled": False},
+            "bus_stats": self.bus_stats.get_summary(),
+            "latency": self.latency.get_summary() if self.latency else {"enabled": False},
+            "decimation": {sink: decimator.get_stats() for sink, decimator in self.sink_decimators.items()},
+            "change_detection": {sink: change_filter.get_stats() for sink, change_filter in self.change_filters.items()}
         })
         return base_status
     
+    def _get_channel_status(self) -> Dict[str, Any]:
+        """Get open capture channels and their frame counts (multi-channel capture)"""
+        return {
+            "enabled": self.can_multi_channel_enabled,
+            "channels": {name: dict(self.can_channel_info[name]) for name in self.can_buses}
+        }
+    
+    def _get_pipeline_status(self) -> Dict[str, Any]:
+        """Get pipelined receive queue depths and drop counters"""
+        return {
+            "enabled": self.can_pipeline_enabled,
+            "rx_queue": self.can_rx_ring.get_stats(),
+            "fanout_queue": self.can_fanout_ring.get_stats()
+        }
+    
+    def _get_decode_cache_status(self) -> Dict[str, Any]:
+        """Get decode cache counters (summed over the worker processes' caches in shard mode)"""
+        if not self.decode_cache_enabled:
+            return {"enabled": False}
+        if self.can_decode_pool is not None:
+            reported = [stats["decode_cache"] for stats in self.can_decode_pool.get_stats()["worker_stats"]
+                        if stats is not None and stats["decode_cache"]["enabled"]]
+            return combine_cache_stats(reported)
+        return self.decode_cache.get_stats()
+    
     def get_can_status(self) -> Dict[str, Any]:
         """Get CAN-specific status (deprecated - use get_status() instead)"""
         return self.get_status()
 
+class ShardFrameDecoder:
+    """
+    Decode callable run inside DecodeShardPool worker processes
+    
+    Each worker process builds its own NMEA2000Decoder and PGN registry and runs
+    the same FrameDecoder as the in-process path, so shard output matches it.
+    PGNs registered in code at runtime are only visible to workers on platforms
+    that fork; use the "pgn_registry" config for portable registration.
+    """
+    
+    def __init__(self, pgn_registry_config: Optional[Dict[str, Any]] = None,
+                 fast_packet_config: Optional[Dict[str, Any]] = None,
+                 transport_protocol_config: Optional[Dict[str, Any]] = None,
+                 decode_cache_size: int = 0,
+                 binary_decode_enabled: bool = True):
+        self.decoder = NMEA2000Decoder()
+        # PGN sharding keeps every frame of a fast-packet sequence / TP session on the same worker.
+        # Stage latencies are only tracked in the parent process.
+        self.frame_decoder = FrameDecoder(
+            N2KFrameDecoder(self.decoder, binary_decode_enabled),
+            build_default_registry(DataCategories, pgn_registry_config),
+            build_fast_packet_assembler(fast_packet_config),
+            build_transport_protocol_manager(transport_protocol_config),
+            DecodeCache(decode_cache_size) if decode_cache_size > 0 else None
+        )
+    
+    def __call__(self, packed_frame: bytes) -> tuple:
+        """Decode a packed RawFrame
+        
+        Returns:
+            Tuple of (packed_frame, category, parsed_data, error)
+        """
+        frame = RawFrame.unpack(packed_frame)
+        pgn_id, source_id, dest, priority = self.decoder._extract_header(frame.arbitration_id)[:4]
+        category, parsed_data = self.frame_decoder.decode_and_extract(pgn_id, priority, source_id, dest, frame.data, frame.channel)
+        return packed_frame, category, parsed_data, None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Worker-side stats, reported to the parent through DecodeShardPool"""
+        decode_cache = self.frame_decoder.decode_cache
+        return {"decode_cache": decode_cache.get_stats() if decode_cache is not None else {"enabled": False}}
+
 # Global variables for signal handler
 _node_instance = None
 _running = True
@@ -1741,7 +2252,10 @@ def signal_handler(signum, frame):
     logger.info(f"Received {signal_name} signal, initiating graceful shutdown...")
     _running = False
     if _node_instance:
-        _node_instance.stop()
+        if _node_instance.event_loop is not None:
+            _node_instance.request_async_stop()  # run_async() stops the node on its own loop
+        else:
+            _node_instance.stop()
 
 def main():
     """Main entry point for CAN Controller Node"""
@@ -1759,6 +2273,8 @@ def main():
     parser.add_argument("--log-level", type=str, default="INFO", 
                        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
                        help="Set logging level")
+    parser.add_argument("--asyncio", action="store_true",
+                       help="Run on a single asyncio event loop (same as async_runtime_enabled in config)")
     
     args = parser.parse_args()
     
@@ -1801,6 +2317,7 @@ def main():
     # Create and start node
     node = CANControllerNode(config)
     _node_instance = node  # Store for signal handler
+    use_asyncio = args.asyncio or node.async_runtime_enabled
     
     if args.daemon:
         # Run as daemon (cross-platform)
@@ -1815,7 +2332,11 @@ def main():
                 f.write(str(os.getpid()))
             
             logger.info(f"Running as background process on Windows (PID: {os.getpid()})")
-            if node.start():
+            if use_asyncio:
+                if not asyncio.run(node.run_async()):
+                    logger.error("Failed to start CAN Controller Node, exiting")
+                    sys.exit(1)
+            elif node.start():
                 logger.info("CAN Controller Node started successfully, entering main loop")
                 _running = True
                 try:
@@ -1828,7 +2349,8 @@ def main():
             else:
                 logger.error("Failed to start CAN Controller Node, exiting")
                 sys.exit(1)
-            node.stop()
+            if not use_asyncio:
+                node.stop()
         else:
             # Unix/Linux: Use fork approach
             try:
@@ -1850,7 +2372,11 @@ def main():
             with open(pid_file, 'w') as f:
                 f.write(str(os.getpid()))
             
-            if node.start():
+            if use_asyncio:
+                if not asyncio.run(node.run_async()):
+                    logger.error("Failed to start CAN Controller Node")
+                    sys.exit(1)
+            elif node.start():
                 _running = True
                 try:
                     while _running:
@@ -1862,10 +2388,15 @@ def main():
             else:
                 logger.error("Failed to start CAN Controller Node")
                 sys.exit(1)
-            node.stop()
+            if not use_asyncio:
+                node.stop()
     else:
         # Run in foreground
-        if node.start():
+        if use_asyncio:
+            if not asyncio.run(node.run_async()):
+                logger.error("Failed to start CAN Controller Node")
+                sys.exit(1)
+        elif node.start():
             node.run_daemon()
         else:
             logger.error("Failed to start CAN Controller Node")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+CAN Acceptance Filters - Compile config (PGN allowlist, source masks) into python-can filters
+
+python-can passes these to the interface (SocketCAN kernel filters, hardware
+acceptance filters on Kvaser/PCAN/...) and only falls back to filtering in
+Python when the backend cannot do it.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 29-bit NMEA2000/J1939 identifier layout: priority(3) | EDP(1) | DP(1) | PF(8) | PS(8) | SA(8)
+PGN_SHIFT = 8
+PDU2_PGN_MASK = 0x3FFFF  # EDP + DP + PF + PS (PS is a group extension)
+PDU1_PGN_MASK = 0x3FF00  # EDP + DP + PF (PS is the destination address)
+SOURCE_ADDRESS_MASK = 0xFF
+
+# SocketCAN CAN_RAW_FILTER_MAX
+MAX_FILTERS = 512
+
+
+def _pgn_id_and_mask(pgn: int):
+    """Return (can_id, can_mask) matching a PGN regardless of priority and source"""
+    pdu_format = (pgn >> 8) & 0xFF
+    pgn_mask = PDU2_PGN_MASK if pdu_format >= 240 else PDU1_PGN_MASK
+    return (pgn & pgn_mask) << PGN_SHIFT, pgn_mask << PGN_SHIFT
+
+
+def _parse_source_specs(filter_config: Dict[str, Any]) -> List[tuple]:
+    """Collect (address, mask) pairs from source_addresses and source_masks"""
+    specs = []
+    for address in filter_config.get("source_addresses", []):
+        specs.append((int(address) & SOURCE_ADDRESS_MASK, SOURCE_ADDRESS_MASK))
+    for spec in filter_config.get("source_masks", []):
+        specs.append((int(spec["address"]) & SOURCE_ADDRESS_MASK, int(spec.get("mask", SOURCE_ADDRESS_MASK)) & SOURCE_ADDRESS_MASK))
+    return specs
+
+
+def build_can_filters(filter_config: Optional[Dict[str, Any]],
+                      required_pgns: Iterable[int] = ()) -> Optional[List[Dict[str, Any]]]:
+    """Compile a can_filters config section into python-can filter dicts
+    
+    Config format:
+        {
+            "enabled": true,
+            "pgn_allowlist": [127245, 127250, 129025],
+            "source_addresses": [145],
+            "source_masks": [{"address": 128, "mask": 240}],
+            "raw_filters": [{"can_id": 0x1FF, "can_mask": 0x7FF, "extended": false}]
+        }
+    
+    Each allowlisted PGN is combined with each source spec (any source if none
+    are given). raw_filters are passed through unchanged.
+    
+    Args:
+        filter_config: can_filters config section
+        required_pgns: PGNs added to a non-empty allowlist because the node needs
+            them to reassemble allowlisted messages (e.g. transport protocol CM/DT)
+    
+    Returns:
+        List of {"can_id", "can_mask", "extended"} dicts, or None to receive everything
+    """
+    if not filter_config or not filter_config.get("enabled", True):
+        return None
+    
+    filters: List[Dict[str, Any]] = []
+    pgns = [int(pgn) for pgn in filter_config.get("pgn_allowlist", [])]
+    if pgns:
+        pgns.extend(pgn for pgn in required_pgns if pgn not in pgns)
+    sources = _parse_source_specs(filter_config)
+    
+    if pgns:
+        for pgn in pgns:
+            pgn_id, pgn_mask = _pgn_id_and_mask(pgn)
+            for address, mask in sources or [(0, 0)]:
+                filters.append({"can_id": pgn_id | address, "can_mask": pgn_mask | mask, "extended": True})
+    else:
+        # Source-only filtering
+        for address, mask in sources:
+            filters.append({"can_id": address, "can_mask": mask, "extended": True})
+    
+    for raw_filter in filter_config.get("raw_filters", []):
+        filters.append({
+            "can_id": int(raw_filter["can_id"]),
+            "can_mask": int(raw_filter["can_mask"]),
+            "extended": bool(raw_filter.get("extended", True))
+        })
+    
+    if not filters:
+        return None
+    
+    if len(filters) > MAX_FILTERS:
+        logger.warning(f"⚠️ [can_controller] {len(filters)} CAN filters exceed the SocketCAN limit of {MAX_FILTERS}, receiving all frames instead")
+        return None
+    
+    return filters
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Change Filter - Per-sink suppression of unchanged CAN signals
+
+Quiet PGNs (fluid level, switch banks, heartbeats) repeat the same payload for
+hours. A ChangeFilter keeps the last forwarded payload per (PGN, source,
+instance) and only lets a frame through when it changed, moved further than a
+per-signal deadband, or nothing was forwarded for max_silence seconds.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+COMPARE_RAW = "raw"
+COMPARE_FIELDS = "fields"
+
+# Keys that change on every frame and never count as a signal change
+ALWAYS_IGNORED = ("timestamp", "title")
+
+
+@dataclass(frozen=True)
+class ChangePolicy:
+    """Change detection policy for one PGN (or PGN + source)
+    
+    compare:
+        raw: forward when the payload bytes differ
+        fields: forward when an extracted value differs (numeric values only
+            count once they move more than their deadband)
+    """
+    compare: str = COMPARE_FIELDS
+    deadbands: Dict[str, float] = field(default_factory=dict)
+    ignore: Tuple[str, ...] = ()
+    max_silence: Optional[float] = None
+    
+    @classmethod
+    def from_config(cls, policy_config: Dict[str, Any]) -> "ChangePolicy":
+        """Build a policy from {"compare": ..., "deadbands": {...}, "ignore": [...], "max_silence": ...}"""
+        compare = policy_config.get("compare", COMPARE_FIELDS)
+        if compare not in (COMPARE_RAW, COMPARE_FIELDS):
+            raise ValueError(f"Unknown change detection compare mode '{compare}'")
+        max_silence = policy_config.get("max_silence")
+        return cls(
+            compare=compare,
+            deadbands={key: float(value) for key, value in policy_config.get("deadbands", {}).items()},
+            ignore=tuple(policy_config.get("ignore", ())),
+            max_silence=float(max_silence) if max_silence is not None else None
+        )
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class ChangeFilter:
+    """
+    Change detection state for one sink
+    
+    Features:
+    - Policies per PGN, per PGN + source address, or a default for everything
+    - Last forwarded snapshot kept per (PGN, source, instance)
+    - Deadbands are measured against the last forwarded value, so slow drift is
+      still reported once it adds up
+    - Forwarded / suppressed counters per PGN for status reporting
+    """
+    
+    def __init__(self, sink: str, policies: Dict[Tuple[int, Optional[int]], ChangePolicy],
+                 default_policy: Optional[ChangePolicy] = None):
+        """
+        Args:
+            sink: Sink name (db, subscribers, master_core)
+            policies: {(pgn, source or None): policy}
+            default_policy: Policy for PGNs without an explicit entry (None = forward everything)
+        """
+        self.sink = sink
+        self.policies = policies
+        self.default_policy = default_policy
+        self._last: Dict[Tuple[int, int, Any], tuple] = {}  # (pgn, source, instance) -> (snapshot, forwarded_at)
+        self._lock = threading.Lock()
+        self.forwarded: Dict[int, int] = {}
+        self.suppressed: Dict[int, int] = {}
+    
+    def _policy_for(self, pgn: int, source: int) -> Optional[ChangePolicy]:
+        policy = self.policies.get((pgn, source))
+        if policy is None:
+            policy = self.policies.get((pgn, None), self.default_policy)
+        return policy
+    
+    @staticmethod
+    def _snapshot(record, policy: ChangePolicy):
+        """Comparable view of a record (raw bytes, or extracted values without ignored keys)"""
+        if policy.compare == COMPARE_RAW or not record.decoded:
+            return bytes(record.data)
+        return {
+            key: value for key, value in record.parsed_data.items()
+            if key not in ALWAYS_IGNORED and key not in policy.ignore
+        }
+    
+    @staticmethod
+    def _changed(previous, current, policy: ChangePolicy) -> bool:
+        if isinstance(previous, bytes) or isinstance(current, bytes):
+            return previous != current
+        if previous.keys() != current.keys():
+            return True
+        for key, value in current.items():
+            old_value = previous[key]
+            deadband = policy.deadbands.get(key)
+            if deadband is not None and _is_number(value) and _is_number(old_value):
+                if abs(value - old_value) > deadband:
+                    return True
+            elif value != old_value:
+                return True
+        return False
+    
+    def allow(self, record, now: float) -> bool:
+        """Decide whether a record carries a change worth forwarding to this sink
+        
+        Args:
+            record: FrameRecord (needs pgn, source, data and parsed_data)
+            now: Monotonic time in seconds
+        
+        Returns:
+            bool: True to forward, False if unchanged (suppressed)
+        """
+        pgn = record.pgn
+        if pgn is None:
+            return True
+        policy = self._policy_for(pgn, record.source)
+        if policy is None:
+            return True
+        
+        instance = record.parsed_data.get("instance") if record.decoded else None
+        key = (pgn, record.source, instance)
+        snapshot = self._snapshot(record, policy)
+        with self._lock:
+            last = self._last.get(key)
+            forward = (
+                last is None
+                or (policy.max_silence is not None and now - last[1] >= policy.max_silence)
+                or self._changed(last[0], snapshot, policy)
+            )
+            if forward:
+                self._last[key] = (snapshot, now)
+                self.forwarded[pgn] = self.forwarded.get(pgn, 0) + 1
+            else:
+                self.suppressed[pgn] = self.suppressed.get(pgn, 0) + 1
+            return forward
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-PGN forwarded/suppressed counters"""
+        with self._lock:
+            return {
+                "policies": len(self.policies) + (1 if self.default_policy else 0),
+                "tracked_signals": len(self._last),
+                "forwarded": {str(pgn): count for pgn, count in self.forwarded.items()},
+                "suppressed": {str(pgn): count for pgn, count in self.suppressed.items()}
+            }
+
+
+def build_change_filters(change_config: Optional[Dict[str, Any]], sinks) -> Dict[str, ChangeFilter]:
+    """Build ChangeFilters from the change_detection config section
+    
+    Config format:
+        {
+            "db": {
+                "default": {"compare": "raw", "max_silence": 300},
+                "pgns": {"127505": {"deadbands": {"level": 0.5}, "max_silence": 60},
+                         "126993": {"ignore": ["sequence_counter"], "max_silence": 600}}
+            },
+            "subscribers": {...}
+        }
+    
+    PGN keys are "<pgn>" or "<pgn>:<source address>". Sinks without config
+    forward every frame.
+    """
+    filters = {}
+    for sink in sinks:
+        sink_config = (change_config or {}).get(sink)
+        if not sink_config:
+            continue
+        policies = {}
+        for key, policy_config in sink_config.get("pgns", {}).items():
+            pgn_text, _, source_text = str(key).partition(":")
+            source = int(source_text) if source_text else None
+            policies[(int(pgn_text), source)] = ChangePolicy.from_config(policy_config)
+        default_config = sink_config.get("default")
+        default_policy = ChangePolicy.from_config(default_config) if default_config else None
+        filters[sink] = ChangeFilter(sink, policies, default_policy)
+    return filters
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Decode Cache - Bounded LRU memoization of decoded and extracted CAN frames
+
+Switch banks, heartbeats and tank levels repeat byte-for-byte. Caching the
+extraction result by (PGN, source, destination, payload) lets repeats skip the
+NMEA2000 decoder and field extraction; only the timestamp is refreshed.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+
+class DecodeCache:
+    """
+    Thread-safe LRU cache with hit/miss/eviction counters
+    
+    Features:
+    - O(1) get/put (OrderedDict move_to_end / popitem)
+    - Bounded to max_entries; least recently used entry evicted first
+    """
+    
+    def __init__(self, max_entries: int = 4096):
+        """
+        Args:
+            max_entries: Maximum cached entries
+        """
+        if max_entries < 1:
+            raise ValueError(f"DecodeCache needs max_entries >= 1, got {max_entries}")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value (marking it recently used), or None on a miss"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop all entries (e.g. after the PGN registry changed)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get size and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def combine_cache_stats(stats: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum the get_stats() of several caches (e.g. one per decode worker process)"""
+    stats = list(stats)
+    combined = {key: sum(entry[key] for entry in stats) for key in ("size", "max_entries", "hits", "misses", "evictions")}
+    lookups = combined["hits"] + combined["misses"]
+    return {
+        "enabled": True,
+        "caches": len(stats),
+        **combined,
+        "hit_rate": round(combined["hits"] / lookups, 4) if lookups else 0.0
+    }
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Decode Shard Pool - Multi-process NMEA2000 decoding sharded by PGN
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds between worker stats reports
+STATS_INTERVAL = 1.0
+
+
+class ShardStats:
+    """Stats report a worker puts on the result queue (from its decode callable's get_stats())"""
+    __slots__ = ("shard_index", "stats")
+    
+    def __init__(self, shard_index: int, stats: Dict[str, Any]):
+        self.shard_index = shard_index
+        self.stats = stats
+
+
+def _shard_worker_main(shard_index: int, in_queue, out_queue, decode_factory: Callable):
+    """Worker process entry point
+    
+    Builds its own decode callable (decoder state is per process) and decodes
+    packed frames from its shard queue until it receives the None sentinel.
+    Results go to the shared out_queue in the order frames were submitted.
+    If the decode callable has get_stats(), it is reported every STATS_INTERVAL.
+    """
+    decode = decode_factory()
+    get_stats = getattr(decode, "get_stats", None)
+    next_report = time.monotonic()
+    while True:
+        if get_stats is not None and time.monotonic() >= next_report:
+            out_queue.put(ShardStats(shard_index, get_stats()))
+            next_report = time.monotonic() + STATS_INTERVAL
+        try:
+            packed_frame = in_queue.get(timeout=STATS_INTERVAL) if get_stats is not None else in_queue.get()
+        except queue.Empty:
+            continue
+        if packed_frame is None:
+            break
+        try:
+            out_queue.put(decode(packed_frame))
+        except Exception as e:
+            out_queue.put((packed_frame, None, None, f"shard {shard_index}: {e}"))
+
+
+class DecodeShardPool:
+    """
+    Pool of decode worker processes, sharded by PGN
+    
+    Features:
+    - Frames with the same PGN always go to the same worker, so per-PGN order is kept
+    - Receive thread hands over packed raw frames (bytes), never python-can objects
+    - Non-blocking submit: full shard queues drop the frame and count it
+    - Collector thread delivers worker results to a handler in the parent process
+    """
+    
+    def __init__(self, workers: int, decode_factory: Callable, result_handler: Callable,
+                 queue_size: int = 1024):
+        """
+        Initialize the pool (processes are started by start())
+        
+        Args:
+            workers: Number of worker processes (shards)
+            decode_factory: Picklable module-level callable returning decode(packed_frame) -> result tuple
+            result_handler: Called in the parent with each result tuple (packed_frame, category, parsed_data, error)
+            queue_size: Maximum queued frames per shard
+        """
+        if workers < 1:
+            raise ValueError(f"DecodeShardPool needs at least one worker, got {workers}")
+        self.workers = workers
+        self.decode_factory = decode_factory
+        self.result_handler = result_handler
+        self.queue_size = queue_size
+        
+        self._in_queues: List[Any] = []
+        self._out_queue = None
+        self._processes: List[multiprocessing.Process] = []
+        self._collector_thread: Optional[threading.Thread] = None
+        self.running = False
+        
+        # Counters (updated by the capture threads and the collector thread, read by get_stats())
+        self._counter_lock = threading.Lock()
+        self.submitted = [0] * workers
+        self.dropped = [0] * workers
+        self.results = 0
+        self.errors = 0
+        # Latest get_stats() of each worker's decode callable (None until it reports)
+        self.worker_stats: List[Optional[Dict[str, Any]]] = [None] * workers
+    
+    def start(self):
+        """Start worker processes and the result collector thread"""
+        if self.running:
+            return
+        self._in_queues = [multiprocessing.Queue(self.queue_size) for _ in range(self.workers)]
+        self._out_queue = multiprocessing.Queue()
+        self._processes = []
+        for shard_index, in_queue in enumerate(self._in_queues):
+            process = multiprocessing.Process(
+                target=_shard_worker_main,
+                args=(shard_index, in_queue, self._out_queue, self.decode_factory),
+                name=f"can-decode-{shard_index}"
+            )
+            process.daemon = True
+            process.start()
+            self._processes.append(process)
+        
+        self.running = True
+        self._collector_thread = threading.Thread(target=self._collect_results, name="can-decode-collector")
+        self._collector_thread.daemon = True
+        self._collector_thread.start()
+        logger.info(f"✅ [can_controller] Decode shard pool started with {self.workers} worker process(es)")
+    
+    def stop(self):
+        """Stop workers and the collector thread"""
+        if not self.running:
+            return
+        self.running = False
+        for in_queue in self._in_queues:
+            try:
+                in_queue.put_nowait(None)
+            except queue.Full:
+                pass
+        for process in self._processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+        if self._collector_thread:
+            self._collector_thread.join(timeout=2)
+        logger.info("Decode shard pool stopped")
+    
+    def submit(self, pgn: int, packed_frame: bytes) -> bool:
+        """Queue a packed frame on the shard owning its PGN
+        
+        Returns:
+            bool: True if queued, False if the shard queue was full (frame dropped)
+        """
+        shard_index = pgn % self.workers
+        try:
+            self._in_queues[shard_index].put_nowait(packed_frame)
+        except queue.Full:
+            with self._counter_lock:
+                self.dropped[shard_index] += 1
+            return False
+        with self._counter_lock:
+            self.submitted[shard_index] += 1
+        return True
+    
+    def _collect_results(self):
+        """Deliver worker results to the result handler"""
+        while self.running:
+            try:
+                result = self._out_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            if isinstance(result, ShardStats):
+                with self._counter_lock:
+                    self.worker_stats[result.shard_index] = result.stats
+                continue
+            with self._counter_lock:
+                self.results += 1
+                if result[3] is not None:
+                    self.errors += 1
+            try:
+                self.result_handler(result)
+            except Exception as e:
+                logger.error(f"Error handling decoded frame from shard pool: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-shard submit/drop counters, worker liveness and the workers' reported stats"""
+        with self._counter_lock:
+            counters = {
+                "submitted": list(self.submitted),
+                "dropped": list(self.dropped),
+                "results": self.results,
+                "errors": self.errors,
+                "worker_stats": list(self.worker_stats)
+            }
+        return {
+            "enabled": True,
+            "workers": self.workers,
+            "running": self.running,
+            "alive_workers": sum(1 for process in self._processes if process.is_alive()),
+            **counters
+        }
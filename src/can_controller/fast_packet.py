@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Fast Packet - NMEA2000 fast-packet reassembly for multi-frame PGNs
+
+A fast-packet message is split over up to 32 CAN frames. Byte 0 of every frame
+holds a 3-bit sequence id and a 5-bit frame counter; frame 0 carries the total
+length in byte 1 followed by 6 data bytes, later frames carry 7 data bytes each.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_FAST_PACKET_LENGTH = 223  # 6 + 31 * 7 bytes
+FIRST_FRAME_DATA = 6
+NEXT_FRAME_DATA = 7
+
+# NMEA2000 PGNs transmitted as fast packets, standard and proprietary, as flagged by the
+# nmea2000 library's PGN definitions (extend via config "fast_packet.pgns")
+DEFAULT_FAST_PACKET_PGNS = frozenset({
+    126208, 126464, 126720, 126983, 126984, 126985, 126986, 126987, 126988, 126996, 126998, 127233,
+    127237, 127489, 127490, 127491, 127494, 127495, 127496, 127497, 127498, 127503, 127504, 127506,
+    127507, 127509, 127510, 127511, 127512, 127513, 127514, 128275, 128520, 128538, 129029, 129038,
+    129039, 129040, 129041, 129044, 129045, 129284, 129285, 129301, 129302, 129538, 129540, 129541,
+    129542, 129545, 129547, 129549, 129551, 129556, 129792, 129793, 129794, 129795, 129796, 129797,
+    129798, 129799, 129800, 129801, 129802, 129803, 129804, 129805, 129806, 129807, 129808, 129809,
+    129810, 130052, 130053, 130054, 130060, 130061, 130064, 130065, 130066, 130067, 130068, 130069,
+    130070, 130071, 130072, 130073, 130074, 130320, 130321, 130322, 130323, 130324, 130330, 130561,
+    130562, 130563, 130564, 130565, 130566, 130567, 130569, 130570, 130571, 130572, 130573, 130574,
+    130577, 130578, 130580, 130581, 130583, 130584, 130586, 130816, 130817, 130818, 130819, 130820,
+    130821, 130822, 130823, 130824, 130825, 130827, 130828, 130831, 130832, 130833, 130834, 130835,
+    130836, 130837, 130838, 130839, 130840, 130842, 130843, 130845, 130846, 130847, 130848, 130850,
+    130851, 130856, 130860, 130880, 130881, 130918, 130944,
+})
+
+
+class _Session:
+    """In-progress fast-packet sequence (buffer comes from the assembler's pool)"""
+    __slots__ = ("buffer", "length", "received", "next_frame", "started")
+    
+    def __init__(self, buffer: bytearray, length: int, started: float):
+        self.buffer = buffer
+        self.length = length
+        self.received = 0
+        self.next_frame = 1
+        self.started = started
+
+
+class FastPacketAssembler:
+    """
+    Reassembles NMEA2000 fast-packet sequences into complete payloads
+    
+    Features:
+    - Sessions keyed by (PGN, source, sequence id), so interleaved senders don't mix
+    - Preallocated fixed-size buffers (no per-frame allocations); when all are
+      in use the oldest session is evicted
+    - Sequences are dropped on a missing/out-of-order frame or after timeout
+    - Counters for completed, incomplete, out-of-order and timed-out sequences
+    """
+    
+    def __init__(self, pgns: Iterable[int] = DEFAULT_FAST_PACKET_PGNS, max_sessions: int = 64,
+                 timeout: float = 0.75):
+        """
+        Args:
+            pgns: PGNs that are transmitted as fast packets
+            max_sessions: Number of preallocated reassembly buffers
+            timeout: Seconds a sequence may stay incomplete
+        """
+        self.pgns = frozenset(int(pgn) for pgn in pgns)
+        self.max_sessions = max(1, int(max_sessions))
+        self.timeout = float(timeout)
+        self._free_buffers: List[bytearray] = [bytearray(MAX_FAST_PACKET_LENGTH) for _ in range(self.max_sessions)]
+        self._sessions: Dict[Tuple[int, int, int], _Session] = {}
+        self._last_expiry_check = 0.0
+        
+        # Counters
+        self.completed = 0
+        self.incomplete = 0  # Restarted by a new frame 0 before completing
+        self.out_of_order = 0
+        self.timed_out = 0
+        self.evicted = 0
+        self.orphan_frames = 0  # Continuation frames without a session
+        self.invalid = 0  # First frames announcing more than MAX_FAST_PACKET_LENGTH bytes
+    
+    def is_fast_packet(self, pgn: int) -> bool:
+        """True if the PGN is reassembled by this assembler"""
+        return pgn in self.pgns
+    
+    def _release(self, key: Tuple[int, int, int]):
+        session = self._sessions.pop(key)
+        self._free_buffers.append(session.buffer)
+    
+    def _expire(self, now: float):
+        """Drop sequences older than the timeout (checked at most every timeout/2 seconds)"""
+        if now - self._last_expiry_check < self.timeout / 2:
+            return
+        self._last_expiry_check = now
+        for key in [key for key, session in self._sessions.items() if now - session.started > self.timeout]:
+            self._release(key)
+            self.timed_out += 1
+    
+    def feed(self, pgn: int, source: int, data: bytes, now: float) -> Optional[bytes]:
+        """Add one CAN frame of a fast-packet PGN
+        
+        Args:
+            pgn: PGN of the frame
+            source: Source address
+            data: 8-byte CAN payload
+            now: Monotonic time in seconds
+        
+        Returns:
+            Complete payload (bytes) when this frame finishes the sequence, else None
+        """
+        if len(data) < 2:
+            return None
+        self._expire(now)
+        
+        sequence_id = data[0] >> 5
+        frame_counter = data[0] & 0x1F
+        key = (pgn, source, sequence_id)
+        session = self._sessions.get(key)
+        
+        if frame_counter == 0:
+            if session is not None:
+                self._release(key)
+                self.incomplete += 1
+            length = data[1]
+            if length <= FIRST_FRAME_DATA:
+                # Whole message fits in the first frame
+                self.completed += 1
+                return bytes(data[2:2 + length])
+            if length > MAX_FAST_PACKET_LENGTH:
+                self.invalid += 1
+                return None
+            if not self._free_buffers:
+                oldest = min(self._sessions, key=lambda k: self._sessions[k].started)
+                self._release(oldest)
+                self.evicted += 1
+            session = _Session(self._free_buffers.pop(), length, now)
+            chunk = data[2:2 + FIRST_FRAME_DATA]
+            session.buffer[0:len(chunk)] = chunk
+            session.received = len(chunk)
+            self._sessions[key] = session
+            return None
+        
+        if session is None:
+            self.orphan_frames += 1
+            return None
+        if frame_counter != session.next_frame:
+            self._release(key)
+            self.out_of_order += 1
+            return None
+        
+        chunk = data[1:1 + min(NEXT_FRAME_DATA, session.length - session.received)]
+        session.buffer[session.received:session.received + len(chunk)] = chunk
+        session.received += len(chunk)
+        session.next_frame += 1
+        if session.received < session.length:
+            return None
+        
+        payload = bytes(session.buffer[:session.length])
+        self._release(key)
+        self.completed += 1
+        return payload
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get reassembly counters"""
+        return {
+            "pgns": len(self.pgns),
+            "active_sessions": len(self._sessions),
+            "free_buffers": len(self._free_buffers),
+            "completed": self.completed,
+            "incomplete": self.incomplete,
+            "out_of_order": self.out_of_order,
+            "timed_out": self.timed_out,
+            "evicted": self.evicted,
+            "orphan_frames": self.orphan_frames,
+            "invalid": self.invalid
+        }
+
+
+def build_fast_packet_assembler(fast_packet_config: Optional[Dict[str, Any]]) -> Optional[FastPacketAssembler]:
+    """Build a FastPacketAssembler from the fast_packet config section
+    
+    Config format:
+        {"enabled": true, "pgns": [130900], "max_sessions": 64, "timeout": 0.75}
+    
+    "pgns" are added to the standard fast-packet PGN list.
+    
+    Returns:
+        FastPacketAssembler, or None if disabled
+    """
+    fast_packet_config = fast_packet_config or {}
+    if not fast_packet_config.get("enabled", True):
+        return None
+    pgns = set(DEFAULT_FAST_PACKET_PGNS)
+    pgns.update(int(pgn) for pgn in fast_packet_config.get("pgns", []))
+    return FastPacketAssembler(
+        pgns,
+        max_sessions=fast_packet_config.get("max_sessions", 64),
+        timeout=fast_packet_config.get("timeout", 0.75)
+    )
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Frame Decode - Decode, categorize and extract NMEA2000 frames
+
+The per-frame decode path shared by the CAN controller (in-process decoding)
+and the decode shard workers, so both produce the same documents: multi-frame
+reassembly (fast packet, ISO transport protocol), N2K decoding, PGN registry
+categorization and field extraction, with an optional decode cache.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+try:
+    from .pgn_registry import format_timestamp
+    from .latency import STAGE_DECODE, STAGE_EXTRACT
+except ImportError:
+    from pgn_registry import format_timestamp
+    from latency import STAGE_DECODE, STAGE_EXTRACT
+
+logger = logging.getLogger(__name__)
+
+
+class FrameDecoder:
+    """
+    Per-frame decode path over the decoder state of one process
+    
+    Holds references to the components it uses (not copies), so state such as
+    the decode cache and reassembly sessions stays shared with their owner.
+    Not thread-safe: reassembly state must only be fed from one thread.
+    """
+    
+    def __init__(self, n2k_decoder, pgn_registry, fast_packet=None, transport_protocol=None,
+                 decode_cache=None, latency=None):
+        """
+        Args:
+            n2k_decoder: N2KFrameDecoder
+            pgn_registry: PGN registry (categories and field extractors)
+            fast_packet: Fast-packet assembler (None: no fast-packet reassembly)
+            transport_protocol: ISO transport protocol manager (None: no TP reassembly)
+            decode_cache: DecodeCache for single-frame PGNs (None: no cache)
+            latency: LatencyTracker for the decode/extract stages (None: not tracked)
+        """
+        self.n2k_decoder = n2k_decoder
+        self.pgn_registry = pgn_registry
+        self.fast_packet = fast_packet
+        self.transport_protocol = transport_protocol
+        self.decode_cache = decode_cache
+        self.latency = latency
+    
+    def decode_and_extract(self, pgn_id: int, priority: int, source_id: int, dest: int, payload: bytes,
+                           channel_index: int = 0) -> Tuple[Any, Optional[dict]]:
+        """Decode, categorize and extract a frame, serving byte-identical repeats from the decode cache
+        
+        channel_index separates multi-frame reassembly state of the capture channels.
+        
+        Returns:
+            Tuple of (category, parsed_data), or (None, None) if undecodable or a
+            multi-frame message is still incomplete
+        """
+        cache = self.decode_cache
+        # Multi-frame PGNs are stateful (partial frames), so only single frames are cached
+        cacheable = cache is not None and not self.is_multi_frame(pgn_id)
+        if cacheable:
+            cache_key = (pgn_id, source_id, dest, bytes(payload))
+            cached = cache.get(cache_key)
+            if cached is not None:
+                category, cached_data = cached
+                parsed_data = dict(cached_data)
+                parsed_data["timestamp"] = format_timestamp(datetime.now())
+                return category, parsed_data
+        
+        # Decode the frame using NMEA2000 decoder (multi-frame reassembly, binary fast path, ASCII fallback)
+        latency = self.latency
+        started = time.perf_counter() if latency is not None else 0.0
+        decoded_data = self.decode_frame_payload(pgn_id, priority, source_id, dest, payload, channel_index)
+        if latency is not None:
+            decoded_at = time.perf_counter()
+            latency.record(STAGE_DECODE, pgn_id, decoded_at - started)
+        if not decoded_data:
+            return None, None
+        category = self.categorize(decoded_data)
+        parsed_data = self.extract(decoded_data, category)
+        if latency is not None:
+            latency.record(STAGE_EXTRACT, pgn_id, time.perf_counter() - decoded_at)
+        if cacheable and "error" not in parsed_data:
+            cache.put(cache_key, (category, parsed_data))
+        return category, parsed_data
+    
+    def is_multi_frame(self, pgn_id: int) -> bool:
+        """True if frames of this PGN are reassembled (fast packet or transport protocol)"""
+        return (
+            (self.fast_packet is not None and self.fast_packet.is_fast_packet(pgn_id))
+            or (self.transport_protocol is not None and self.transport_protocol.handles(pgn_id))
+        )
+    
+    def decode_frame_payload(self, pgn_id: int, priority: int, source_id: int, dest: int, payload: bytes,
+                             channel_index: int = 0):
+        """Decode a frame, reassembling fast-packet and transport protocol messages first
+        
+        Reassembly sessions are keyed by address; the channel index is folded into
+        the addresses so the same address on two channels never shares a session.
+        
+        Returns:
+            Decoded message, or None if undecodable or a multi-frame message is still incomplete
+        """
+        if self.transport_protocol is not None and self.transport_protocol.handles(pgn_id):
+            transported = self.transport_protocol.feed(pgn_id, source_id | (channel_index << 8), dest | (channel_index << 8),
+                                                       payload, time.monotonic())
+            if transported is None:
+                return None
+            transported_pgn, transported_payload = transported
+            return self.n2k_decoder.decode(transported_pgn, priority, source_id, dest, transported_payload, already_combined=True)
+        if self.fast_packet is not None and self.fast_packet.is_fast_packet(pgn_id):
+            combined_payload = self.fast_packet.feed(pgn_id, source_id | (channel_index << 8), payload, time.monotonic())
+            if combined_payload is None:
+                return None
+            return self.n2k_decoder.decode(pgn_id, priority, source_id, dest, combined_payload, already_combined=True)
+        return self.n2k_decoder.decode(pgn_id, priority, source_id, dest, payload)
+    
+    def categorize(self, data):
+        """Categorize decoded NMEA2000 data based on PGN (registry lookup)"""
+        return self.pgn_registry.category_for(data.PGN)
+    
+    def extract(self, data, category) -> dict:
+        """Extract specific fields from decoded data using the PGN registry's compiled extractor"""
+        try:
+            return self.pgn_registry.extract(data, category)
+        except Exception as e:
+            logger.error(f"Error extracting data fields: {e}")
+            return {
+                "pgn": data.PGN,
+                "source": data.source,
+                "dest": data.destination,
+                "error": str(e),
+                "timestamp": data.timestamp
+            }
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Frame History - Fixed-size columnar ring buffer of recent CAN frames
+
+Frames are stored in preallocated typed columns (array module) instead of
+lists of dicts, so the last N frames take a fixed, small amount of memory
+(29 bytes per frame) and can be queried locally with the query_frames command.
+"""
+
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+FRAME_DATA_BYTES = 8
+
+# Frames per query_frames reply: the largest frame entry is about 170 bytes of JSON,
+# so a full reply stays well inside one UDP datagram (MAX_DATAGRAM_SIZE)
+MAX_QUERY_FRAMES = 300
+
+
+def pgn_from_arbitration_id(arbitration_id: int) -> int:
+    """PGN of a 29-bit NMEA2000/J1939 identifier (PDU1 destination byte masked out)"""
+    pgn = (arbitration_id >> 8) & 0x3FFFF
+    if ((pgn >> 8) & 0xFF) < 240:
+        pgn &= 0x3FF00
+    return pgn
+
+
+class FrameHistory:
+    """
+    Columnar ring buffer of the last `capacity` frames
+    
+    Columns: receive time (monotonic), frame timestamp, arbitration ID, DLC and
+    8 data bytes. Receive times are increasing, so time-window queries binary
+    search for the window start instead of scanning the buffer.
+    """
+    
+    def __init__(self, capacity: int = 65536):
+        """
+        Args:
+            capacity: Number of frames kept (oldest overwritten)
+        """
+        if capacity < 1:
+            raise ValueError(f"FrameHistory needs capacity >= 1, got {capacity}")
+        self.capacity = capacity
+        self._monotonic = array("d", bytes(8 * capacity))
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._arbitration_ids = array("I", [0]) * capacity
+        self._dlcs = array("B", bytes(capacity))
+        self._data = bytearray(FRAME_DATA_BYTES * capacity)
+        self._next = 0  # Physical index of the next write
+        self._count = 0
+        self._lock = threading.Lock()
+        self.total_frames = 0
+    
+    def append(self, arbitration_id: int, data: bytes, timestamp: float, received_at: Optional[float] = None):
+        """Store one frame, overwriting the oldest when full"""
+        dlc = min(len(data), FRAME_DATA_BYTES)
+        with self._lock:
+            index = self._next
+            self._monotonic[index] = received_at if received_at is not None else time.monotonic()
+            self._timestamps[index] = timestamp or 0.0
+            self._arbitration_ids[index] = arbitration_id & 0xFFFFFFFF
+            self._dlcs[index] = dlc
+            offset = index * FRAME_DATA_BYTES
+            self._data[offset:offset + dlc] = data[:dlc]
+            self._next = (index + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+            self.total_frames += 1
+    
+    def _physical(self, logical: int) -> int:
+        """Physical index of the logical position (0 = oldest)"""
+        return (self._next - self._count + logical) % self.capacity
+    
+    def _first_at_or_after(self, received_at: float) -> int:
+        """Logical position of the first frame received at or after received_at"""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._monotonic[self._physical(middle)] < received_at:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def _copy(self, column, first: int, count: int, width: int = 1):
+        """Copy `count` entries of a column starting at physical index `first` (wrapping around)"""
+        end = first + count
+        if end <= self.capacity:
+            return column[first * width:end * width]
+        return column[first * width:] + column[:(end - self.capacity) * width]
+    
+    def query(self, last_seconds: Optional[float] = None, start: Optional[float] = None,
+              end: Optional[float] = None, pgn: Optional[int] = None, source: Optional[int] = None,
+              limit: int = MAX_QUERY_FRAMES, before: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Return matching frames, oldest first
+        
+        Args:
+            last_seconds: Only frames received within this many seconds
+            start / end: Frame timestamp window (same clock as python-can timestamps)
+            pgn: Only frames of this PGN
+            source: Only frames from this source address
+            limit: Maximum frames returned (the newest matches are kept)
+            before: Cursor from a previous query, only frames older than the ones it returned
+        
+        Returns:
+            Tuple of (list of {"arbitration_id", "pgn", "source", "timestamp", "age", "data"},
+            cursor for the next older page or None if no further frames match)
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be >= 1, got {limit}")
+        now = time.monotonic()
+        # Only copy the candidate range under the lock (the receive path appends under it);
+        # filtering and building the results happen outside
+        with self._lock:
+            first = self._first_at_or_after(now - last_seconds) if last_seconds is not None else 0
+            oldest_sequence = self.total_frames - self._count
+            stop = self._count
+            if before is not None:
+                stop = max(first, min(stop, before - oldest_sequence))
+            count = stop - first
+            physical = self._physical(first)
+            monotonic = self._copy(self._monotonic, physical, count)
+            timestamps = self._copy(self._timestamps, physical, count)
+            arbitration_ids = self._copy(self._arbitration_ids, physical, count)
+            dlcs = self._copy(self._dlcs, physical, count)
+            data = self._copy(self._data, physical, count, FRAME_DATA_BYTES)
+        
+        results = []
+        cursor = None
+        # Walk newest to oldest so limit keeps the most recent frames
+        for index in range(count - 1, -1, -1):
+            timestamp = timestamps[index]
+            if end is not None and timestamp > end:
+                continue
+            if start is not None and timestamp < start:
+                continue
+            arbitration_id = arbitration_ids[index]
+            if source is not None and (arbitration_id & 0xFF) != source:
+                continue
+            frame_pgn = pgn_from_arbitration_id(arbitration_id)
+            if pgn is not None and frame_pgn != pgn:
+                continue
+            if len(results) >= limit:
+                # At least one more match: continue from the oldest frame returned
+                cursor = oldest_sequence + first + index + 1
+                break
+            offset = index * FRAME_DATA_BYTES
+            results.append({
+                "arbitration_id": arbitration_id,
+                "pgn": frame_pgn,
+                "source": arbitration_id & 0xFF,
+                "timestamp": timestamp,
+                "age": round(now - monotonic[index], 6),
+                "data": list(data[offset:offset + dlcs[index]])
+            })
+        results.reverse()
+        return results, cursor
+    
+    def clear(self):
+        """Drop all frames (memory stays allocated)"""
+        with self._lock:
+            self._next = 0
+            self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get fill level and memory footprint"""
+        with self._lock:
+            oldest_age = time.monotonic() - self._monotonic[self._physical(0)] if self._count else 0.0
+            return {
+                "enabled": True,
+                "frames": self._count,
+                "capacity": self.capacity,
+                "total_frames": self.total_frames,
+                "span_seconds": round(oldest_age, 3),
+                "memory_bytes": self.capacity * (8 + 8 + self._arbitration_ids.itemsize + 1 + FRAME_DATA_BYTES)
+            }
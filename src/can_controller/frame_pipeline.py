@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Frame Pipeline - Bounded ring buffers for the pipelined CAN receive path
+"""
+
+import struct
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+# SocketCAN-style flag bits carried in the packed arbitration ID
+CAN_EFF_FLAG = 0x80000000  # Extended (29-bit) frame
+CAN_RTR_FLAG = 0x40000000  # Remote transmission request
+CAN_ID_MASK = 0x1FFFFFFF
+
+# Packed raw frame: arbitration ID + flags (u32), timestamp (f64), DLC (u8), 8 data bytes
+_RAW_FRAME_STRUCT = struct.Struct("<IdBB8s")
+RAW_FRAME_SIZE = _RAW_FRAME_STRUCT.size
+
+
+class RawFrame(NamedTuple):
+    """
+    Compact raw CAN frame (ID, timestamp, up to 8 data bytes, capture channel index)
+    
+    Attribute names match python-can's Message so a RawFrame can be passed
+    wherever only those fields are read (except channel, which is an index into
+    the node's open channels rather than a name). pack()/unpack() give a fixed
+    22-byte representation for handing frames across process boundaries.
+    """
+    arbitration_id: int
+    timestamp: float
+    data: bytes
+    is_extended_id: bool = True
+    is_remote_frame: bool = False
+    channel: int = 0
+    
+    @property
+    def dlc(self) -> int:
+        return len(self.data)
+    
+    @classmethod
+    def from_message(cls, message, channel: int = 0) -> "RawFrame":
+        """Build a RawFrame from a python-can Message received on the given channel index"""
+        return cls(
+            message.arbitration_id,
+            message.timestamp,
+            bytes(message.data),
+            message.is_extended_id,
+            message.is_remote_frame,
+            channel
+        )
+    
+    def pack(self) -> bytes:
+        """Pack into the fixed-size binary representation"""
+        can_id = self.arbitration_id & CAN_ID_MASK
+        if self.is_extended_id:
+            can_id |= CAN_EFF_FLAG
+        if self.is_remote_frame:
+            can_id |= CAN_RTR_FLAG
+        data = bytes(self.data[:8])  # Classic CAN payload only
+        return _RAW_FRAME_STRUCT.pack(can_id, self.timestamp, len(data), self.channel, data)
+    
+    @classmethod
+    def unpack(cls, buffer: bytes) -> "RawFrame":
+        """Unpack a frame produced by pack()"""
+        can_id, timestamp, dlc, channel, data = _RAW_FRAME_STRUCT.unpack(buffer)
+        return cls(
+            can_id & CAN_ID_MASK,
+            timestamp,
+            data[:dlc],
+            bool(can_id & CAN_EFF_FLAG),
+            bool(can_id & CAN_RTR_FLAG),
+            channel
+        )
+
+
+class FrameRing:
+    """
+    Bounded, preallocated ring buffer for CAN frames
+    
+    Features:
+    - Fixed number of slots allocated up front (no growth under bursts)
+    - Never blocks the producer: when full, the oldest entry is overwritten
+      and counted as dropped
+    - Consumers block with timeout until frames are available
+    - Depth, high watermark and drop counters for status reporting
+    """
+    
+    def __init__(self, capacity: int, name: str = "ring"):
+        """
+        Initialize the ring buffer
+        
+        Args:
+            capacity: Number of preallocated slots
+            name: Name used in status output
+        """
+        if capacity < 1:
+            raise ValueError(f"FrameRing capacity must be >= 1, got {capacity}")
+        self.name = name
+        self.capacity = capacity
+        self._slots: List[Any] = [None] * capacity
+        self._head = 0  # Index of the oldest entry
+        self._count = 0
+        self._cond = threading.Condition(threading.Lock())
+        
+        # Counters
+        self.enqueued = 0
+        self.dequeued = 0
+        self.dropped = 0
+        self.high_watermark = 0
+        self.last_drop_time: Optional[float] = None
+    
+    def put(self, item: Any) -> bool:
+        """Append an item, overwriting the oldest one if the ring is full
+        
+        Returns:
+            bool: True if stored without dropping, False if an older item was overwritten
+        """
+        with self._cond:
+            stored_cleanly = True
+            if self._count == self.capacity:
+                # Overwrite oldest - producer (bus capture) must never block
+                self._slots[self._head] = None
+                self._head = (self._head + 1) % self.capacity
+                self._count -= 1
+                self.dropped += 1
+                self.last_drop_time = time.time()
+                stored_cleanly = False
+            
+            self._slots[(self._head + self._count) % self.capacity] = item
+            self._count += 1
+            self.enqueued += 1
+            if self._count > self.high_watermark:
+                self.high_watermark = self._count
+            self._cond.notify()
+            return stored_cleanly
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Remove and return the oldest item, or None if the timeout expires"""
+        with self._cond:
+            if not self._count and not self._cond.wait_for(lambda: self._count > 0, timeout):
+                return None
+            return self._pop_locked()
+    
+    def get_batch(self, max_items: int, timeout: Optional[float] = None) -> List[Any]:
+        """Remove and return up to max_items oldest items (waits for at least one)"""
+        with self._cond:
+            if not self._count and not self._cond.wait_for(lambda: self._count > 0, timeout):
+                return []
+            batch = []
+            while self._count and len(batch) < max_items:
+                batch.append(self._pop_locked())
+            return batch
+    
+    def _pop_locked(self) -> Any:
+        item = self._slots[self._head]
+        self._slots[self._head] = None
+        self._head = (self._head + 1) % self.capacity
+        self._count -= 1
+        self.dequeued += 1
+        return item
+    
+    def clear(self):
+        """Discard all queued items (counters are kept)"""
+        with self._cond:
+            self._slots = [None] * self.capacity
+            self._head = 0
+            self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and drop counters"""
+        with self._cond:
+            return {
+                "depth": self._count,
+                "capacity": self.capacity,
+                "high_watermark": self.high_watermark,
+                "enqueued": self.enqueued,
+                "dequeued": self.dequeued,
+                "dropped": self.dropped,
+                "last_drop_time": self.last_drop_time
+            }
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Frame Record - Immutable per-frame result shared by all CAN data sinks
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class FrameRecord:
+    """
+    One received CAN frame, decoded and extracted exactly once
+    
+    The DB sink, subscriber broadcast and Master Core stream all read the same
+    record. Their payloads are built lazily on first access and cached, so a
+    sink that is not used costs nothing and shared payloads are built once.
+    
+    parsed_data is shared between sinks and must not be mutated; sinks that
+    need to add keys (e.g. TTL for the DB) copy it first.
+    """
+    arbitration_id: int
+    data: bytes
+    timestamp: float
+    is_extended_id: bool = True
+    is_remote_frame: bool = False
+    pgn: Optional[int] = None
+    category: Any = None
+    parsed_data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    channel: Optional[str] = None  # Capture channel (multi-channel capture only)
+    
+    @classmethod
+    def from_frame(cls, frame, pgn: Optional[int] = None, category: Any = None,
+                   parsed_data: Optional[Dict[str, Any]] = None, error: Optional[str] = None,
+                   channel: Optional[str] = None) -> "FrameRecord":
+        """Build a record from a python-can Message or RawFrame"""
+        return cls(
+            arbitration_id=frame.arbitration_id,
+            data=bytes(frame.data),
+            timestamp=frame.timestamp,
+            is_extended_id=frame.is_extended_id,
+            is_remote_frame=frame.is_remote_frame,
+            pgn=pgn,
+            category=category,
+            parsed_data=parsed_data,
+            error=error,
+            channel=channel
+        )
+    
+    @property
+    def decoded(self) -> bool:
+        """True if the frame was decoded and its fields extracted"""
+        return self.parsed_data is not None and self.error is None
+    
+    @property
+    def source(self) -> int:
+        """Source address (low byte of the 29-bit identifier)"""
+        return self.arbitration_id & 0xFF
+    
+    @property
+    def category_name(self) -> str:
+        """Category as stored/streamed (enum value or string)"""
+        return self.category.value if hasattr(self.category, 'value') else str(self.category)
+    
+    @cached_property
+    def can_message_payload(self) -> Dict[str, Any]:
+        """Raw CAN frame dict streamed to subscribers and Master Core
+        
+        data stays bytes: binary peers get it as-is, JSON peers as a list of ints.
+        """
+        message_data = {
+            "arbitration_id": self.arbitration_id,
+            "data": self.data,
+            "timestamp": self.timestamp,
+            "is_extended_id": self.is_extended_id,
+            "is_remote_frame": self.is_remote_frame
+        }
+        if self.channel is not None:
+            message_data["channel"] = self.channel
+        if self.error is not None:
+            message_data["error"] = self.error
+        elif self.decoded:
+            message_data["decoded"] = True
+            message_data["pgn"] = self.pgn
+            message_data["category"] = self.category_name
+        else:
+            message_data["decoded"] = False
+        return message_data
+    
+    @cached_property
+    def subscriber_payload(self) -> Dict[str, Any]:
+        """DATA payload for data subscribers"""
+        return {"can_data": self.can_message_payload}
+    
+    @cached_property
+    def master_core_payload(self) -> Dict[str, Any]:
+        """DATA payload for Master Core"""
+        if self.decoded:
+            return {"can_message": self.can_message_payload, "parsed_data": self.parsed_data}
+        return {"can_message": self.can_message_payload}
+    
+    def db_document(self, ttl_expiration: str) -> Dict[str, Any]:
+        """Document for store_can_data (copy of parsed_data plus TTL expiration)"""
+        document = dict(self.parsed_data)
+        if self.channel is not None:
+            document["channel"] = self.channel
+        document["ttl_expiration"] = ttl_expiration
+        return document
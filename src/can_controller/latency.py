@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Latency - Log-linear latency histograms per pipeline stage and per PGN
+
+Histograms are HdrHistogram-style: each power-of-two range is split into 16
+linear sub-buckets, so percentiles are accurate to ~6% over microseconds to
+hours with a fixed 464-slot counter array and no per-sample allocation.
+"""
+
+import math
+import threading
+from array import array
+from typing import Any, Dict, Iterable, Optional
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS  # 16
+MAX_SHIFT = 27  # Values up to ~2^32 microseconds (~71 minutes)
+BUCKET_COUNT = SUB_BUCKETS + (MAX_SHIFT + 1) * SUB_BUCKETS
+
+# Pipeline stages
+STAGE_RECEIVE = "receive"  # Bus timestamp -> decode start (queueing in kernel/rings)
+STAGE_DECODE = "decode"  # NMEA2000 decoder (incl. multi-frame reassembly)
+STAGE_EXTRACT = "extract"  # Categorization + field extraction
+STAGE_SEND_PREFIX = "send_"  # Per sink: send_db, send_subscribers, send_master_core
+STAGE_END_TO_END = "end_to_end"  # Bus timestamp -> last sink send done
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def _bucket_index(value: int) -> int:
+    if value < SUB_BUCKETS:
+        return max(value, 0)
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    if shift > MAX_SHIFT:
+        return BUCKET_COUNT - 1
+    return SUB_BUCKETS + shift * SUB_BUCKETS + ((value >> shift) - SUB_BUCKETS)
+
+
+def _bucket_upper_bound(index: int) -> int:
+    if index < SUB_BUCKETS:
+        return index
+    shift, sub_bucket = divmod(index - SUB_BUCKETS, SUB_BUCKETS)
+    return ((SUB_BUCKETS + sub_bucket + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Fixed-size log-linear histogram of latencies in microseconds"""
+    
+    def __init__(self):
+        self._counts = array("Q", bytes(8 * BUCKET_COUNT))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+    
+    def record(self, microseconds: int):
+        """Add one sample (negative samples, e.g. from clock skew, count as 0)"""
+        if microseconds < 0:
+            microseconds = 0
+        self._counts[_bucket_index(microseconds)] += 1
+        self.count += 1
+        self.total += microseconds
+        if self.min is None or microseconds < self.min:
+            self.min = microseconds
+        if microseconds > self.max:
+            self.max = microseconds
+    
+    def percentile(self, percent: float) -> int:
+        """Upper bound (microseconds) of the bucket holding the given percentile"""
+        if not self.count:
+            return 0
+        target = max(1, math.ceil(self.count * percent / 100.0))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(_bucket_upper_bound(index), self.max)
+        return self.max
+    
+    def summary(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        """count, min/mean/max and percentiles, in microseconds"""
+        result = {
+            "count": self.count,
+            "min_us": self.min or 0,
+            "mean_us": round(self.total / self.count, 1) if self.count else 0.0,
+            "max_us": self.max
+        }
+        for percent in percentiles:
+            result[f"p{percent:g}".replace(".", "")] = self.percentile(percent)
+        return result
+
+
+class LatencyTracker:
+    """
+    Latency histograms per stage (all PGNs) and per (stage, PGN)
+    
+    Per-PGN histograms are created the first time a PGN is seen in a stage,
+    up to max_pgns PGNs per stage (further PGNs only feed the stage total).
+    """
+    
+    def __init__(self, max_pgns: int = 128):
+        """
+        Args:
+            max_pgns: Maximum PGNs tracked individually per stage
+        """
+        self.max_pgns = max_pgns
+        self._stages: Dict[str, LatencyHistogram] = {}
+        self._pgn_stages: Dict[str, Dict[int, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, stage: str, pgn: Optional[int], seconds: float):
+        """Record one stage latency (seconds) for a frame"""
+        microseconds = int(seconds * 1_000_000)
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = LatencyHistogram()
+                self._pgn_stages[stage] = {}
+            histogram.record(microseconds)
+            if pgn is None:
+                return
+            per_pgn = self._pgn_stages[stage]
+            pgn_histogram = per_pgn.get(pgn)
+            if pgn_histogram is None:
+                if len(per_pgn) >= self.max_pgns:
+                    return
+                pgn_histogram = per_pgn[pgn] = LatencyHistogram()
+            pgn_histogram.record(microseconds)
+    
+    def reset(self):
+        """Drop all histograms"""
+        with self._lock:
+            self._stages = {}
+            self._pgn_stages = {}
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Per-stage summaries (for get_status)"""
+        with self._lock:
+            return {stage: histogram.summary() for stage, histogram in self._stages.items()}
+    
+    def get_stats(self, pgn: Optional[int] = None, stage: Optional[str] = None) -> Dict[str, Any]:
+        """Per-stage summaries plus per-PGN breakdowns
+        
+        Args:
+            pgn: Only this PGN in the per-PGN breakdown
+            stage: Only this stage
+        """
+        with self._lock:
+            stages = [stage] if stage is not None else list(self._stages)
+            result = {"stages": {}, "pgns": {}}
+            for stage_name in stages:
+                if stage_name not in self._stages:
+                    continue
+                result["stages"][stage_name] = self._stages[stage_name].summary()
+                for stage_pgn, histogram in self._pgn_stages[stage_name].items():
+                    if pgn is not None and stage_pgn != pgn:
+                        continue
+                    result["pgns"].setdefault(str(stage_pgn), {})[stage_name] = histogram.summary()
+            return result
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+N2K Decode - Decode NMEA2000 frames from header fields and payload bytes
+
+Wraps NMEA2000Decoder with a binary fast path that hands the payload straight
+to the decoder's internal _decode() entry point, skipping the N2K ASCII string
+build and re-parse of decode_basic_string(). The entry point is private and its
+signature changed between nmea2000 releases, so it is bound once at
+construction from its signature; if it does not match, every frame takes the
+ASCII path.
+
+Like decode_basic_string(), the fast path passes the payload byte-reversed
+(the decoder reads it as one big-endian integer).
+"""
+
+import inspect
+import logging
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from nmea2000.decoder import NMEA2000Decoder
+
+logger = logging.getLogger(__name__)
+
+# nmea2000 releases with decode_basic_string(..., already_combined), a known _decode() signature
+# and a static _extract_header(), without the per-message stdout dump of 2025.5.4-2025.5.6
+SUPPORTED_NMEA2000 = ">=2025.5.7,<2026.4"
+
+# Leading positional parameters of NMEA2000Decoder._decode() in every supported release
+_BINARY_PARAMETERS = 6  # pgn, priority, source_id, destination_id, timestamp, can_data
+
+
+def format_n2k_ascii_frame(pgn_id: int, priority: int, source_id: int, dest: int, payload: bytes) -> str:
+    """Format a frame as N2K ASCII basic string (timestamp,prio,pgn,src,dst,len,data...)"""
+    time_of_message = datetime.now().strftime("%Y-%m-%d-%H:%M:%S.%f")
+    payload_data_string = ",".join(format(item, '02x') for item in payload)
+    return f"{time_of_message},{priority},{pgn_id},{source_id},{dest},{len(payload)},{payload_data_string}"
+
+
+def bind_binary_decode(decoder: Any) -> Optional[Callable[..., Any]]:
+    """Bind the decoder's binary entry point
+    
+    Returns:
+        Callable (pgn_id, priority, source_id, dest, payload, already_combined) -> decoded message,
+        or None if the installed decoder has no compatible _decode()
+    """
+    entry_point = getattr(decoder, "_decode", None)
+    if entry_point is None:
+        return None
+    try:
+        parameters = list(inspect.signature(entry_point).parameters.values())
+    except (TypeError, ValueError):
+        return None
+    names = [parameter.name for parameter in parameters]
+    if len(parameters) < _BINARY_PARAMETERS or "already_combined" not in names:
+        return None
+    extra = [parameter.name for parameter in parameters[_BINARY_PARAMETERS:]
+             if parameter.default is inspect.Parameter.empty and parameter.name != "raw_can_data"]
+    if extra:
+        return None
+    
+    if "raw_can_data" in names:
+        def binary_decode(pgn_id, priority, source_id, dest, payload, already_combined=False):
+            return entry_point(pgn_id, priority, source_id, dest, datetime.now(), payload[::-1], payload,
+                               already_combined=already_combined)
+    else:
+        def binary_decode(pgn_id, priority, source_id, dest, payload, already_combined=False):
+            return entry_point(pgn_id, priority, source_id, dest, datetime.now(), payload[::-1],
+                               already_combined=already_combined)
+    return binary_decode
+
+
+class N2KFrameDecoder:
+    """
+    NMEA2000 frame decoder with binary fast path and ASCII fallback
+    
+    Shared by the in-process decode path and the decode shard workers, so both
+    produce the same decoded messages.
+    """
+    
+    def __init__(self, decoder: Optional[NMEA2000Decoder] = None, binary_enabled: bool = True):
+        """
+        Args:
+            decoder: NMEA2000Decoder to use (a new one if None)
+            binary_enabled: Use the binary fast path when the decoder supports it
+        """
+        self.decoder = decoder if decoder is not None else NMEA2000Decoder()
+        self._binary_decode = bind_binary_decode(self.decoder) if binary_enabled else None
+        if self._binary_decode is None and not hasattr(self.decoder, "decode_basic_string"):
+            raise RuntimeError(f"Installed nmea2000 decoder has neither a compatible _decode() nor decode_basic_string(); "
+                               f"nmea2000{SUPPORTED_NMEA2000} is required")
+        if binary_enabled and self._binary_decode is None:
+            logger.warning("⚠️ [can_controller] Binary decode path unavailable with the installed nmea2000, using N2K ASCII decoding")
+    
+    @property
+    def binary(self) -> bool:
+        """True if frames take the binary fast path"""
+        return self._binary_decode is not None
+    
+    def decode(self, pgn_id: int, priority: int, source_id: int, dest: int, payload: bytes,
+               already_combined: bool = False):
+        """Decode a single NMEA2000 frame
+        
+        already_combined=True marks a payload reassembled from fast-packet frames,
+        so the decoder does not try to combine it again.
+        """
+        if self._binary_decode is not None:
+            return self._binary_decode(pgn_id, priority, source_id, dest, bytes(payload), already_combined)
+        formated_frame = format_n2k_ascii_frame(pgn_id, priority, source_id, dest, payload)
+        logger.info(f"N2K ASCII Version: {formated_frame}")
+        if already_combined:
+            return self.decoder.decode_basic_string(formated_frame, already_combined=True)
+        return self.decoder.decode_basic_string(formated_frame)
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+PGN Registry - Table-driven PGN dispatch (category, collection, field extractor)
+
+Replaces per-frame if/elif chains on data.PGN with a single dict lookup. Field
+extractors are compiled once from declarative field specs; new PGNs can be
+registered from config ("pgn_registry") or by plugins via PGNRegistry.register().
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# MongoDB collection per data category name
+CATEGORY_COLLECTIONS = {
+    "HEARTBEAT": "NodeHeartbeat",
+    "FUEL": "Fuel",
+    "NAVIGATION": "Navigation",
+    "ENGINE": "Engine",
+    "ENERGYDISTRIBUTION": "EnergyDistribution",
+    "STEERING": "Steering",
+    "BATTERY": "Battery",
+    "PRODUCT": "Product",
+}
+DEFAULT_COLLECTION = "Unknown"
+
+
+def _convert_value(value):
+    """Convert value to JSON-serializable format (handle bytes)"""
+    if isinstance(value, bytes):
+        return list(value)
+    return value
+
+
+def _format_date(value):
+    return value.strftime('%Y/%m/%d') if hasattr(value, 'strftime') else value
+
+
+def _format_time(value):
+    return value.strftime('%H:%M:%S') if hasattr(value, 'strftime') else value
+
+
+def format_timestamp(timestamp) -> str:
+    """Format a decoded frame timestamp the way stored documents expect"""
+    return timestamp.isoformat() if hasattr(timestamp, 'isoformat') else str(timestamp)
+
+
+# Field accessors used in field specs
+FIELD_ACCESSORS: Dict[str, Callable[[Any], Any]] = {
+    "value": lambda field: field.value,                                  # Scaled value as decoded
+    "value_list": lambda field: _convert_value(field.value),             # Scaled value, bytes -> list
+    "raw": lambda field: _convert_value(field.raw_value),                # Raw (lookup/bitfield) value, bytes -> list
+    "date": lambda field: _format_date(field.value),                     # Date as YYYY/MM/DD
+    "time": lambda field: _format_time(field.value),                     # Time as HH:MM:SS
+}
+
+
+def compile_field_extractor(field_spec: Sequence[Sequence[str]]) -> Callable[[Any], Dict[str, Any]]:
+    """Compile a field spec into an extractor function
+    
+    Args:
+        field_spec: Ordered (key, unit_key, accessor) triples, one per decoded field
+            position. accessor is one of FIELD_ACCESSORS (default "value").
+    
+    Returns:
+        Function mapping a decoded NMEA2000 message to the stored document dict
+        (title, pgn, source, dest, <fields>, timestamp). Missing trailing fields
+        are stored as None.
+    """
+    compiled = []
+    for index, spec in enumerate(field_spec):
+        key, unit_key = spec[0], spec[1]
+        accessor_name = spec[2] if len(spec) > 2 else "value"
+        if accessor_name not in FIELD_ACCESSORS:
+            raise ValueError(f"Unknown field accessor '{accessor_name}' for field '{key}'")
+        compiled.append((index, key, unit_key, FIELD_ACCESSORS[accessor_name]))
+    compiled = tuple(compiled)
+    
+    def extract(data) -> Dict[str, Any]:
+        fields = data.fields
+        field_count = len(fields)
+        result = {
+            "title": "-".join(field.id for field in fields),
+            "pgn": data.PGN,
+            "source": data.source,
+            "dest": data.destination,
+        }
+        for index, key, unit_key, accessor in compiled:
+            if index < field_count:
+                field = fields[index]
+                result[key] = accessor(field)
+                result[unit_key] = field.unit_of_measurement
+            else:
+                result[key] = None
+                result[unit_key] = None
+        result["timestamp"] = format_timestamp(data.timestamp)
+        return result
+    
+    return extract
+
+
+def extract_generic_fields(data) -> Dict[str, Any]:
+    """Generic extraction for PGNs without a dedicated extractor"""
+    return {
+        "pgn": data.PGN,
+        "source": data.source,
+        "dest": data.destination,
+        "fields": [_convert_value(field.value) for field in data.fields] if data.fields else [],
+        "timestamp": format_timestamp(data.timestamp)
+    }
+
+
+@dataclass(frozen=True)
+class PGNEntry:
+    """Registry entry for one PGN"""
+    pgn: int
+    name: str
+    category: Any
+    collection: str
+    extractor: Optional[Callable[[Any], Dict[str, Any]]] = None
+
+
+# Default PGN table: pgn -> (name, category name, field spec or None for generic extraction)
+DEFAULT_PGNS: Dict[int, tuple] = {
+    126993: ("Heartbeat", "HEARTBEAT", [  # 1F011
+        ("data_transmit_offset", "unit_data_transmit_offset", "value_list"),
+        ("sequence_counter", "unit_sequence_counter", "value_list"),
+        ("controller1_state", "unit_controller1_state", "raw"),
+        ("controller2_state", "unit_controller2_state", "raw"),
+        ("equipment_status", "unit_equipment_status", "raw"),
+        ("reserved_30", "unit_reserved_30", "value_list"),
+    ]),
+    127488: ("Engine Parameters, Rapid Update", "ENGINE", [  # 1F200
+        ("instance", "unit"),
+        ("speed", "unit_speed"),
+        ("boost_pressure", "unit_boost_pressure"),
+        ("tilt_trim", "unit_tilt_trim"),
+        ("reserved_48", "unit_reserved_48"),
+    ]),
+    127505: ("Fluid Level", "FUEL", [  # 1F211
+        ("instance", "unit"),
+        ("type", "unit_type"),
+        ("level", "unit_level"),
+        ("capacity", "unit_capacity"),
+        ("reserved_56", "unit_reserved_56"),
+    ]),
+    127250: ("Vessel Heading", "NAVIGATION", [  # 1F112
+        ("sid", "unit"),
+        ("heading", "unit_heading"),
+        ("deviation", "unit_deviation"),
+        ("variation", "unit_variation"),
+        ("reference", "unit_reference"),
+        ("reserved_58", "unit_reserved_58"),
+    ]),
+    127257: ("Attitude", "NAVIGATION", [  # 1F119
+        ("sid", "unit"),
+        ("yaw", "unit_yaw"),
+        ("pitch", "unit_pitch"),
+        ("roll", "unit_roll"),
+        ("reserved_56", "unit_reserved_56"),
+    ]),
+    129026: ("COG & SOG, Rapid Update", "NAVIGATION", [  # 1F802
+        ("sid", "unit"),
+        ("cog_reference", "unit_cog_reference"),
+        ("reserved_10", "unit_reserved_10"),
+        ("cog", "unit_cog"),
+        ("sog", "unit_sog"),
+        ("reserved_48", "unit_reserved_48"),
+    ]),
+    129025: ("Position, Rapid Update", "NAVIGATION", [  # 1F801
+        ("latitude", "unit_latitude"),
+        ("longitude", "unit_longitude"),
+    ]),
+    129540: ("GNSS Sats in View", "NAVIGATION", [  # 1FA04
+        ("sid", "unit"),
+        ("range_residual_mode", "unit_range_residual_mode"),
+        ("reserved_10", "unit_reserved_10"),
+        ("sats_in_view", "unit_sats_in_view"),
+        ("prn", "unit_prn"),
+        ("elevation", "unit_elevation"),
+        ("azimuth", "unit_azimuth"),
+        ("snr", "unit_snr"),
+        ("range_residuals", "unit_range_residuals"),
+        ("status", "unit_status"),
+        ("reserved_116", "unit_reserved_116"),
+    ]),
+    129029: ("GNSS Position Data", "NAVIGATION", [  # 1F805
+        ("sid", "unit"),
+        ("date", "unit_date", "date"),
+        ("time", "unit_time", "time"),
+        ("latitude", "unit_latitude"),
+        ("longitude", "unit_longitude"),
+        ("altitude", "unit_altitude"),
+        ("gnss_type", "unit_gnss_type"),
+        ("method", "unit_method"),
+        ("integrity", "unit_integrity"),
+        ("reserved_258", "unit_reserved_258"),
+        ("number_of_svs", "unit_number_of_svs"),
+        ("hdop", "unit_hdop"),
+        ("pdop", "unit_pdop"),
+        ("geoidal_separation", "unit_geoidal_separation"),
+        ("reference_stations", "unit_reference_stations"),
+        ("reference_station_type", "unit_reference_station_type"),
+        ("reference_station_id", "unit_reference_station_id"),
+        ("age_of_dgnss_corrections", "unit_age_of_dgnss_corrections"),
+    ]),
+    126992: ("System Time", "NAVIGATION", [  # 1F010
+        ("sid", "unit"),
+        ("measure_source", "unit_measure_source"),
+        ("reserved_12", "unit_reserved_12"),
+        ("date", "unit_date", "date"),
+        ("time", "unit_time", "time"),
+    ]),
+    129539: ("GNSS DOPs", "NAVIGATION", None),  # 1FA03
+    127258: ("Magnetic Variation", "NAVIGATION", None),  # 1F11A
+    127489: ("Engine Parameters, Dynamic", "ENGINE", None),  # 1F201
+    127497: ("Trip Fuel Consumption, Engine", "ENGINE", None),  # 1F209
+    127751: ("DC Voltage / Current", "ENERGYDISTRIBUTION", [  # 1F307
+        ("sid", "unit"),
+        ("connection_number", "unit_connection_number"),
+        ("dc_voltage", "unit_dc_voltage"),
+        ("dc_current", "unit_dc_current"),
+        ("reserved_56", "unit_reserved_56"),
+    ]),
+    127500: ("Load Controller Connection State / Control", "ENERGYDISTRIBUTION", None),  # 1F20C
+    127501: ("Switch Bank Status", "ENERGYDISTRIBUTION", None),  # 1F20D
+    127245: ("Rudder", "STEERING", [  # 1F10D
+        ("instance", "unit_instance"),
+        ("direction_order", "unit_direction_order", "raw"),
+        ("reserved_11", "unit_reserved_11", "value_list"),
+        ("angle_order", "unit_angle_order", "value_list"),
+        ("position", "unit_position", "value_list"),
+        ("reserved_48", "unit_reserved_48"),
+    ]),
+    127508: ("Battery Status", "BATTERY", [  # 1F214
+        ("instance", "unit_instance"),
+        ("voltage", "unit_voltage"),
+        ("current", "unit_current"),
+        ("temperature", "unit_temperature"),
+        ("sid", "unit_sid"),
+    ]),
+    127506: ("DC Detailed Status", "BATTERY", [  # 1F212
+        ("sid", "unit_sid"),
+        ("instance", "unit_instance"),
+        ("dc_type", "unit_dc_type", "raw"),
+        ("state_of_charge", "unit_state_of_charge", "value_list"),
+        ("state_of_health", "unit_state_of_health"),
+        ("time_remaining", "unit_time_remaining"),
+        ("ripple_voltage", "unit_ripple_voltage"),
+        ("remaining_capacity", "unit_remaining_capacity"),
+    ]),
+    129283: ("Cross Track Error", "NAVIGATION", [  # 1F903
+        ("sid", "unit_sid"),
+        ("xte_mode", "unit_xte_mode", "raw"),
+        ("reserved_12", "unit_reserved_12", "value_list"),
+        ("navigation_terminated", "unit_navigation_terminated", "raw"),
+        ("xte", "unit_xte"),
+        ("reserved_48", "unit_reserved_48"),
+    ]),
+    129284: ("Navigation Data", "NAVIGATION", [  # 1F904
+        ("sid", "unit_sid"),
+        ("distance_to_waypoint", "unit_distance_to_waypoint"),
+        ("course_bearing_reference", "unit_course_bearing_reference", "raw"),
+        ("perpendicular_crossed", "unit_perpendicular_crossed", "raw"),
+        ("arrival_circle_entered", "unit_arrival_circle_entered", "raw"),
+        ("calculation_type", "unit_calculation_type", "raw"),
+        ("eta_time", "unit_eta_time"),
+    ]),
+    65361: ("Raymarine Alarm", "PRODUCT", [  # FF51
+        ("manufacturer_code", "unit_manufacturer_code", "raw"),
+        ("reserved_11", "unit_reserved_11", "value_list"),
+        ("industry_code", "unit_industry_code", "raw"),
+        ("alarm_id", "unit_alarm_id", "raw"),
+        ("alarm_group", "unit_alarm_group", "raw"),
+        ("reserved_32", "unit_reserved_32"),
+    ]),
+    60928: ("ISO Address Claim", "PRODUCT", [  # EE00
+        ("unique_number", "unit_unique_number"),
+        ("manufacturer_code", "unit_manufacturer_code", "raw"),
+        ("device_instance_lower", "unit_device_instance_lower", "value_list"),
+        ("device_instance_upper", "unit_device_instance_upper", "value_list"),
+        ("device_function", "unit_device_function", "raw"),
+        ("spare", "unit_spare", "value_list"),
+        ("device_class", "unit_device_class", "raw"),
+        ("industry_code", "unit_industry_code", "raw"),
+    ]),
+    59392: ("ISO Acknowledge", "PRODUCT", [  # E800
+        ("control", "unit_control", "raw"),
+        ("group_function", "unit_group_function", "value_list"),
+        ("reserved_16", "unit_reserved_16"),
+        ("ack_pgn", "unit_ack_pgn"),
+    ]),
+}
+
+
+class PGNRegistry:
+    """
+    PGN -> (category, collection, field extractor) lookup table
+    
+    Features:
+    - O(1) dispatch per frame (single dict lookup)
+    - Field extractors compiled once from declarative specs
+    - PGNs can be added or overridden from config or by plugins at runtime
+    """
+    
+    def __init__(self, categories):
+        """
+        Initialize an empty registry
+        
+        Args:
+            categories: DataCategories enum used to resolve category names
+        """
+        self.categories = categories
+        self.unknown_category = categories.UNKNOWN
+        self._entries: Dict[int, PGNEntry] = {}
+    
+    def _resolve_category(self, category):
+        if isinstance(category, str):
+            return self.categories[category.upper()]
+        return category
+    
+    def register(self, pgn: int, category, name: str = "", collection: Optional[str] = None,
+                 fields: Optional[Iterable[Sequence[str]]] = None,
+                 extractor: Optional[Callable[[Any], Dict[str, Any]]] = None) -> PGNEntry:
+        """Register (or replace) a PGN
+        
+        Args:
+            pgn: Parameter Group Number
+            category: DataCategories member or its name
+            name: Human readable PGN name
+            collection: MongoDB collection (defaults to the category's collection)
+            fields: Field spec compiled with compile_field_extractor()
+            extractor: Custom extractor function (takes precedence over fields)
+        
+        Returns:
+            The registered PGNEntry
+        """
+        category = self._resolve_category(category)
+        category_name = getattr(category, "name", str(category))
+        if extractor is None and fields is not None:
+            extractor = compile_field_extractor(list(fields))
+        entry = PGNEntry(
+            pgn=int(pgn),
+            name=name,
+            category=category,
+            collection=collection or CATEGORY_COLLECTIONS.get(category_name, DEFAULT_COLLECTION),
+            extractor=extractor
+        )
+        self._entries[entry.pgn] = entry
+        return entry
+    
+    def register_from_config(self, pgn_config: Optional[Dict[str, Any]]) -> int:
+        """Register PGNs from a config section
+        
+        Config format:
+            {"130306": {"name": "Wind Data", "category": "NAVIGATION", "collection": "Navigation",
+                        "fields": [["sid", "unit_sid"], ["wind_speed", "unit_wind_speed", "value"]]}}
+        
+        Returns:
+            Number of PGNs registered
+        """
+        count = 0
+        for pgn, spec in (pgn_config or {}).items():
+            try:
+                self.register(
+                    int(pgn),
+                    spec.get("category", "UNKNOWN"),
+                    name=spec.get("name", ""),
+                    collection=spec.get("collection"),
+                    fields=spec.get("fields")
+                )
+                count += 1
+            except Exception as e:
+                logger.error(f"❌ [can_controller] Invalid pgn_registry entry for PGN {pgn}: {e}")
+        return count
+    
+    def get(self, pgn: int) -> Optional[PGNEntry]:
+        """Get registry entry for a PGN (None if not registered)"""
+        return self._entries.get(pgn)
+    
+    def category_for(self, pgn: int):
+        """Get data category for a PGN (UNKNOWN if not registered)"""
+        entry = self._entries.get(pgn)
+        return entry.category if entry else self.unknown_category
+    
+    def extract(self, data, category) -> Dict[str, Any]:
+        """Extract document fields for a decoded message
+        
+        Uses the PGN's compiled extractor when the category matches its entry,
+        otherwise the generic field list.
+        """
+        entry = self._entries.get(data.PGN)
+        if entry is not None and entry.extractor is not None and entry.category == category:
+            return entry.extractor(data)
+        return extract_generic_fields(data)
+    
+    def pgns(self) -> List[int]:
+        """All registered PGNs"""
+        return list(self._entries)
+    
+    def __contains__(self, pgn: int) -> bool:
+        return pgn in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def build_default_registry(categories, pgn_config: Optional[Dict[str, Any]] = None) -> PGNRegistry:
+    """Build the registry with the built-in PGN table plus config-registered PGNs"""
+    registry = PGNRegistry(categories)
+    for pgn, (name, category_name, field_spec) in DEFAULT_PGNS.items():
+        registry.register(pgn, category_name, name=name, fields=field_spec)
+    registry.register_from_config(pgn_config)
+    return registry
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Priority Lanes - Bounded multi-lane queue served strictly by priority
+
+Used for inbound and outbound node messages (lanes by NodeMessage Priority)
+and outbound CAN frames (lanes by the 3 CAN priority bits), so steering and
+emergency work never waits behind telemetry or bulk traffic queued before it.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+# What put() does when a lane is full
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_BLOCK = "block"  # Wait for space (up to the put timeout), then drop the new item
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST, OVERFLOW_BLOCK)
+
+
+class PriorityLanes:
+    """
+    Bounded lanes, lane 0 highest priority
+    
+    Features:
+    - FIFO within a lane, strict priority between lanes
+    - Per-lane capacity with an overflow policy: drop the oldest entry (default,
+      never blocks the producer), drop the new entry, or block with a timeout
+    - Consumers can be restricted to a range of lanes (min_lane/max_lane), so a
+      worker can own the urgent lanes and is never busy with bulk items
+    - Per-lane queueing delay (mean/max) and drop counters for status reporting
+    """
+    
+    def __init__(self, lanes: int, capacity: int = 256, name: str = "lanes", overflow: str = OVERFLOW_DROP_OLDEST):
+        """
+        Args:
+            lanes: Number of lanes (0 = highest priority)
+            capacity: Maximum queued entries per lane
+            name: Name used in status output
+            overflow: Full-lane policy (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST or OVERFLOW_BLOCK)
+        """
+        if lanes < 1 or capacity < 1:
+            raise ValueError(f"PriorityLanes needs lanes >= 1 and capacity >= 1, got {lanes}, {capacity}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r}, expected one of {OVERFLOW_POLICIES}")
+        self.name = name
+        self.capacity = capacity
+        self.overflow = overflow
+        self._lanes: List[deque] = [deque() for _ in range(lanes)]
+        self._cond = threading.Condition(threading.Lock())
+        
+        # Per-lane counters
+        self.enqueued = [0] * lanes
+        self.dropped = [0] * lanes
+        self.blocked = [0] * lanes
+        self.served = [0] * lanes
+        self.wait_total = [0.0] * lanes
+        self.wait_max = [0.0] * lanes
+    
+    def put(self, item: Any, lane: int, timeout: Optional[float] = None) -> bool:
+        """Queue an item on a lane (clamped to the valid range)
+        
+        Args:
+            item: Item to queue
+            lane: Lane number
+            timeout: Seconds to wait for space with OVERFLOW_BLOCK (None waits forever)
+        
+        Returns:
+            bool: True if stored without dropping, False if an entry (the lane's oldest or this one) was dropped
+        """
+        lane = min(max(lane, 0), len(self._lanes) - 1)
+        with self._cond:
+            queue = self._lanes[lane]
+            stored_cleanly = True
+            if len(queue) >= self.capacity:
+                if self.overflow == OVERFLOW_DROP_OLDEST:
+                    queue.popleft()
+                    self.dropped[lane] += 1
+                    stored_cleanly = False
+                elif self.overflow == OVERFLOW_DROP_NEWEST:
+                    self.dropped[lane] += 1
+                    return False
+                else:
+                    self.blocked[lane] += 1
+                    if not self._cond.wait_for(lambda: len(queue) < self.capacity, timeout):
+                        self.dropped[lane] += 1
+                        return False
+            queue.append((time.monotonic(), item))
+            self.enqueued[lane] += 1
+            # Consumers wait on different lane ranges, so wake them all
+            self._cond.notify_all()
+            return stored_cleanly
+    
+    def _first_ready(self, min_lane: int, max_lane: int) -> int:
+        for lane in range(min_lane, max_lane + 1):
+            if self._lanes[lane]:
+                return lane
+        return -1
+    
+    def get(self, timeout: Optional[float] = None, max_lane: Optional[int] = None, min_lane: int = 0) -> Optional[Any]:
+        """Remove and return the oldest item of the highest-priority non-empty lane
+        
+        Args:
+            timeout: Seconds to wait for an item (None waits forever)
+            max_lane: Only serve lanes min_lane..max_lane (default: up to the last lane)
+            min_lane: First lane served (default: 0)
+        
+        Returns:
+            The item, or None if the timeout expires
+        """
+        max_lane = len(self._lanes) - 1 if max_lane is None else min(max_lane, len(self._lanes) - 1)
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._first_ready(min_lane, max_lane) >= 0, timeout):
+                return None
+            lane = self._first_ready(min_lane, max_lane)
+            queued_at, item = self._lanes[lane].popleft()
+            if self.overflow == OVERFLOW_BLOCK:
+                self._cond.notify_all()  # Wake producers waiting for space
+            waited = time.monotonic() - queued_at
+            self.served[lane] += 1
+            self.wait_total[lane] += waited
+            if waited > self.wait_max[lane]:
+                self.wait_max[lane] = waited
+            return item
+    
+    def __len__(self) -> int:
+        with self._cond:
+            return sum(len(queue) for queue in self._lanes)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-lane depth, drop and queueing delay counters"""
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "overflow": self.overflow,
+                "lanes": [
+                    {
+                        "lane": lane,
+                        "depth": len(queue),
+                        "enqueued": self.enqueued[lane],
+                        "served": self.served[lane],
+                        "dropped": self.dropped[lane],
+                        "blocked": self.blocked[lane],
+                        "mean_wait_ms": round(1000 * self.wait_total[lane] / self.served[lane], 3) if self.served[lane] else 0.0,
+                        "max_wait_ms": round(1000 * self.wait_max[lane], 3)
+                    }
+                    for lane, queue in enumerate(self._lanes)
+                ]
+            }
+
+
+class PendingItem:
+    """Queued work item the producer can wait on until a consumer completes it"""
+    __slots__ = ("item", "error", "_done")
+    
+    def __init__(self, item: Any):
+        self.item = item
+        self.error: Optional[Exception] = None
+        self._done = threading.Event()
+    
+    def complete(self, error: Optional[Exception] = None):
+        """Mark the item processed (with the exception if processing failed)"""
+        self.error = error
+        self._done.set()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until completed; False if the timeout expired first"""
+        return self._done.wait(timeout)
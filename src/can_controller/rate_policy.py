@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Rate Policy - Per-PGN / per-source decimation for CAN data sinks
+
+Each sink (DB, subscriber stream, Master Core stream) gets its own SinkDecimator
+so rapid-update PGNs can be thinned differently for storage and for live views.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# Sinks that decimation policies can target
+SINKS = ("db", "subscribers", "master_core")
+
+MODE_EVERY_NTH = "every_nth"
+MODE_MAX_RATE = "max_rate"
+MODE_LATEST = "latest_per_interval"
+
+
+@dataclass(frozen=True)
+class DecimationPolicy:
+    """Decimation policy for one PGN (or PGN + source)
+    
+    Modes:
+        every_nth: forward one of every n frames
+        max_rate: forward at most hz frames per second (excess frames dropped)
+        latest_per_interval: forward only the newest frame of every interval seconds
+            (held frames are released by SinkDecimator.pop_due())
+    """
+    mode: str
+    n: int = 1
+    interval: float = 0.0
+    
+    @classmethod
+    def from_config(cls, policy_config: Dict[str, Any]) -> "DecimationPolicy":
+        """Build a policy from {"mode": ..., "n": ..., "hz": ..., "interval": ...}"""
+        mode = policy_config.get("mode", MODE_MAX_RATE)
+        if mode == MODE_EVERY_NTH:
+            n = int(policy_config.get("n", 1))
+            if n < 1:
+                raise ValueError(f"every_nth needs n >= 1, got {n}")
+            return cls(mode, n=n)
+        if mode in (MODE_MAX_RATE, MODE_LATEST):
+            if "hz" in policy_config:
+                interval = 1.0 / float(policy_config["hz"])
+            else:
+                interval = float(policy_config.get("interval", 1.0))
+            if interval <= 0:
+                raise ValueError(f"{mode} needs a positive interval/hz")
+            return cls(mode, interval=interval)
+        raise ValueError(f"Unknown decimation mode '{mode}'")
+
+
+class SinkDecimator:
+    """
+    Decimation state for one sink
+    
+    Features:
+    - Policies per PGN, per PGN + source address, or a default for everything
+    - State kept per (PGN, source) so each device gets its own budget
+    - Passed / suppressed counters per PGN for status reporting
+    """
+    
+    def __init__(self, sink: str, policies: Dict[Tuple[int, Optional[int]], DecimationPolicy],
+                 default_policy: Optional[DecimationPolicy] = None):
+        """
+        Args:
+            sink: Sink name (db, subscribers, master_core)
+            policies: {(pgn, source or None): policy}
+            default_policy: Policy for PGNs without an explicit entry (None = pass everything)
+        """
+        self.sink = sink
+        self.policies = policies
+        self.default_policy = default_policy
+        self._state: Dict[Tuple[int, int], list] = {}  # (pgn, source) -> [count, last_forward, held_record]
+        self._lock = threading.Lock()
+        self.passed: Dict[int, int] = {}
+        self.suppressed: Dict[int, int] = {}
+    
+    @property
+    def has_held_frames(self) -> bool:
+        """True if any policy holds frames for later release"""
+        policies = list(self.policies.values()) + ([self.default_policy] if self.default_policy else [])
+        return any(policy.mode == MODE_LATEST for policy in policies)
+    
+    def _policy_for(self, pgn: int, source: int) -> Optional[DecimationPolicy]:
+        policy = self.policies.get((pgn, source))
+        if policy is None:
+            policy = self.policies.get((pgn, None), self.default_policy)
+        return policy
+    
+    def allow(self, record, now: float) -> bool:
+        """Decide whether a record goes to this sink now
+        
+        Args:
+            record: FrameRecord (needs pgn and source)
+            now: Monotonic time in seconds
+        
+        Returns:
+            bool: True to forward immediately, False if dropped or held for pop_due()
+        """
+        pgn = record.pgn
+        if pgn is None:
+            return True
+        policy = self._policy_for(pgn, record.source)
+        if policy is None:
+            return True
+        
+        with self._lock:
+            key = (pgn, record.source)
+            state = self._state.get(key)
+            if state is None:
+                state = self._state[key] = [0, None, None]
+            
+            if policy.mode == MODE_EVERY_NTH:
+                forward = state[0] % policy.n == 0
+                state[0] += 1
+            elif policy.mode == MODE_MAX_RATE:
+                forward = state[1] is None or now - state[1] >= policy.interval
+                if forward:
+                    state[1] = now
+            else:  # MODE_LATEST - hold newest, released at interval end
+                if state[1] is None:
+                    state[1] = now
+                if state[2] is not None:
+                    self.suppressed[pgn] = self.suppressed.get(pgn, 0) + 1
+                state[2] = record
+                return False
+            
+            if forward:
+                self.passed[pgn] = self.passed.get(pgn, 0) + 1
+            else:
+                self.suppressed[pgn] = self.suppressed.get(pgn, 0) + 1
+            return forward
+    
+    def pop_due(self, now: float) -> List[Any]:
+        """Release held records whose latest_per_interval window has elapsed"""
+        due = []
+        with self._lock:
+            for (pgn, source), state in self._state.items():
+                record = state[2]
+                if record is None:
+                    continue
+                policy = self._policy_for(pgn, source)
+                if policy is None or now - state[1] >= policy.interval:
+                    due.append(record)
+                    state[1] = now
+                    state[2] = None
+                    self.passed[pgn] = self.passed.get(pgn, 0) + 1
+        return due
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-PGN passed/suppressed counters"""
+        with self._lock:
+            return {
+                "policies": len(self.policies) + (1 if self.default_policy else 0),
+                "passed": {str(pgn): count for pgn, count in self.passed.items()},
+                "suppressed": {str(pgn): count for pgn, count in self.suppressed.items()}
+            }
+
+
+def build_sink_decimators(decimation_config: Optional[Dict[str, Any]]) -> Dict[str, SinkDecimator]:
+    """Build SinkDecimators from the decimation config section
+    
+    Config format:
+        {
+            "db": {
+                "default": {"mode": "max_rate", "hz": 1},
+                "pgns": {"129025": {"mode": "max_rate", "hz": 1},
+                         "127488:0": {"mode": "every_nth", "n": 10}}
+            },
+            "subscribers": {"pgns": {"129026": {"mode": "latest_per_interval", "interval": 0.2}}},
+            "master_core": {...}
+        }
+    
+    PGN keys are "<pgn>" or "<pgn>:<source address>". Sinks without config are
+    not decimated.
+    """
+    decimators = {}
+    for sink in SINKS:
+        sink_config = (decimation_config or {}).get(sink)
+        if not sink_config:
+            continue
+        policies = {}
+        for key, policy_config in sink_config.get("pgns", {}).items():
+            pgn_text, _, source_text = str(key).partition(":")
+            source = int(source_text) if source_text else None
+            policies[(int(pgn_text), source)] = DecimationPolicy.from_config(policy_config)
+        default_config = sink_config.get("default")
+        default_policy = DecimationPolicy.from_config(default_config) if default_config else None
+        decimators[sink] = SinkDecimator(sink, policies, default_policy)
+    return decimators
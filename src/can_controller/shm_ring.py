@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory Ring - Single-producer/multi-consumer frame ring for local readers
+
+The CAN controller publishes every processed frame (raw frame plus decoded
+fields) once into a multiprocessing.shared_memory segment; any number of local
+processes attach with SharedFrameRingReader and read at their own pace. The
+producer's cost does not depend on how many readers are attached.
+
+Layout (little-endian):
+    header (64 bytes): magic, version, header size, capacity, slot size,
+                       write sequence (u64, next sequence to be written)
+    slots (capacity x slot size): sequence (u64), packed RawFrame (22 bytes),
+                       PGN (u32), flags (u8), body length (u16), body
+                       (JSON of the decoded fields, or the error text)
+
+A slot's sequence is set to IN_PROGRESS while it is written and to the frame's
+sequence number afterwards. Readers check it before and after copying a slot,
+so a reader that was lapped by the producer detects the overrun and skips
+ahead instead of returning torn frames.
+"""
+
+import json
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, NamedTuple, Optional
+
+try:
+    from .frame_pipeline import RawFrame, RAW_FRAME_SIZE
+    from .wire_format import convert_bytes_to_list
+except ImportError:
+    from frame_pipeline import RawFrame, RAW_FRAME_SIZE
+    from wire_format import convert_bytes_to_list
+
+RING_MAGIC = b"N2KR"
+RING_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHII")  # magic, version, header size, capacity, slot size
+HEADER_SIZE = 64
+WRITE_SEQ_OFFSET = 16
+_SEQ = struct.Struct("<Q")
+_SLOT_META = struct.Struct("<IBH")  # PGN, flags, body length
+_META_OFFSET = _SEQ.size + RAW_FRAME_SIZE
+SLOT_BODY_OFFSET = _META_OFFSET + _SLOT_META.size
+
+IN_PROGRESS = 0xFFFFFFFFFFFFFFFF
+NO_PGN = 0xFFFFFFFF
+
+# Slot flags
+FLAG_DECODED = 0x01
+FLAG_ERROR = 0x02
+FLAG_TRUNCATED = 0x04  # Body did not fit the slot and was left out
+
+# Segments created by SharedFrameRing in this process (their resource tracker entry belongs to the producer)
+_produced_segments = set()
+
+
+class RingFrame(NamedTuple):
+    """One frame read from the ring"""
+    sequence: int
+    frame: RawFrame
+    pgn: Optional[int]
+    parsed_data: Optional[Dict[str, Any]]
+    error: Optional[str]
+    truncated: bool = False
+    
+    @property
+    def decoded(self) -> bool:
+        return self.parsed_data is not None and self.error is None
+
+
+class SharedFrameRing:
+    """
+    Producer side: creates the segment and publishes frames
+    
+    publish() is thread-safe (serialized by a lock), so every decode thread of
+    the node can publish; there is still a single producer process.
+    """
+    
+    def __init__(self, name: str, capacity: int = 4096, slot_size: int = 512):
+        """
+        Args:
+            name: Shared memory segment name (readers attach by this name)
+            capacity: Number of slots (frames kept before readers overrun)
+            slot_size: Bytes per slot, bounds the decoded-fields JSON per frame
+        """
+        if capacity < 1 or slot_size <= SLOT_BODY_OFFSET:
+            raise ValueError(f"SharedFrameRing needs capacity >= 1 and slot_size > {SLOT_BODY_OFFSET}, got {capacity}, {slot_size}")
+        self.name = name
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self._body_capacity = min(slot_size - SLOT_BODY_OFFSET, 0xFFFF)
+        size = HEADER_SIZE + capacity * slot_size
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a previous run that did not shut down cleanly
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _produced_segments.add(self._shm._name)
+        self._buf = self._shm.buf
+        _HEADER.pack_into(self._buf, 0, RING_MAGIC, RING_VERSION, HEADER_SIZE, capacity, slot_size)
+        _SEQ.pack_into(self._buf, WRITE_SEQ_OFFSET, 0)
+        for slot in range(capacity):
+            _SEQ.pack_into(self._buf, HEADER_SIZE + slot * slot_size, IN_PROGRESS)
+        self._write_seq = 0
+        self._lock = threading.Lock()
+        
+        # Counters
+        self.truncated = 0
+        self.started = time.time()
+    
+    def publish(self, record, channel: int = 0):
+        """Publish one processed frame
+        
+        Args:
+            record: FrameRecord (or any object with its frame fields, pgn, parsed_data and error)
+            channel: Capture channel index
+        """
+        flags = 0
+        body = b""
+        if record.error is not None:
+            flags |= FLAG_ERROR
+            body = str(record.error).encode('utf-8')
+        elif record.parsed_data is not None:
+            flags |= FLAG_DECODED
+            body = json.dumps(convert_bytes_to_list(record.parsed_data), separators=(",", ":"), default=str).encode('utf-8')
+        if len(body) > self._body_capacity:
+            flags |= FLAG_TRUNCATED
+            body = b""
+        packed = RawFrame.from_message(record, channel).pack()
+        pgn = record.pgn if record.pgn is not None else NO_PGN
+        
+        with self._lock:
+            if flags & FLAG_TRUNCATED:
+                self.truncated += 1
+            seq = self._write_seq
+            offset = HEADER_SIZE + (seq % self.capacity) * self.slot_size
+            buf = self._buf
+            _SEQ.pack_into(buf, offset, IN_PROGRESS)
+            buf[offset + _SEQ.size:offset + _META_OFFSET] = packed
+            _SLOT_META.pack_into(buf, offset + _META_OFFSET, pgn, flags, len(body))
+            buf[offset + SLOT_BODY_OFFSET:offset + SLOT_BODY_OFFSET + len(body)] = body
+            _SEQ.pack_into(buf, offset, seq)
+            self._write_seq = seq + 1
+            _SEQ.pack_into(buf, WRITE_SEQ_OFFSET, seq + 1)
+    
+    def close(self):
+        """Release and remove the segment (readers keep their mapping until they close)"""
+        self._buf = None
+        self._shm.close()
+        _produced_segments.discard(self._shm._name)
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ring geometry and publish counters"""
+        return {
+            "name": self.name,
+            "capacity": self.capacity,
+            "slot_size": self.slot_size,
+            "frames_published": self._write_seq,
+            "truncated": self.truncated,
+            "uptime": round(time.time() - self.started, 1)
+        }
+
+
+class SharedFrameRingReader:
+    """
+    Reader client: attaches to a ring published by the CAN controller
+    
+    Example:
+        with SharedFrameRingReader("can_controller_frames") as reader:
+            while True:
+                for item in reader.wait(timeout=1.0):
+                    print(item.sequence, hex(item.frame.arbitration_id), item.pgn, item.parsed_data)
+    
+    Readers never block the producer. A reader that falls more than a ring's
+    worth of frames behind skips ahead; the skipped frames are counted in lost.
+    """
+    
+    def __init__(self, name: str, from_oldest: bool = False, decode_fields: bool = True):
+        """
+        Args:
+            name: Shared memory segment name (shm_ring_name of the controller)
+            from_oldest: Start with the oldest frame still in the ring instead of the next new one
+            decode_fields: Parse the decoded-fields JSON into parsed_data
+        """
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13: attaching registers the segment with this process's resource
+            # tracker, which would unlink it (under the producer) when the reader exits.
+            # A ring produced by this same process keeps the producer's registration.
+            self._shm = shared_memory.SharedMemory(name=name)
+            if self._shm._name not in _produced_segments:
+                try:
+                    from multiprocessing import resource_tracker
+                    resource_tracker.unregister(self._shm._name, "shared_memory")
+                except Exception:
+                    pass
+        self._buf = self._shm.buf
+        magic, version, header_size, capacity, slot_size = _HEADER.unpack_from(self._buf, 0)
+        if magic != RING_MAGIC or version != RING_VERSION:
+            self.close()
+            raise ValueError(f"Shared memory {name!r} is not a version {RING_VERSION} frame ring")
+        self.name = name
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self.decode_fields = decode_fields
+        write_seq = self._write_seq()
+        self.next_seq = self._oldest_readable(write_seq) if from_oldest else write_seq
+        
+        # Counters
+        self.frames_read = 0
+        self.lost = 0
+        self.overruns = 0
+    
+    def _write_seq(self) -> int:
+        return _SEQ.unpack_from(self._buf, WRITE_SEQ_OFFSET)[0]
+    
+    def _oldest_readable(self, write_seq: int) -> int:
+        # One slot of margin: the oldest slot is the next one the producer overwrites
+        return max(0, write_seq - self.capacity + 1)
+    
+    def _skip_to(self, seq: int):
+        if seq > self.next_seq:
+            self.lost += seq - self.next_seq
+            self.overruns += 1
+            self.next_seq = seq
+    
+    def read(self, max_frames: int = 1024) -> List[RingFrame]:
+        """Return up to max_frames frames published since the last read (never blocks)"""
+        frames = []
+        buf = self._buf
+        write_seq = self._write_seq()
+        if write_seq < self.next_seq:
+            # Producer restarted with a fresh ring under the same name
+            self.next_seq = write_seq
+        if write_seq - self.next_seq > self.capacity:
+            self._skip_to(self._oldest_readable(write_seq))
+        while self.next_seq < write_seq and len(frames) < max_frames:
+            seq = self.next_seq
+            offset = HEADER_SIZE + (seq % self.capacity) * self.slot_size
+            if _SEQ.unpack_from(buf, offset)[0] != seq:
+                self._skip_to(self._oldest_readable(self._write_seq()))
+                continue
+            slot = bytes(buf[offset:offset + self.slot_size])
+            if _SEQ.unpack_from(buf, offset)[0] != seq:
+                # Overwritten while copying
+                self._skip_to(self._oldest_readable(self._write_seq()))
+                continue
+            frames.append(self._parse_slot(seq, slot))
+            self.next_seq = seq + 1
+        self.frames_read += len(frames)
+        return frames
+    
+    def wait(self, timeout: Optional[float] = None, max_frames: int = 1024, poll_interval: float = 0.001) -> List[RingFrame]:
+        """Like read(), but poll until at least one frame is available or the timeout expires"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            frames = self.read(max_frames)
+            if frames or (deadline is not None and time.monotonic() >= deadline):
+                return frames
+            time.sleep(poll_interval)
+    
+    def _parse_slot(self, seq: int, slot: bytes) -> RingFrame:
+        frame = RawFrame.unpack(slot[_SEQ.size:_META_OFFSET])
+        pgn, flags, body_length = _SLOT_META.unpack_from(slot, _META_OFFSET)
+        body = slot[SLOT_BODY_OFFSET:SLOT_BODY_OFFSET + body_length]
+        parsed_data = None
+        error = None
+        if flags & FLAG_ERROR:
+            error = body.decode('utf-8', errors='replace')
+        elif flags & FLAG_DECODED and self.decode_fields and body:
+            parsed_data = json.loads(body)
+        return RingFrame(seq, frame, None if pgn == NO_PGN else pgn, parsed_data, error, bool(flags & FLAG_TRUNCATED))
+    
+    def close(self):
+        """Detach from the segment (the producer owns and removes it)"""
+        self._buf = None
+        self._shm.close()
+    
+    def __enter__(self) -> "SharedFrameRingReader":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get read position and overrun counters"""
+        return {
+            "name": self.name,
+            "next_sequence": self.next_seq,
+            "behind": max(0, self._write_seq() - self.next_seq),
+            "frames_read": self.frames_read,
+            "lost": self.lost,
+            "overruns": self.overruns
+        }
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Signal Table - Latest decoded value per (PGN, source, instance, field)
+
+Lets other nodes poll current values (heading, rudder angle, tank level) with
+the get_signals command instead of subscribing to the full frame stream or
+querying the database.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Document keys that describe the frame rather than a signal
+METADATA_KEYS = frozenset({"title", "pgn", "source", "dest", "timestamp", "error"})
+
+
+class SignalTable:
+    """
+    In-memory latest-value table
+    
+    Features:
+    - One row per (PGN, source, instance), updated in place on every decode
+    - Rows indexed by PGN so selector lookups don't scan the whole table
+    - Field selection and max-age filtering at query time
+    """
+    
+    def __init__(self):
+        self._rows: Dict[int, Dict[Tuple[int, Any], Dict[str, Any]]] = {}  # pgn -> (source, instance) -> row
+        self._lock = threading.Lock()
+        self.updates = 0
+    
+    def update(self, pgn: int, source: int, parsed_data: Dict[str, Any], received_at: Optional[float] = None):
+        """Store the signals of one extracted frame
+        
+        Args:
+            pgn: PGN of the frame
+            source: Source address
+            parsed_data: Extracted document (as sent to the DB)
+            received_at: Wall-clock receive time (defaults to now)
+        """
+        instance = parsed_data.get("instance")
+        with self._lock:
+            rows = self._rows.get(pgn)
+            if rows is None:
+                rows = self._rows[pgn] = {}
+            row = rows.get((source, instance))
+            if row is None:
+                row = rows[(source, instance)] = {"values": {}, "units": {}, "timestamp": None, "received_at": 0.0, "updates": 0}
+            values = row["values"]
+            units = row["units"]
+            for key, value in parsed_data.items():
+                if key in METADATA_KEYS:
+                    continue
+                if key.startswith("unit"):
+                    units[key] = value
+                else:
+                    values[key] = value
+            row["timestamp"] = parsed_data.get("timestamp")
+            row["received_at"] = received_at if received_at is not None else time.time()
+            row["updates"] += 1
+            self.updates += 1
+    
+    def query(self, selectors: Optional[Iterable[Dict[str, Any]]] = None, max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Return the latest values matching the selectors
+        
+        Args:
+            selectors: [{"pgn": int, "source": int (optional), "instance": any (optional),
+                "fields": [names] (optional)}]. None/empty returns every row.
+            max_age: Skip rows not updated within this many seconds
+        
+        Returns:
+            List of {"pgn", "source", "instance", "timestamp", "age", "values", "units"}
+        """
+        now = time.time()
+        results = []
+        with self._lock:
+            for selector in (selectors or [{}]):
+                pgn = selector.get("pgn")
+                pgns = [int(pgn)] if pgn is not None else list(self._rows.keys())
+                fields = selector.get("fields")
+                for row_pgn in pgns:
+                    for (source, instance), row in self._rows.get(row_pgn, {}).items():
+                        if "source" in selector and selector["source"] != source:
+                            continue
+                        if "instance" in selector and selector["instance"] != instance:
+                            continue
+                        age = now - row["received_at"]
+                        if max_age is not None and age > max_age:
+                            continue
+                        values = row["values"]
+                        if fields:
+                            values = {field: values[field] for field in fields if field in values}
+                        results.append({
+                            "pgn": row_pgn,
+                            "source": source,
+                            "instance": instance,
+                            "timestamp": row["timestamp"],
+                            "age": round(age, 3),
+                            "values": dict(values),
+                            "units": dict(row["units"])
+                        })
+        return results
+    
+    def clear(self):
+        """Drop all rows"""
+        with self._lock:
+            self._rows.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get row and update counters"""
+        with self._lock:
+            return {
+                "pgns": len(self._rows),
+                "rows": sum(len(rows) for rows in self._rows.values()),
+                "updates": self.updates
+            }
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Subscriptions - Filtered data subscriptions with a PGN index and leases
+
+Each subscriber has a filter spec (PGNs, categories, source addresses, field
+projection). Subscriptions with a PGN set are indexed by PGN and the rest kept
+in a wildcard list, so matching a frame only looks at subscribers that can
+want its PGN. The index is rebuilt (copy-on-write) on subscribe/unsubscribe,
+which keeps the per-frame path lock-free.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+ALL_FIELDS = "*"
+
+# Cached candidate lists per PGN (the cache is dropped on every change)
+MAX_CACHED_PGNS = 4096
+
+
+class Subscription:
+    """One subscriber's compiled filter"""
+    __slots__ = ("subscriber", "pgns", "categories", "sources", "fields", "include_undecoded",
+                 "lease", "expires_at", "delivered")
+    
+    def __init__(self, subscriber: str, pgns: Optional[frozenset] = None, categories: Optional[frozenset] = None,
+                 sources: Optional[frozenset] = None, fields: Optional[Tuple[str, ...]] = None,
+                 include_undecoded: bool = True, lease: Optional[float] = None):
+        self.subscriber = subscriber
+        self.pgns = pgns
+        self.categories = categories
+        self.sources = sources
+        self.fields = fields
+        self.include_undecoded = include_undecoded
+        self.lease = lease
+        self.expires_at = time.monotonic() + lease if lease else None
+        self.delivered = 0
+    
+    @classmethod
+    def from_spec(cls, subscriber: str, spec: Dict[str, Any], default_lease: Optional[float] = None,
+                  category_resolver: Optional[Callable[[str], str]] = None) -> "Subscription":
+        """Compile a subscribe_data payload
+        
+        Args:
+            subscriber: Node name frames are sent to
+            spec: {"pgns": [int], "categories": [str], "sources": [int], "fields": [str] or ["*"],
+                "include_undecoded": bool, "lease": seconds} - all optional
+            default_lease: Lease (seconds) when the spec has none; None never expires
+            category_resolver: Maps a category name to the value records carry (raises ValueError if unknown)
+        
+        Raises:
+            ValueError/TypeError: Invalid spec
+        """
+        pgns = cls._int_set(spec.get("pgns"))
+        sources = cls._int_set(spec.get("sources"))
+        categories = spec.get("categories")
+        if categories is not None:
+            resolve = category_resolver or str
+            categories = frozenset(resolve(category) for category in categories)
+        fields = spec.get("fields")
+        if fields is not None:
+            fields = tuple(str(field) for field in fields)
+        # Without any filter the subscriber gets every frame, as before filters existed
+        filtered = pgns is not None or sources is not None or categories is not None
+        include_undecoded = bool(spec.get("include_undecoded", not filtered))
+        lease = spec.get("lease", default_lease)
+        lease = float(lease) if lease else None
+        if lease is not None and lease < 0:
+            raise ValueError(f"lease must be >= 0, got {lease}")
+        return cls(subscriber, pgns, categories, sources, fields, include_undecoded, lease)
+    
+    @staticmethod
+    def _int_set(values: Optional[Iterable[Any]]) -> Optional[frozenset]:
+        if values is None:
+            return None
+        if isinstance(values, (int, str)):
+            values = [values]
+        return frozenset(int(value) for value in values)
+    
+    def accepts(self, record) -> bool:
+        """Source, category and decode-state checks (the PGN is matched by the index)"""
+        if self.sources is not None and record.source not in self.sources:
+            return False
+        if not record.decoded:
+            return self.include_undecoded and self.categories is None
+        return self.categories is None or record.category_name in self.categories
+    
+    def payload(self, record) -> Dict[str, Any]:
+        """DATA payload for this subscriber: the raw frame, plus projected fields if requested"""
+        if self.fields is None:
+            return record.subscriber_payload
+        parsed_data = record.parsed_data if record.decoded else None
+        if parsed_data is None:
+            return record.subscriber_payload
+        if ALL_FIELDS in self.fields:
+            projected = parsed_data
+        else:
+            projected = {field: parsed_data[field] for field in self.fields if field in parsed_data}
+        return {"can_data": record.can_message_payload, "parsed_data": projected}
+    
+    def describe(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Filter and counters as reported in status / the subscribe response"""
+        now = time.monotonic() if now is None else now
+        return {
+            "subscriber": self.subscriber,
+            "pgns": sorted(self.pgns) if self.pgns is not None else None,
+            "categories": sorted(self.categories) if self.categories is not None else None,
+            "sources": sorted(self.sources) if self.sources is not None else None,
+            "fields": list(self.fields) if self.fields is not None else None,
+            "include_undecoded": self.include_undecoded,
+            "lease": self.lease,
+            "expires_in": round(self.expires_at - now, 1) if self.expires_at is not None else None,
+            "delivered": self.delivered
+        }
+
+
+class SubscriptionIndex:
+    """
+    Subscriptions by subscriber name, indexed by PGN
+    
+    Features:
+    - One subscription per subscriber; subscribing again replaces the filter and renews the lease
+    - Per-PGN candidate lists (PGN subscribers + wildcard subscribers) cached on first use
+    - Leases expire lazily on the next match() after their deadline
+    """
+    
+    def __init__(self, default_lease: Optional[float] = None, category_resolver: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            default_lease: Lease (seconds) for subscriptions that do not ask for one; None never expires
+            category_resolver: See Subscription.from_spec()
+        """
+        self.default_lease = default_lease
+        self.category_resolver = category_resolver
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._lock = threading.Lock()
+        # (PGN -> subscriptions, wildcard subscriptions, PGN -> candidate cache), replaced as a whole
+        self._index: Tuple[Dict[int, Tuple[Subscription, ...]], Tuple[Subscription, ...], Dict[int, Tuple[Subscription, ...]]] = ({}, (), {})
+        self._next_expiry: Optional[float] = None
+        self.expired = 0
+    
+    def subscribe(self, subscriber: str, spec: Optional[Dict[str, Any]] = None) -> Subscription:
+        """Add or replace a subscriber's subscription (raises ValueError/TypeError on an invalid spec)"""
+        subscription = Subscription.from_spec(subscriber, spec or {}, self.default_lease, self.category_resolver)
+        with self._lock:
+            self._subscriptions[subscriber] = subscription
+            self._rebuild()
+        return subscription
+    
+    def unsubscribe(self, subscriber: str) -> bool:
+        """Remove a subscriber; False if it was not subscribed"""
+        with self._lock:
+            if self._subscriptions.pop(subscriber, None) is None:
+                return False
+            self._rebuild()
+            return True
+    
+    def _rebuild(self):
+        by_pgn: Dict[int, List[Subscription]] = {}
+        wildcard = []
+        for subscription in self._subscriptions.values():
+            if subscription.pgns is None:
+                wildcard.append(subscription)
+            else:
+                for pgn in subscription.pgns:
+                    by_pgn.setdefault(pgn, []).append(subscription)
+        self._index = ({pgn: tuple(subscriptions) for pgn, subscriptions in by_pgn.items()}, tuple(wildcard), {})
+        deadlines = [s.expires_at for s in self._subscriptions.values() if s.expires_at is not None]
+        self._next_expiry = min(deadlines) if deadlines else None
+    
+    def expire(self, now: Optional[float] = None) -> List[str]:
+        """Remove subscriptions whose lease has run out; returns their subscriber names"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            expired = [name for name, s in self._subscriptions.items() if s.expires_at is not None and s.expires_at <= now]
+            for name in expired:
+                del self._subscriptions[name]
+            self.expired += len(expired)
+            if expired:
+                self._rebuild()
+            return expired
+    
+    def candidates(self, pgn: int) -> Tuple[Subscription, ...]:
+        """Subscriptions that may want frames of a PGN (before source/category checks)"""
+        by_pgn, wildcard, cache = self._index
+        candidates = cache.get(pgn)
+        if candidates is None:
+            candidates = by_pgn.get(pgn, ()) + wildcard
+            if len(cache) < MAX_CACHED_PGNS:
+                cache[pgn] = candidates
+        return candidates
+    
+    def match(self, record, pgn: int) -> List[Subscription]:
+        """Subscriptions a frame should be delivered to"""
+        next_expiry = self._next_expiry
+        if next_expiry is not None and time.monotonic() >= next_expiry:
+            self.expire()
+        return [subscription for subscription in self.candidates(pgn) if subscription.accepts(record)]
+    
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+    
+    def __contains__(self, subscriber: str) -> bool:
+        return subscriber in self._subscriptions
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get subscriptions and index counters"""
+        now = time.monotonic()
+        with self._lock:
+            by_pgn, wildcard, _ = self._index
+            return {
+                "count": len(self._subscriptions),
+                "indexed_pgns": len(by_pgn),
+                "wildcard": len(wildcard),
+                "expired": self.expired,
+                "subscriptions": [subscription.describe(now) for subscription in self._subscriptions.values()]
+            }
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Transport Protocol - ISO 11783 / J1939 TP reassembly (BAM and RTS/CTS)
+
+Messages longer than 8 bytes that are not fast packets are sent with the
+transport protocol: a TP.CM frame (PGN 60416) announces the size, packet count
+and PGN of the message, and TP.DT frames (PGN 60160) carry 7 data bytes each
+with a 1-based sequence number. BAM transfers are broadcast; RTS/CTS transfers
+are addressed and are reassembled passively from the data frames on the bus.
+"""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TP_CM_PGN = 60416  # 0xEC00 Connection management
+TP_DT_PGN = 60160  # 0xEB00 Data transfer
+
+TP_CM_RTS = 16
+TP_CM_CTS = 17
+TP_CM_EOM_ACK = 19
+TP_CM_BAM = 32
+TP_CM_ABORT = 255
+
+MAX_TP_MESSAGE_LENGTH = 1785  # 255 packets * 7 bytes
+TP_DT_DATA = 7
+
+
+class _TPSession:
+    """In-progress transport protocol transfer"""
+    __slots__ = ("pgn", "buffer", "length", "packets", "next_sequence", "last_activity", "broadcast")
+    
+    def __init__(self, pgn: int, length: int, packets: int, now: float, broadcast: bool):
+        self.pgn = pgn
+        self.buffer = bytearray(length)  # Sized to the announced length (bounded by MAX_TP_MESSAGE_LENGTH)
+        self.length = length
+        self.packets = packets
+        self.next_sequence = 1
+        self.last_activity = now
+        self.broadcast = broadcast
+
+
+class TransportProtocolManager:
+    """
+    Reassembles J1939 transport protocol transfers from many sources concurrently
+    
+    Features:
+    - One session per (source, destination), as in the protocol itself
+    - BAM and RTS/CTS (connection mode) transfers, aborts honoured
+    - Memory bounded per session (announced size, max 1785 bytes) and by max_sessions
+    - Sessions evicted after timeout seconds without a data frame
+    """
+    
+    def __init__(self, max_sessions: int = 64, timeout: float = 1.25):
+        """
+        Args:
+            max_sessions: Maximum concurrent transfers (oldest evicted beyond this)
+            timeout: Seconds without activity before a transfer is dropped
+        """
+        self.max_sessions = max(1, int(max_sessions))
+        self.timeout = float(timeout)
+        self._sessions: Dict[Tuple[int, int], _TPSession] = {}
+        self._last_expiry_check = 0.0
+        
+        # Counters
+        self.completed = 0
+        self.aborted = 0
+        self.restarted = 0  # New announcement before the previous transfer completed
+        self.out_of_order = 0
+        self.timed_out = 0
+        self.evicted = 0
+        self.orphan_frames = 0
+        self.invalid = 0
+    
+    @staticmethod
+    def handles(pgn: int) -> bool:
+        """True for TP.CM and TP.DT frames"""
+        return pgn == TP_CM_PGN or pgn == TP_DT_PGN
+    
+    def _expire(self, now: float):
+        """Drop transfers idle for longer than the timeout (checked at most every timeout/2 seconds)"""
+        if now - self._last_expiry_check < self.timeout / 2:
+            return
+        self._last_expiry_check = now
+        for key in [key for key, session in self._sessions.items() if now - session.last_activity > self.timeout]:
+            del self._sessions[key]
+            self.timed_out += 1
+    
+    def _open(self, key: Tuple[int, int], data: bytes, now: float, broadcast: bool):
+        length = data[1] | (data[2] << 8)
+        packets = data[3]
+        pgn = data[5] | (data[6] << 8) | (data[7] << 16)
+        if length <= 8 or length > MAX_TP_MESSAGE_LENGTH or packets != (length + TP_DT_DATA - 1) // TP_DT_DATA:
+            self.invalid += 1
+            return
+        if key in self._sessions:
+            self.restarted += 1
+        elif len(self._sessions) >= self.max_sessions:
+            oldest = min(self._sessions, key=lambda k: self._sessions[k].last_activity)
+            del self._sessions[oldest]
+            self.evicted += 1
+        self._sessions[key] = _TPSession(pgn, length, packets, now, broadcast)
+    
+    def feed(self, pgn: int, source: int, dest: int, data: bytes, now: float) -> Optional[Tuple[int, bytes]]:
+        """Add one TP.CM or TP.DT frame
+        
+        Args:
+            pgn: TP_CM_PGN or TP_DT_PGN
+            source: Source address
+            dest: Destination address (255 for BAM)
+            data: 8-byte CAN payload
+            now: Monotonic time in seconds
+        
+        Returns:
+            (pgn, payload) of the transported message when this frame completes it, else None
+        """
+        if len(data) < 8:
+            self.invalid += 1
+            return None
+        self._expire(now)
+        key = (source, dest)
+        
+        if pgn == TP_CM_PGN:
+            control = data[0]
+            if control == TP_CM_BAM:
+                self._open(key, data, now, broadcast=True)
+            elif control == TP_CM_RTS:
+                self._open(key, data, now, broadcast=False)
+            elif control == TP_CM_ABORT:
+                # Abort may come from either side of the connection
+                for abort_key in (key, (dest, source)):
+                    if self._sessions.pop(abort_key, None) is not None:
+                        self.aborted += 1
+            # CTS and EndOfMsgAck only steer the sender; data frames carry everything we need
+            return None
+        
+        session = self._sessions.get(key)
+        if session is None:
+            self.orphan_frames += 1
+            return None
+        sequence = data[0]
+        if sequence != session.next_sequence:
+            if sequence < session.next_sequence:
+                # RTS/CTS senders may retransmit packets the receiver asked for again
+                session.last_activity = now
+                return None
+            del self._sessions[key]
+            self.out_of_order += 1
+            return None
+        
+        offset = (sequence - 1) * TP_DT_DATA
+        chunk = data[1:1 + min(TP_DT_DATA, session.length - offset)]
+        session.buffer[offset:offset + len(chunk)] = chunk
+        session.next_sequence += 1
+        session.last_activity = now
+        if sequence < session.packets:
+            return None
+        
+        del self._sessions[key]
+        self.completed += 1
+        return session.pgn, bytes(session.buffer)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get reassembly counters"""
+        return {
+            "active_sessions": len(self._sessions),
+            "completed": self.completed,
+            "aborted": self.aborted,
+            "restarted": self.restarted,
+            "out_of_order": self.out_of_order,
+            "timed_out": self.timed_out,
+            "evicted": self.evicted,
+            "orphan_frames": self.orphan_frames,
+            "invalid": self.invalid
+        }
+
+
+def build_transport_protocol_manager(tp_config: Optional[Dict[str, Any]]) -> Optional[TransportProtocolManager]:
+    """Build a TransportProtocolManager from the transport_protocol config section
+    
+    Config format:
+        {"enabled": true, "max_sessions": 64, "timeout": 1.25}
+    
+    Returns:
+        TransportProtocolManager, or None if disabled
+    """
+    tp_config = tp_config or {}
+    if not tp_config.get("enabled", True):
+        return None
+    return TransportProtocolManager(
+        max_sessions=tp_config.get("max_sessions", 64),
+        timeout=tp_config.get("timeout", 1.25)
+    )
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Wire Format - JSON and compact binary encodings of the node message envelope
+
+JSON stays the default and is what every peer understands. The binary format
+is a fixed 3-byte struct header (0xC1 'N' magic + version) followed by the
+envelope as msgpack, so raw CAN payloads travel as bytes instead of JSON lists
+of ints. 0xC1 never starts a JSON document or a msgpack value, so receivers
+tell the formats apart from the first byte and always accept both.
+
+A batch envelope ({"type": "batch", "messages": [...]}) carries several
+messages for the same peer in one datagram. It is assembled from the already
+encoded messages, so batching never serializes a message twice.
+
+msgpack is optional; without it only JSON is sent and received.
+"""
+
+import json
+import struct
+from typing import Any, Dict, List, Tuple
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+WIRE_JSON = "json"
+WIRE_MSGPACK = "msgpack"
+WIRE_BATCH = "batch"  # Batch envelopes (advertised like a format, in either encoding)
+
+BINARY_MAGIC = b"\xc1N"
+BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct("<2sB")
+
+# Largest UDP payload (IPv4); receive buffers must hold a full batch
+MAX_DATAGRAM_SIZE = 65507
+
+
+def supported_formats() -> Tuple[str, ...]:
+    """Formats this process can decode beyond plain JSON (advertised to peers)"""
+    return (WIRE_MSGPACK, WIRE_BATCH) if MSGPACK_AVAILABLE else (WIRE_BATCH,)
+
+
+def convert_bytes_to_list(obj: Any) -> Any:
+    """Recursively convert bytes objects to lists for JSON serialization"""
+    if isinstance(obj, (bytes, bytearray)):
+        return list(obj)
+    elif isinstance(obj, dict):
+        return {key: convert_bytes_to_list(value) for key, value in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [convert_bytes_to_list(item) for item in obj]
+    else:
+        return obj
+
+
+def encode_envelope(envelope: Dict[str, Any], wire_format: str = WIRE_JSON) -> bytes:
+    """Encode a message envelope dict as one datagram
+    
+    Args:
+        envelope: Serialized NodeMessage fields (payload may contain bytes)
+        wire_format: WIRE_JSON or WIRE_MSGPACK
+    
+    Raises:
+        ImportError: If WIRE_MSGPACK is requested but msgpack is not installed
+    """
+    if wire_format == WIRE_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise ImportError("msgpack is required for the binary wire format")
+        return _BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION) + msgpack.packb(envelope, use_bin_type=True)
+    return json.dumps(convert_bytes_to_list(envelope)).encode('utf-8')
+
+
+def encode_batch(header: Dict[str, Any], messages: List[bytes], wire_format: str = WIRE_JSON) -> bytes:
+    """Join messages encoded by encode_envelope() into one batch datagram
+    
+    Args:
+        header: Batch envelope fields (without "messages")
+        messages: Encoded messages, all in wire_format
+        wire_format: WIRE_JSON or WIRE_MSGPACK
+    """
+    if wire_format == WIRE_MSGPACK:
+        packer = msgpack.Packer(use_bin_type=True)
+        parts = [_BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION), packer.pack_map_header(len(header) + 1)]
+        for key, value in header.items():
+            parts.append(packer.pack(key))
+            parts.append(packer.pack(value))
+        parts.append(packer.pack("messages"))
+        parts.append(packer.pack_array_header(len(messages)))
+        parts.extend(message[_BINARY_HEADER.size:] for message in messages)
+        return b"".join(parts)
+    return b"".join((json.dumps(header)[:-1].encode('utf-8'), b', "messages": [', b", ".join(messages), b"]}"))
+
+
+def batch_overhead(message_count: int) -> int:
+    """Upper bound of the bytes encode_batch() adds around its messages (header excluded)"""
+    return 32 + 2 * message_count
+
+
+def decode_envelope(data: bytes) -> Tuple[Dict[str, Any], str]:
+    """Decode a datagram produced by encode_envelope() (or any JSON peer)
+    
+    Returns:
+        Tuple of (envelope dict, wire format it arrived in)
+    
+    Raises:
+        ValueError: Unknown binary version, or binary datagram without msgpack installed
+    """
+    if data[:2] == BINARY_MAGIC:
+        _, version = _BINARY_HEADER.unpack_from(data)
+        if version != BINARY_VERSION:
+            raise ValueError(f"Unsupported binary wire format version {version}")
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("Received binary message but msgpack is not installed")
+        return msgpack.unpackb(data[_BINARY_HEADER.size:], raw=False), WIRE_MSGPACK
+    return json.loads(data.decode('utf-8')), WIRE_JSON
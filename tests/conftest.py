@@ -0,0 +1,6 @@
+"""Make the can_controller modules importable the way the node runs them directly"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "can_controller"))
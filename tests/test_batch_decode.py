@@ -0,0 +1,73 @@
+"""BatchDecoder output vs the per-frame decode path (nmea2000 decoder + PGN registry)"""
+
+import random
+from enum import Enum
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("nmea2000")
+
+from batch_decode import BATCH_LAYOUTS, BatchDecoder
+from n2k_decode import N2KFrameDecoder
+from pgn_registry import CATEGORY_COLLECTIONS, build_default_registry
+
+Categories = Enum("Categories", {name: name for name in [*CATEGORY_COLLECTIONS, "UNKNOWN"]})
+
+TIMESTAMP = "2026-01-01T00:00:00"
+
+
+@pytest.fixture(scope="module")
+def reference():
+    decoder = N2KFrameDecoder()
+    registry = build_default_registry(Categories)
+    
+    def decode(pgn, payload, source=0, dest=255):
+        document = registry.extract(decoder.decode(pgn, 2, source, dest, payload), registry.category_for(pgn))
+        document["timestamp"] = TIMESTAMP
+        return document
+    return decode
+
+
+@pytest.fixture(scope="module")
+def batch_decoder(reference):
+    return BatchDecoder(reference)
+
+
+def _edge_payloads(layout):
+    """Zero/all-ones frames plus every field at its minimum, maximum and 'not available' values"""
+    payloads = [bytes(8), b"\xff" * 8]
+    for field in layout:
+        for raw in (0, 1, (1 << field.bit_length) - 1, (1 << field.bit_length) - 2,
+                    (1 << (field.bit_length - 1)) - 1, 1 << (field.bit_length - 1)):
+            payloads.append((raw << field.bit_offset).to_bytes(8, "little"))
+    return payloads
+
+
+def test_every_layout_calibrates(batch_decoder):
+    assert sorted(batch_decoder.layouts) == sorted(BATCH_LAYOUTS)
+
+
+@pytest.mark.parametrize("pgn", sorted(BATCH_LAYOUTS))
+def test_batch_matches_per_frame_decode(batch_decoder, reference, pgn):
+    rng = random.Random(pgn)
+    payloads = _edge_payloads(BATCH_LAYOUTS[pgn]) + [bytes(rng.randrange(256) for _ in range(8)) for _ in range(500)]
+    sources = [rng.randrange(253) for _ in payloads]
+    dests = [255] * len(payloads)
+    documents = batch_decoder.decode(pgn, payloads, sources, dests, TIMESTAMP)
+    assert len(documents) == len(payloads)
+    for payload, source, document in zip(payloads, sources, documents):
+        if document is None:
+            with pytest.raises(ValueError):
+                reference(pgn, payload, source)
+            continue
+        expected = reference(pgn, payload, source)
+        assert list(document) == list(expected), payload.hex()
+        assert document == expected, payload.hex()
+
+
+def test_rejected_frames_are_counted(batch_decoder):
+    before = batch_decoder.frames_decoded + batch_decoder.frames_rejected
+    documents = batch_decoder.decode(127250, [bytes(8)] * 3, [1, 2, 3], [255] * 3, TIMESTAMP)
+    assert [document["source"] for document in documents] == [1, 2, 3]
+    assert batch_decoder.frames_decoded + batch_decoder.frames_rejected == before + 3
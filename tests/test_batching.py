@@ -0,0 +1,45 @@
+"""DatagramBatcher flush triggers"""
+
+import time
+
+from batching import DatagramBatcher
+
+
+def test_full_batch_is_ready_immediately():
+    batcher = DatagramBatcher(max_items=3, max_delay=10)
+    assert batcher.add("peer", b"a") == ([], True)
+    assert batcher.add("peer", b"b") == ([], False)
+    assert batcher.add("peer", b"c") == ([("peer", [b"a", b"b", b"c"])], False)
+    assert batcher.batches_full == 1 and len(batcher) == 0
+
+
+def test_destinations_are_batched_separately():
+    batcher = DatagramBatcher(max_items=2, max_delay=10)
+    batcher.add("a", b"1")
+    batcher.add("b", b"2")
+    assert batcher.add("a", b"3") == ([("a", [b"1", b"3"])], False)
+    assert batcher.drain() == [("b", [b"2"])]
+
+
+def test_size_limit_sends_pending_batch_first():
+    batcher = DatagramBatcher(max_items=100, max_delay=10, max_bytes=100)
+    batcher.add("peer", b"x" * 40)
+    ready, started = batcher.add("peer", b"y" * 40)
+    assert ready == [("peer", [b"x" * 40])] and started
+    assert batcher.batches_size_limit == 1
+
+
+def test_oversize_message_goes_out_alone():
+    batcher = DatagramBatcher(max_items=10, max_delay=10, max_bytes=50)
+    assert batcher.add("peer", b"z" * 60) == ([("peer", [b"z" * 60])], False)
+    assert batcher.oversize_messages == 1 and len(batcher) == 0
+
+
+def test_delay_expiry():
+    batcher = DatagramBatcher(max_items=10, max_delay=0.01)
+    batcher.add("peer", b"a")
+    assert batcher.pop_due() == []
+    started = time.monotonic()
+    assert batcher.wait_due(1.0) == [("peer", [b"a"])]
+    assert time.monotonic() - started < 0.5
+    assert batcher.get_stats()["batches_timeout"] == 1
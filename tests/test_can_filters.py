@@ -0,0 +1,21 @@
+"""build_can_filters: PGN allowlist, source specs and required transport PGNs"""
+
+from can_filters import build_can_filters
+
+
+def test_allowlist_combines_sources():
+    filters = build_can_filters({"pgn_allowlist": [127250, 59904], "source_addresses": [145]})
+    assert filters == [
+        {"can_id": (127250 << 8) | 145, "can_mask": (0x3FFFF << 8) | 0xFF, "extended": True},
+        {"can_id": (59904 << 8) | 145, "can_mask": (0x3FF00 << 8) | 0xFF, "extended": True},
+    ]
+
+
+def test_required_pgns_extend_allowlist():
+    filters = build_can_filters({"pgn_allowlist": [127250, 60160]}, required_pgns=(60416, 60160))
+    assert [f["can_id"] >> 8 for f in filters] == [127250, 60160, 60416]
+
+
+def test_required_pgns_without_allowlist():
+    assert build_can_filters({"pgn_allowlist": []}, required_pgns=(60416, 60160)) is None
+    assert build_can_filters(None, required_pgns=(60416, 60160)) is None
@@ -0,0 +1,99 @@
+"""FastPacketAssembler reassembly, session separation and error counters"""
+
+import pytest
+
+from fast_packet import DEFAULT_FAST_PACKET_PGNS, FastPacketAssembler, MAX_FAST_PACKET_LENGTH
+
+PGN = 129029
+
+
+def fast_packet_frames(payload: bytes, sequence_id: int = 0):
+    """Split a payload into fast-packet CAN frames (padded with 0xFF)"""
+    frames = [bytes([sequence_id << 5, len(payload)]) + payload[:6]]
+    for counter, offset in enumerate(range(6, len(payload), 7), start=1):
+        frames.append(bytes([(sequence_id << 5) | counter]) + payload[offset:offset + 7])
+    return [frame.ljust(8, b"\xff") for frame in frames]
+
+
+def feed_all(assembler, frames, source=1, now=0.0):
+    results = [assembler.feed(PGN, source, frame, now) for frame in frames]
+    assert all(result is None for result in results[:-1])
+    return results[-1]
+
+
+def test_reassembles_sequence():
+    payload = bytes(range(43))
+    assembler = FastPacketAssembler([PGN])
+    assert feed_all(assembler, fast_packet_frames(payload)) == payload
+    assert assembler.completed == 1
+    assert assembler.get_stats()["active_sessions"] == 0
+
+
+def test_single_frame_message():
+    assembler = FastPacketAssembler([PGN])
+    assert assembler.feed(PGN, 1, bytes([0, 4, 1, 2, 3, 4, 0xFF, 0xFF]), 0.0) == bytes([1, 2, 3, 4])
+
+
+def test_interleaved_sources_do_not_mix():
+    first, second = bytes(range(20)), bytes(range(100, 120))
+    assembler = FastPacketAssembler([PGN])
+    frames_a, frames_b = fast_packet_frames(first), fast_packet_frames(second)
+    results = []
+    for frame_a, frame_b in zip(frames_a, frames_b):
+        results.append(assembler.feed(PGN, 1, frame_a, 0.0))
+        results.append(assembler.feed(PGN, 2, frame_b, 0.0))
+    assert results[-2:] == [first, second]
+
+
+def test_out_of_order_and_orphan_frames_are_dropped():
+    frames = fast_packet_frames(bytes(range(30)))
+    assembler = FastPacketAssembler([PGN])
+    assembler.feed(PGN, 1, frames[0], 0.0)
+    assert assembler.feed(PGN, 1, frames[2], 0.0) is None
+    assert assembler.out_of_order == 1
+    assert assembler.feed(PGN, 1, frames[3], 0.0) is None
+    assert assembler.orphan_frames == 1
+
+
+def test_restart_counts_incomplete_sequence():
+    payload = bytes(range(30))
+    assembler = FastPacketAssembler([PGN])
+    assembler.feed(PGN, 1, fast_packet_frames(payload)[0], 0.0)
+    assert feed_all(assembler, fast_packet_frames(payload)) == payload
+    assert assembler.incomplete == 1
+
+
+def test_timeout_drops_stale_sequence():
+    frames = fast_packet_frames(bytes(range(30)))
+    assembler = FastPacketAssembler([PGN], timeout=0.5)
+    assembler.feed(PGN, 1, frames[0], 0.0)
+    assert assembler.feed(PGN, 1, frames[1], 1.0) is None
+    assert assembler.timed_out == 1
+
+
+def test_oldest_session_evicted_when_buffers_run_out():
+    assembler = FastPacketAssembler([PGN], max_sessions=1)
+    frames_a = fast_packet_frames(bytes(range(20)))
+    frames_b = fast_packet_frames(bytes(range(20, 40)))
+    assembler.feed(PGN, 1, frames_a[0], 0.0)
+    assert feed_all(assembler, frames_b, source=2, now=0.1) == bytes(range(20, 40))
+    assert assembler.evicted == 1
+
+
+def test_rejects_oversized_announcement():
+    assembler = FastPacketAssembler([PGN])
+    assert assembler.feed(PGN, 1, bytes([0, MAX_FAST_PACKET_LENGTH + 1, 0, 0, 0, 0, 0, 0]), 0.0) is None
+    assert assembler.invalid == 1
+
+
+def test_default_pgns_match_library():
+    pgns = pytest.importorskip("nmea2000.pgns")
+
+    def is_fast(name):
+        try:
+            return getattr(pgns, name)()
+        except Exception:  # PGN types the library can't describe (ISO 65240, Mixed 126976)
+            return False
+
+    library = {int(name[len("is_fast_pgn_"):]) for name in dir(pgns) if name.startswith("is_fast_pgn_") and is_fast(name)}
+    assert DEFAULT_FAST_PACKET_PGNS == library
@@ -0,0 +1,47 @@
+"""FrameHistory queries: filters, limit, paging cursor and reply size"""
+
+import json
+
+from frame_history import FrameHistory, MAX_QUERY_FRAMES
+from wire_format import MAX_DATAGRAM_SIZE
+
+
+def arbitration_id(pgn: int, source: int, priority: int = 2) -> int:
+    return (priority << 26) | (pgn << 8) | source
+
+
+def test_filters_oldest_first():
+    history = FrameHistory(capacity=16)
+    for i in range(10):
+        history.append(arbitration_id(127250 if i % 2 else 129025, 3 + i % 2), bytes([i]), timestamp=float(i))
+    frames, cursor = history.query(pgn=127250)
+    assert [frame["timestamp"] for frame in frames] == [1.0, 3.0, 5.0, 7.0, 9.0]
+    assert all(frame["source"] == 4 for frame in frames)
+    assert cursor is None
+    frames, _ = history.query(start=2.0, end=4.0)
+    assert [frame["data"] for frame in frames] == [[2], [3], [4]]
+
+
+def test_paging_cursor_after_wraparound():
+    history = FrameHistory(capacity=8)
+    for i in range(20):
+        history.append(arbitration_id(129025, 1), bytes([i]), timestamp=float(i))
+    pages = []
+    cursor = None
+    while True:
+        frames, cursor = history.query(limit=3, before=cursor)
+        pages.append([frame["data"][0] for frame in frames])
+        if cursor is None:
+            break
+    assert pages == [[17, 18, 19], [14, 15, 16], [12, 13]]
+
+
+def test_full_reply_fits_one_datagram():
+    history = FrameHistory(capacity=MAX_QUERY_FRAMES * 2)
+    for i in range(MAX_QUERY_FRAMES * 2):
+        history.append(0x1FFFFFFF, b"\xff" * 8, timestamp=1760563200.123456 + i)
+    frames, cursor = history.query()
+    assert len(frames) == MAX_QUERY_FRAMES
+    assert cursor is not None
+    reply = {"status": "success", "count": len(frames), "frames": frames, "truncated": True, "next": cursor}
+    assert len(json.dumps(reply).encode()) < MAX_DATAGRAM_SIZE
@@ -0,0 +1,79 @@
+"""Binary fast path vs N2K ASCII path of N2KFrameDecoder"""
+
+import random
+import struct
+
+import pytest
+
+pytest.importorskip("nmea2000")
+
+from n2k_decode import N2KFrameDecoder
+
+# Single-frame PGNs (heading, engine rapid, rudder, COG/SOG, wind, attitude, depth)
+SINGLE_FRAME_PGNS = [127250, 127488, 127245, 129026, 130306, 127257, 128267]
+
+
+def _fields(message):
+    if message is None:
+        return None
+    return [(field.id, field.value) for field in message.fields]
+
+
+def _outcome(decoder, *args, **kwargs):
+    """Decoded fields, or the error type (newer nmea2000 releases reject out-of-range values)"""
+    try:
+        return _fields(decoder.decode(*args, **kwargs))
+    except ValueError as e:
+        return type(e), str(e)
+
+
+@pytest.fixture(scope="module")
+def decoders():
+    binary = N2KFrameDecoder()
+    ascii_path = N2KFrameDecoder(binary_enabled=False)
+    assert binary.binary, "installed nmea2000 has no compatible binary entry point"
+    assert not ascii_path.binary
+    return binary, ascii_path
+
+
+def test_heading_decodes_in_wire_order(decoders):
+    binary, _ = decoders
+    payload = bytes.fromhex("001027ff7fff7ffc")
+    fields = dict(_fields(binary.decode(127250, 2, 1, 255, payload)))
+    assert fields["sid"] == 0
+    assert fields["heading"] == pytest.approx(1.0)
+    assert fields["deviation"] is None
+
+
+@pytest.mark.parametrize("pgn", SINGLE_FRAME_PGNS)
+def test_binary_matches_ascii(decoders, pgn):
+    binary, ascii_path = decoders
+    rng = random.Random(pgn)
+    for _ in range(50):
+        payload = bytes(rng.randrange(256) for _ in range(8))
+        assert _outcome(binary, pgn, 2, 35, 255, payload) == _outcome(ascii_path, pgn, 2, 35, 255, payload)
+
+
+def test_binary_matches_ascii_for_combined_payload(decoders):
+    binary, ascii_path = decoders
+    # GNSS position: SID, date, time, lat, lon, alt, type/method, integrity, SVs, HDOP, PDOP, geoidal separation, stations
+    payload = struct.pack("<BHIqqqBBBhhiB", 1, 20000, 36000 * 10000, int(52.1e16), int(4.3e16), int(12.5e6),
+                          0x40, 0xFC, 9, 120, 180, 4700, 0)
+    fields = _outcome(binary, 129029, 3, 35, 255, payload, already_combined=True)
+    assert dict(fields)["latitude"] == pytest.approx(52.1)
+    assert dict(fields)["longitude"] == pytest.approx(4.3)
+    assert fields == _outcome(ascii_path, 129029, 3, 35, 255, payload, already_combined=True)
+
+
+def test_decoder_errors_propagate():
+    class Boom(TypeError):
+        pass
+    
+    def failing(*args, **kwargs):
+        raise Boom("inside the decoder")
+    
+    decoder = N2KFrameDecoder()
+    decoder.decoder._call_decode_function = failing
+    with pytest.raises(Boom):
+        decoder.decode(127250, 2, 1, 255, bytes(8))
+    assert decoder.binary
@@ -0,0 +1,46 @@
+"""PriorityLanes ordering, lane ranges and overflow policies"""
+
+import threading
+
+from priority_lanes import OVERFLOW_BLOCK, OVERFLOW_DROP_NEWEST, OVERFLOW_DROP_OLDEST, PriorityLanes
+
+
+def test_strict_priority_and_fifo_within_lane():
+    lanes = PriorityLanes(3, 8)
+    for item, lane in [("low-1", 2), ("high-1", 0), ("mid-1", 1), ("high-2", 0), ("low-2", 2)]:
+        lanes.put(item, lane)
+    assert [lanes.get(timeout=0) for _ in range(5)] == ["high-1", "high-2", "mid-1", "low-1", "low-2"]
+    assert lanes.get(timeout=0) is None
+
+
+def test_lane_ranges_do_not_overlap():
+    lanes = PriorityLanes(5, 8)
+    lanes.put("critical", 1)
+    lanes.put("normal", 3)
+    assert lanes.get(timeout=0, min_lane=3) == "normal"
+    assert lanes.get(timeout=0, min_lane=3) is None
+    assert lanes.get(timeout=0, max_lane=2) == "critical"
+
+
+def test_drop_oldest_and_drop_newest():
+    oldest = PriorityLanes(1, 2, overflow=OVERFLOW_DROP_OLDEST)
+    newest = PriorityLanes(1, 2, overflow=OVERFLOW_DROP_NEWEST)
+    for item in (1, 2, 3):
+        oldest.put(item, 0)
+        newest.put(item, 0)
+    assert [oldest.get(timeout=0), oldest.get(timeout=0)] == [2, 3]
+    assert [newest.get(timeout=0), newest.get(timeout=0)] == [1, 2]
+    assert oldest.dropped == [1] and newest.dropped == [1]
+
+
+def test_block_waits_for_space_then_fails():
+    lanes = PriorityLanes(1, 1, overflow=OVERFLOW_BLOCK)
+    assert lanes.put("first", 0)
+    assert not lanes.put("second", 0, timeout=0.01)
+    assert lanes.dropped == [1] and lanes.blocked == [1]
+    
+    consumer = threading.Timer(0.05, lambda: lanes.get(timeout=0))
+    consumer.start()
+    assert lanes.put("third", 0, timeout=2)
+    consumer.join()
+    assert lanes.get(timeout=0) == "third"
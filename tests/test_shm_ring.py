@@ -0,0 +1,81 @@
+"""SharedFrameRing publish / SharedFrameRingReader read, overrun and flags"""
+
+import uuid
+
+import pytest
+
+from frame_record import FrameRecord
+from shm_ring import SharedFrameRing, SharedFrameRingReader
+
+
+def record(index: int, **fields) -> FrameRecord:
+    values = dict(arbitration_id=0x09F11200 | (index & 0xFF), data=bytes([index & 0xFF] * 8),
+                  timestamp=1000.0 + index, pgn=127250, parsed_data={"pgn": 127250, "heading": index})
+    values.update(fields)
+    return FrameRecord(**values)
+
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing(f"test_ring_{uuid.uuid4().hex[:12]}", capacity=8, slot_size=128)
+    yield ring
+    ring.close()
+
+
+def test_reader_sees_frames_published_after_attach(ring):
+    ring.publish(record(0))
+    with SharedFrameRingReader(ring.name) as reader:
+        assert reader.read() == []
+        ring.publish(record(1), channel=2)
+        ring.publish(record(2))
+        frames = reader.read()
+    assert [frame.sequence for frame in frames] == [1, 2]
+    first = frames[0]
+    assert first.decoded and first.pgn == 127250 and first.parsed_data == {"pgn": 127250, "heading": 1}
+    assert first.frame.arbitration_id == 0x09F11201 and first.frame.data == bytes([1] * 8)
+    assert first.frame.channel == 2 and first.frame.timestamp == 1001.0
+
+
+def test_from_oldest_reads_what_is_still_in_the_ring(ring):
+    for index in range(3):
+        ring.publish(record(index))
+    with SharedFrameRingReader(ring.name, from_oldest=True) as reader:
+        assert [frame.sequence for frame in reader.read()] == [0, 1, 2]
+
+
+def test_lapped_reader_skips_ahead_and_counts_lost_frames(ring):
+    with SharedFrameRingReader(ring.name) as reader:
+        for index in range(20):
+            ring.publish(record(index))
+        frames = reader.read()
+        assert [frame.sequence for frame in frames] == list(range(13, 20))
+        assert reader.lost == 13 and reader.overruns == 1
+        assert [frame.parsed_data["heading"] for frame in frames] == list(range(13, 20))
+
+
+def test_error_truncated_and_undecoded_frames(ring):
+    with SharedFrameRingReader(ring.name) as reader:
+        ring.publish(record(1, parsed_data=None, error="bad frame"))
+        ring.publish(record(2, parsed_data={"text": "x" * 500}))
+        ring.publish(record(3, parsed_data=None, pgn=None))
+        error, truncated, undecoded = reader.read()
+    assert error.error == "bad frame" and not error.decoded
+    assert truncated.truncated and truncated.parsed_data is None
+    assert undecoded.pgn is None and undecoded.parsed_data is None and undecoded.error is None
+    assert ring.get_stats()["truncated"] == 1
+
+
+def test_max_frames_and_wait_timeout(ring):
+    with SharedFrameRingReader(ring.name) as reader:
+        for index in range(5):
+            ring.publish(record(index))
+        assert len(reader.read(max_frames=2)) == 2
+        assert len(reader.wait(timeout=0.01)) == 3
+        assert reader.wait(timeout=0.01) == []
+        assert reader.get_stats()["behind"] == 0
+
+
+def test_reader_rejects_other_segments(ring):
+    ring._buf[0:4] = b"XXXX"
+    with pytest.raises(ValueError):
+        SharedFrameRingReader(ring.name)
@@ -0,0 +1,59 @@
+"""SubscriptionIndex matching, projection and leases"""
+
+from types import SimpleNamespace
+
+from subscriptions import SubscriptionIndex
+
+
+def frame(pgn=127250, source=1, category="NAVIGATION", parsed_data=None, decoded=True):
+    parsed_data = parsed_data if parsed_data is not None else {"pgn": pgn, "heading": 1.5, "deviation": 0.1}
+    return SimpleNamespace(pgn=pgn, source=source, category_name=category, decoded=decoded, parsed_data=parsed_data,
+                           can_message_payload={"id": pgn}, subscriber_payload={"can_data": {"id": pgn}})
+
+
+def test_pgn_source_and_category_filters():
+    index = SubscriptionIndex()
+    index.subscribe("heading", {"pgns": [127250], "sources": [1]})
+    index.subscribe("navigation", {"categories": ["NAVIGATION"]})
+    index.subscribe("everything")
+    assert {s.subscriber for s in index.match(frame(), 127250)} == {"heading", "navigation", "everything"}
+    assert {s.subscriber for s in index.match(frame(source=2), 127250)} == {"navigation", "everything"}
+    assert {s.subscriber for s in index.match(frame(pgn=130306, category="ENVIRONMENT"), 130306)} == {"everything"}
+
+
+def test_undecoded_frames_only_for_unfiltered_or_opted_in_subscribers():
+    index = SubscriptionIndex()
+    index.subscribe("filtered", {"pgns": [127250]})
+    index.subscribe("opted_in", {"pgns": [127250], "include_undecoded": True})
+    index.subscribe("everything")
+    undecoded = frame(decoded=False, parsed_data={})
+    assert {s.subscriber for s in index.match(undecoded, 127250)} == {"opted_in", "everything"}
+
+
+def test_field_projection():
+    index = SubscriptionIndex()
+    projected = index.subscribe("heading", {"fields": ["heading"]})
+    full = index.subscribe("all", {"fields": ["*"]})
+    raw = index.subscribe("raw")
+    record = frame()
+    assert projected.payload(record) == {"can_data": {"id": 127250}, "parsed_data": {"heading": 1.5}}
+    assert full.payload(record)["parsed_data"] == record.parsed_data
+    assert raw.payload(record) == record.subscriber_payload
+
+
+def test_resubscribe_replaces_filter_and_unsubscribe():
+    index = SubscriptionIndex()
+    index.subscribe("node", {"pgns": [127250]})
+    index.subscribe("node", {"pgns": [130306]})
+    assert len(index) == 1
+    assert index.match(frame(), 127250) == []
+    assert index.unsubscribe("node") and not index.unsubscribe("node")
+
+
+def test_leases_expire():
+    index = SubscriptionIndex(default_lease=30)
+    index.subscribe("leased")
+    index.subscribe("forever", {"lease": 0})
+    subscription = index.subscribe("short", {"lease": 5})
+    assert index.expire(now=subscription.expires_at + 1) == ["short"]
+    assert "leased" in index and "forever" in index and index.expired == 1
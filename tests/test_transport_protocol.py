@@ -0,0 +1,83 @@
+"""TransportProtocolManager BAM and RTS/CTS reassembly"""
+
+from transport_protocol import (TP_CM_ABORT, TP_CM_BAM, TP_CM_CTS, TP_CM_PGN, TP_CM_RTS, TP_DT_PGN,
+                                TransportProtocolManager)
+
+TRANSPORTED_PGN = 65260
+
+
+def announcement(control: int, payload: bytes, pgn: int = TRANSPORTED_PGN) -> bytes:
+    packets = (len(payload) + 6) // 7
+    return bytes([control, len(payload) & 0xFF, len(payload) >> 8, packets, 0xFF,
+                  pgn & 0xFF, (pgn >> 8) & 0xFF, pgn >> 16])
+
+
+def data_frames(payload: bytes):
+    return [(bytes([sequence]) + payload[offset:offset + 7]).ljust(8, b"\xff")
+            for sequence, offset in enumerate(range(0, len(payload), 7), start=1)]
+
+
+def test_bam_transfer():
+    payload = bytes(range(17))
+    manager = TransportProtocolManager()
+    assert manager.feed(TP_CM_PGN, 0x20, 255, announcement(TP_CM_BAM, payload), 0.0) is None
+    frames = data_frames(payload)
+    assert [manager.feed(TP_DT_PGN, 0x20, 255, frame, 0.0) for frame in frames[:-1]] == [None, None]
+    assert manager.feed(TP_DT_PGN, 0x20, 255, frames[-1], 0.0) == (TRANSPORTED_PGN, payload)
+    assert manager.completed == 1
+
+
+def test_rts_cts_transfer_with_retransmission():
+    payload = bytes(range(100, 120))
+    manager = TransportProtocolManager()
+    manager.feed(TP_CM_PGN, 0x20, 0x30, announcement(TP_CM_RTS, payload), 0.0)
+    manager.feed(TP_CM_PGN, 0x30, 0x20, bytes([TP_CM_CTS, 3, 1, 0xFF, 0xFF, 0xEC, 0xFE, 0x00]), 0.0)
+    frames = data_frames(payload)
+    manager.feed(TP_DT_PGN, 0x20, 0x30, frames[0], 0.0)
+    manager.feed(TP_DT_PGN, 0x20, 0x30, frames[0], 0.0)  # Retransmitted packet is ignored
+    manager.feed(TP_DT_PGN, 0x20, 0x30, frames[1], 0.0)
+    assert manager.feed(TP_DT_PGN, 0x20, 0x30, frames[2], 0.0) == (TRANSPORTED_PGN, payload)
+    assert manager.out_of_order == 0
+
+
+def test_concurrent_sessions_by_source():
+    first, second = bytes(range(10)), bytes(range(50, 60))
+    manager = TransportProtocolManager()
+    manager.feed(TP_CM_PGN, 1, 255, announcement(TP_CM_BAM, first), 0.0)
+    manager.feed(TP_CM_PGN, 2, 255, announcement(TP_CM_BAM, second, pgn=65261), 0.0)
+    results = []
+    for frame_a, frame_b in zip(data_frames(first), data_frames(second)):
+        results.append(manager.feed(TP_DT_PGN, 1, 255, frame_a, 0.0))
+        results.append(manager.feed(TP_DT_PGN, 2, 255, frame_b, 0.0))
+    assert results[-2:] == [(TRANSPORTED_PGN, first), (65261, second)]
+
+
+def test_abort_from_receiver_drops_session():
+    payload = bytes(range(20))
+    manager = TransportProtocolManager()
+    manager.feed(TP_CM_PGN, 0x20, 0x30, announcement(TP_CM_RTS, payload), 0.0)
+    manager.feed(TP_CM_PGN, 0x30, 0x20, bytes([TP_CM_ABORT, 1, 0xFF, 0xFF, 0xFF, 0xEC, 0xFE, 0x00]), 0.0)
+    assert manager.aborted == 1
+    assert manager.feed(TP_DT_PGN, 0x20, 0x30, data_frames(payload)[0], 0.0) is None
+    assert manager.orphan_frames == 1
+
+
+def test_missing_packet_and_timeout():
+    payload = bytes(range(20))
+    frames = data_frames(payload)
+    manager = TransportProtocolManager(timeout=0.5)
+    manager.feed(TP_CM_PGN, 1, 255, announcement(TP_CM_BAM, payload), 0.0)
+    assert manager.feed(TP_DT_PGN, 1, 255, frames[1], 0.0) is None
+    assert manager.out_of_order == 1
+    manager.feed(TP_CM_PGN, 1, 255, announcement(TP_CM_BAM, payload), 0.0)
+    assert manager.feed(TP_DT_PGN, 1, 255, frames[0], 1.0) is None
+    assert manager.timed_out == 1
+
+
+def test_invalid_announcement():
+    manager = TransportProtocolManager()
+    bad = bytearray(announcement(TP_CM_BAM, bytes(20)))
+    bad[3] = 9  # Packet count does not match the size
+    manager.feed(TP_CM_PGN, 1, 255, bytes(bad), 0.0)
+    assert manager.invalid == 1
+    assert manager.get_stats()["active_sessions"] == 0
@@ -0,0 +1,65 @@
+"""Wire format envelopes, batches and the advertised accept list"""
+
+import json
+import logging
+
+import pytest
+
+from base_node import BaseNode
+from wire_format import (MSGPACK_AVAILABLE, WIRE_BATCH, WIRE_JSON, WIRE_MSGPACK, batch_overhead, decode_envelope,
+                         encode_batch, encode_envelope)
+
+ENVELOPE = {"message_id": "1", "type": "data", "source": "can_controller", "payload": {"data": b"\x01\x02\xff"}}
+
+needs_msgpack = pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack not installed")
+
+
+def test_json_round_trip_converts_bytes():
+    envelope, wire_format = decode_envelope(encode_envelope(ENVELOPE))
+    assert wire_format == WIRE_JSON
+    assert envelope["payload"]["data"] == [1, 2, 255]
+
+
+@needs_msgpack
+def test_msgpack_round_trip_keeps_bytes():
+    data = encode_envelope(ENVELOPE, WIRE_MSGPACK)
+    assert data[:2] == b"\xc1N"
+    assert decode_envelope(data) == (ENVELOPE, WIRE_MSGPACK)
+
+
+@needs_msgpack
+def test_unknown_binary_version_is_rejected():
+    data = bytearray(encode_envelope(ENVELOPE, WIRE_MSGPACK))
+    data[2] = 99
+    with pytest.raises(ValueError):
+        decode_envelope(bytes(data))
+
+
+@pytest.mark.parametrize("wire_format", [WIRE_JSON, pytest.param(WIRE_MSGPACK, marks=needs_msgpack)])
+def test_batch_round_trip_within_overhead(wire_format):
+    header = {"type": WIRE_BATCH, "source": "can_controller", "accept": [WIRE_BATCH]}
+    messages = [encode_envelope(dict(ENVELOPE, message_id=str(i)), wire_format) for i in range(5)]
+    data = encode_batch(header, messages, wire_format)
+    batch, received_format = decode_envelope(data)
+    assert received_format == wire_format
+    assert batch["type"] == WIRE_BATCH and batch["accept"] == [WIRE_BATCH]
+    assert [message["message_id"] for message in batch["messages"]] == [str(i) for i in range(5)]
+    header_size = len(json.dumps(header))
+    assert len(data) <= header_size + sum(map(len, messages)) + batch_overhead(len(messages))
+
+
+@pytest.mark.parametrize("config, expected", [
+    ({}, [WIRE_MSGPACK]),
+    ({"batching_enabled": True}, [WIRE_MSGPACK, WIRE_BATCH]),
+    ({"wire_format": "json", "batching_enabled": True}, [WIRE_BATCH]),
+    ({"wire_format": "json"}, []),
+])
+def test_accept_lists_enabled_features_only(config, expected):
+    logging.disable(logging.CRITICAL)
+    try:
+        node = BaseNode("test", dict(config, node_port=0, master_core_port=1))
+    finally:
+        logging.disable(logging.NOTSET)
+    if not MSGPACK_AVAILABLE:
+        expected = [wire_format for wire_format in expected if wire_format != WIRE_MSGPACK]
+    assert node._advertised_formats == expected